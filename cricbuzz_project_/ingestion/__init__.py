@@ -0,0 +1,10 @@
+"""
+Cricbuz ingestion jobs (ported from notebooks/Sql_DB.ipynb).
+
+Each job stages rows in memory and writes them in batches through
+ingestion.bulk.BulkWriter (COPY into a temp table + one set-based upsert).
+Run them with:
+
+    python -m ingestion all
+    python -m ingestion scorecards partnerships
+"""
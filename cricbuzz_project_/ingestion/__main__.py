@@ -0,0 +1,40 @@
+import argparse
+import time
+
+from ingestion import (
+    series_matches, venues, teams, players, raw_scorecards, scorecards, partnerships,
+    rankings, player_stats,
+)
+
+# dependency order: series before venues/matches, teams before players
+JOBS = {
+    "series_matches": series_matches.run,
+    "venues": venues.run,
+    "teams": teams.run,
+    "players": players.run,
+    "raw_scorecards": raw_scorecards.run,
+    "scorecards": scorecards.run,
+    "partnerships": partnerships.run,
+    "rankings": rankings.run,
+    "player_stats": player_stats.run,
+}
+
+# jobs derived from raw_scorecards can be rebuilt without the network
+REBUILDABLE = {"scorecards", "partnerships"}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load Cricbuzz API data into Postgres")
+    parser.add_argument("jobs", nargs="+", choices=[*JOBS, "all"], help="jobs to run, in order ('all' runs every job)")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="re-derive scorecards/partnerships for every match from raw_scorecards, no API calls")
+    args = parser.parse_args()
+
+    selected = list(JOBS) if "all" in args.jobs else [j for j in JOBS if j in args.jobs]
+    for name in selected:
+        print(f"\n▶️ {name}")
+        start = time.perf_counter()
+        if args.rebuild and name in REBUILDABLE:
+            JOBS[name](rebuild=True)
+        else:
+            JOBS[name]()
+        print(f"⏱️ {name} finished in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,43 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any
+
+from utils.api_utils import get_client
+from ingestion.helpers import norm
+
+# API-bound work runs on this many threads; the shared token bucket
+# (utils/rate_limiter.py, API_RPS / API_BURST) decides the actual request rate
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "8"))
+
+
+def api_get(path: str, params: Optional[dict] = None, retries: int = 3,
+            lower: bool = False) -> Optional[Dict[str, Any]]:
+    """GET through the shared client; None on 404/204/failure, keys lower-cased if `lower`"""
+    client = get_client()
+    for i in range(retries):
+        try:
+            data = client.get(path, params)
+            if not data:
+                return None
+            return norm(data) if lower else data
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status in (404, 204):
+                return None
+        time.sleep(0.4 * (i + 1))   # transient error backoff (429s are handled by the client)
+    return None
+
+
+def imap_bounded(fn, items, workers=None):
+    """map() on a bounded thread pool: results in input order, at most 2×workers calls in flight"""
+    workers = max(1, workers or INGEST_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,169 @@
+"""
+Batched, set-based writes for ingestion.
+
+Rows are staged in memory (deduplicated on the conflict key), then each flush
+streams them with COPY into a session temp table shaped like the target and
+applies a single INSERT ... SELECT ... ON CONFLICT upsert. One round trip per
+batch instead of one INSERT per row.
+"""
+
+import io
+import json
+from datetime import date, datetime
+
+from ingestion.partitions import ensure_seasons, seasons_of
+
+
+class Upsert:
+    """How rows for one target table are merged
+
+    key           conflict columns (None → plain insert)
+    update        {column: SQL expression} for DO UPDATE; defaults to EXCLUDED.<col> for non-key columns
+    replace_by    delete target rows sharing this column's staged values before inserting
+    merge         fn(old_row, new_row) -> row when the same key is staged twice (default: last wins)
+    partition_by  season partition column: joins the conflict target, stored rows whose value
+                  moved are re-keyed first, and the batch's seasons are created before the upsert
+    """
+
+    def __init__(self, table, columns, key=None, update=None, replace_by=None, merge=None,
+                 partition_by=None):
+        self.table = table
+        self.columns = list(columns)
+        self.key = list(key) if key else None
+        self.replace_by = replace_by
+        self.merge = merge
+        self.partition_by = partition_by
+        if update is None and self.key:
+            update = {c: f"EXCLUDED.{c}" for c in self.columns if c not in self.key and c != partition_by}
+        self.update = update or {}
+
+    @property
+    def stage(self):
+        return f"_stage_{self.table}"
+
+    def row_key(self, row):
+        if not self.key:
+            return None
+        return tuple(row[self.columns.index(c)] for c in self.key)
+
+    def rekey_sql(self):
+        """Move stored rows to the staged partition value (a rescheduled match changes season)"""
+        p = self.partition_by
+        on = " AND ".join(f"t.{c} = s.{c}" for c in self.key)
+        return f"UPDATE {self.table} t SET {p} = s.{p} FROM {self.stage} s WHERE {on} AND t.{p} <> s.{p}"
+
+    def _conflict_sql(self):
+        if not self.key:
+            return ""
+        target = self.key + ([self.partition_by] if self.partition_by else [])
+        sql = f" ON CONFLICT ({', '.join(target)}) "
+        if self.update:
+            sets = ",\n    ".join(f"{c} = {expr}" for c, expr in self.update.items())
+            return sql + f"DO UPDATE SET\n    {sets}"
+        return sql + "DO NOTHING"
+
+    def upsert_sql(self):
+        cols = ", ".join(self.columns)
+        return f"INSERT INTO {self.table} ({cols}) SELECT {cols} FROM {self.stage}" + self._conflict_sql()
+
+    def row_sql(self):
+        """Single-row form of upsert_sql (%s placeholders), for retrying rows one at a time"""
+        cols = ", ".join(self.columns)
+        marks = ", ".join(["%s"] * len(self.columns))
+        return f"INSERT INTO {self.table} ({cols}) VALUES ({marks})" + self._conflict_sql()
+
+def _csv_field(v):
+    if v is None:
+        return r"\N"
+    if isinstance(v, bool):
+        return "t" if v else "f"
+    if isinstance(v, (datetime, date)):
+        v = v.isoformat()
+    elif isinstance(v, (dict, list)):
+        v = json.dumps(v)       # JSON/JSONB columns
+    return '"' + str(v).replace('"', '""') + '"'
+
+
+class BulkWriter:
+    def __init__(self, cur, specs, batch_size=5000):
+        self.cur = cur
+        self.specs = {s.table: s for s in specs}
+        self.batch_size = batch_size
+        self._rows = {t: {} for t in self.specs}     # table -> {key or seq: row}
+        self._seq = 0
+        self._staged_tables = set()
+        self._replaced = {t: set() for t in self.specs}
+        self._seasons = set()
+        self.counts = {t: 0 for t in self.specs}
+
+    def add(self, table, row):
+        """Stage one row (tuple in spec column order, or dict by column name)"""
+        spec = self.specs[table]
+        if isinstance(row, dict):
+            row = tuple(row.get(c) for c in spec.columns)
+        bucket = self._rows[table]
+        key = spec.row_key(row)
+        if key is None:
+            self._seq += 1
+            key = ("_seq", self._seq)
+        elif key in bucket and spec.merge:
+            row = spec.merge(bucket[key], row)
+        bucket[key] = row
+        if len(bucket) >= self.batch_size:
+            # flush everything so parents (earlier specs) land before their children
+            self.flush()
+
+    def pending(self, table):
+        return len(self._rows[table])
+
+    def _ensure_stage(self, spec):
+        if spec.table in self._staged_tables:
+            self.cur.execute(f"TRUNCATE {spec.stage}")
+            return
+        self.cur.execute(f"DROP TABLE IF EXISTS {spec.stage}")
+        self.cur.execute(f"CREATE TEMP TABLE {spec.stage} (LIKE {spec.table} INCLUDING DEFAULTS)")
+        self._staged_tables.add(spec.table)
+
+    def flush(self, table=None):
+        """Write staged rows for one table (or all, in spec order)"""
+        for name in ([table] if table else list(self.specs)):
+            rows = self._rows[name]
+            if not rows:
+                continue
+            spec = self.specs[name]
+            self._ensure_stage(spec)
+            buf = io.StringIO()
+            for row in rows.values():
+                buf.write(",".join(_csv_field(v) for v in row))
+                buf.write("\n")
+            buf.seek(0)
+            self.cur.copy_expert(
+                f"COPY {spec.stage} ({', '.join(spec.columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+                buf,
+            )
+            if spec.replace_by:
+                # only clear groups this writer hasn't already (re)written in an earlier batch
+                idx = spec.columns.index(spec.replace_by)
+                fresh = {row[idx] for row in rows.values()} - self._replaced[name]
+                if fresh:
+                    self.cur.execute(
+                        f"DELETE FROM {spec.table} WHERE {spec.replace_by} = ANY(%s)", (list(fresh),)
+                    )
+                    self._replaced[name] |= fresh
+            if spec.partition_by and spec.key:
+                idx = spec.columns.index(spec.partition_by)
+                fresh = seasons_of(row[idx] for row in rows.values()) - self._seasons
+                if fresh:
+                    ensure_seasons(self.cur, fresh)
+                    self._seasons |= fresh
+                self.cur.execute(spec.rekey_sql())
+            self.cur.execute(spec.upsert_sql())
+            self.counts[name] += len(rows)
+            rows.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
@@ -0,0 +1,107 @@
+import hashlib
+import re
+from datetime import datetime, date
+from typing import Optional, Tuple
+
+
+# ---------------- Payload ----------------
+def norm(obj):
+    """Lower-case all dict keys recursively so we can use a single codepath."""
+    if isinstance(obj, dict):
+        return {(k.lower() if isinstance(k, str) else k): norm(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [norm(x) for x in obj]
+    return obj
+
+def clean_name(s): return (s or "").replace("†", "").strip()
+
+def try_int(x):
+    try: return int(x)
+    except Exception: return None
+
+def try_float(x):
+    try: return float(x)
+    except Exception: return None
+
+def safe_int(x, default=0):
+    v = try_int(x)
+    return v if v is not None else default
+
+def safe_float(x, default=0.0):
+    v = try_float(x)
+    return v if v is not None else default
+
+def first_non_empty(*vals):
+    for v in vals:
+        if isinstance(v, str):
+            if v.strip(): return v.strip()
+        elif v is not None:
+            return v
+    return None
+
+def name_hash_id(name, extra=""):
+    """Stable surrogate id from name|team when the API gives none"""
+    return int(hashlib.md5(f"{name}|{extra}".encode()).hexdigest()[:8], 16)
+
+def safe_player_id(obj, fallback="Unknown", extra=""):
+    # prefer provided numeric id; else stable hash(name|team)
+    for k in ("id", "playerid", "player_id"):
+        if k in obj and obj[k]:
+            try: return int(obj[k])
+            except Exception: pass
+    return name_hash_id(clean_name(obj.get("name") or fallback), extra)
+
+
+# ---------------- Dates ----------------
+def ms_to_date(ms) -> Optional[date]:
+    if not ms: return None
+    return datetime.fromtimestamp(int(ms) / 1000).date()
+
+def ms_to_ts(ms) -> Optional[datetime]:
+    if not ms: return None
+    return datetime.fromtimestamp(int(ms) / 1000)
+
+
+# ---------------- Match status ----------------
+def parse_margin(status: str) -> Tuple[int, int, bool]:
+    runs = wkts = 0
+    innings = False
+    if not status: return runs, wkts, innings
+    s = status.lower()
+    if "innings" in s:
+        innings = True
+    m_runs = re.search(r"(\d+)\s*run", s)
+    if m_runs:
+        runs = int(m_runs.group(1))
+    m_wkts = re.search(r"(\d+)\s*wkt", s)
+    if m_wkts:
+        wkts = int(m_wkts.group(1))
+    return runs, wkts, innings
+
+def infer_match_type(fmt: str, series_name: str = "", series_type: str = "") -> str:
+    f = (fmt or "").lower()
+    s = (series_name or "").lower()
+    st = (series_type or "").lower()
+    if "league" in s or "league" in st or any(x in s for x in ["ipl", "bbl", "psl", "cpl", "bpl", "hundred"]):
+        return "League"
+    if f == "test":
+        return "International Test"
+    if f == "odi":
+        return "One Day"
+    if "t20" in f:
+        return "Twenty20"
+    if "trophy" in s or "cup" in s:
+        return "Tournament"
+    return "International"
+
+
+# ---------------- Match lists ----------------
+def iter_match_infos(data):
+    """Yield (series_wrapper, match_info) from a normalized /matches/v1/* payload"""
+    for tm in (data or {}).get("typematches", []):
+        for sm in tm.get("seriesmatches", []):
+            wrap = sm.get("seriesadwrapper") or {}
+            for m in wrap.get("matches") or sm.get("matches") or []:
+                info = m.get("matchinfo") or {}
+                if info.get("matchid"):
+                    yield wrap, info
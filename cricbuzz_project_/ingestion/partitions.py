@@ -0,0 +1,37 @@
+"""
+Season partitions for matches and the per-match tables.
+
+matches is range-partitioned on start_date and the scorecard tables on
+match_start_date (a copy of it), one partition per calendar year (migration
+0005). Writers create the seasons a batch needs before upserting it; rows of
+a season without a partition, and scorecards whose match isn't loaded yet
+(UNDATED), land in the <table>_default partition.
+"""
+
+from datetime import date, datetime
+
+SEASON_TABLES = ("matches", "match_innings", "batting_scorecard", "bowling_scorecard", "fielding_scorecard")
+
+UNDATED = "-infinity"       # match_start_date of scorecards stored before their match
+
+
+def seasons_of(values):
+    """Years of the datetimes / dates in `values` (UNDATED and NULLs skipped)"""
+    return {v.year for v in values if isinstance(v, (date, datetime))}
+
+def ensure_seasons(cur, years):
+    """Create the missing yearly partitions of every season table; no-op before migration 0005"""
+    years = sorted({int(y) for y in years})
+    if not years:
+        return
+    cur.execute("SELECT to_regprocedure('ensure_season_partitions(integer[])') IS NOT NULL")
+    if cur.fetchone()[0]:
+        cur.execute("SELECT ensure_season_partitions(%s::INT[])", (years,))
+
+def match_dates(cur):
+    """{match_id: start_date}, to stamp scorecard rows with their match's season"""
+    cur.execute("SELECT to_regclass('matches') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        return {}
+    cur.execute("SELECT match_id, start_date FROM matches")
+    return dict(cur.fetchall())
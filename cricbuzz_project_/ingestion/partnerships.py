@@ -0,0 +1,90 @@
+# ===========================================================
+#                     Partnerships Table
+# ===========================================================
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.helpers import clean_name, try_int
+from ingestion.schema import ensure_tables
+from ingestion.raw_scorecards import sync
+from ingestion.state import STATE, IngestionState, iter_stored_scorecards
+
+# Set to True if you only want 100+ partnerships
+ONLY_100_PLUS = False   # <- change to True if needed
+
+# no natural key: each match's rows are replaced as a group
+PARTNERSHIPS = Upsert("partnerships", [
+    "match_id", "match_format", "team1_name", "team2_name",
+    "innings_number", "batsman1", "batsman2", "runs", "balls", "wicket_number",
+], replace_by="match_id")
+
+
+def only_if_threshold(runs):
+    """Respect the 100+ filter if enabled."""
+    return (runs is not None) and (runs >= 100) if ONLY_100_PLUS else (runs is not None)
+
+
+def innings_partnerships(inns):
+    """Yield (wicket_no, b1, b2, runs, balls), preferring API partnerships over the batting-list fallback"""
+    parts = inns.get("partnershipsdata") or inns.get("partnerships") or []
+    if parts:
+        for p in parts:
+            yield (
+                try_int(p.get("wicketno")) or 0,
+                clean_name(p.get("batsman1name") or p.get("bat1name")),
+                clean_name(p.get("batsman2name") or p.get("bat2name")),
+                try_int(p.get("runs")) or 0,
+                try_int(p.get("balls")) or 0,
+            )
+        return
+
+    # Fallback: pair consecutive batters (batting order, or "batting_position" if present)
+    bats = inns.get("batsman") or inns.get("batsmendata") or []
+
+    def pos(row, idx):
+        return try_int(row.get("batting_position") or row.get("position") or row.get("pos")) or (idx + 1)
+    bats_sorted = [row for _, row in sorted(enumerate(bats), key=lambda t: pos(t[1], t[0]))]
+
+    for j in range(len(bats_sorted) - 1):
+        b1row, b2row = bats_sorted[j], bats_sorted[j + 1]
+        yield (
+            j + 1,
+            clean_name(b1row.get("name") or b1row.get("batname")),
+            clean_name(b2row.get("name") or b2row.get("batname")),
+            (try_int(b1row.get("runs")) or 0) + (try_int(b2row.get("runs")) or 0),
+            (try_int(b1row.get("balls")) or 0) + (try_int(b2row.get("balls")) or 0),
+        )
+
+
+def add_partnerships(writer, match_id, info, sc):
+    """Stage partnership rows for one normalized scorecard"""
+    sc_list = (sc or {}).get("scorecard") or (sc or {}).get("scorecards") or []
+    team1 = clean_name((info.get("team1") or {}).get("teamname"))
+    team2 = clean_name((info.get("team2") or {}).get("teamname"))
+    match_format = clean_name(info.get("matchformat"))
+
+    for inns_idx, inns in enumerate(sc_list, start=1):
+        for wno, b1, b2, runs, balls in innings_partnerships(inns):
+            if not only_if_threshold(runs):
+                continue
+            writer.add("partnerships", (
+                match_id, match_format, team1, team2,
+                inns_idx, b1 or "Unknown", b2 or "Unknown", runs, balls, wno,
+            ))
+
+
+def run(rebuild=False):
+    """Derive partnerships from raw_scorecards (synced first unless `rebuild`, which re-derives every match offline)"""
+    with get_conn() as conn:
+        if not rebuild:
+            sync(conn)
+            conn.commit()
+        cur = conn.cursor()
+        ensure_tables(cur, "partnerships", "raw_scorecards", "ingestion_state")
+        state = IngestionState(cur, "partnerships")
+        with BulkWriter(cur, [PARTNERSHIPS, STATE]) as writer:
+            for mid, info, sc in iter_stored_scorecards(conn, state, writer, rebuild):
+                add_partnerships(writer, mid, info, sc)
+        bump_table_versions(cur, "partnerships")
+    print(f"🎉 Partnerships load complete: {writer.counts['partnerships']} rows, matches: {state.counts}")
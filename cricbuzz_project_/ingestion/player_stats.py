@@ -0,0 +1,176 @@
+# ===========================================================
+#                 Player_master_stats Table
+# ===========================================================
+
+import re
+from datetime import datetime, timezone
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.api import api_get, imap_bounded
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.schema import ensure_tables
+
+PLAYERS_LIST = ["Sachin Tendulkar","Jacques Kallis","Rahul Dravid","Brian Lara","Ricky Ponting",
+    "Virat Kohli","Kumar Sangakkara","Joe Root","Steven Smith","Kane Williamson",
+    "AB de Villiers","Mahela Jayawardene","Chris Gayle","Rohit Sharma","Jos Buttler",
+    "Suryakumar Yadav","Yashasvi Jaiswal","Travis Head","David Warner","Babar Azam",
+    "Adam Gilchrist","Muttiah Muralitharan","Shane Warne","Wasim Akram","Glenn McGrath",
+    "MS Dhoni","Allan Border","Inzamam-ul-Haq","Saeed Anwar","Anil Kumble",
+    "Rashid Khan","Jacques Rudolph","Michael Clarke","Kevin Pietersen","Javed Miandad",
+    "Ben Stokes","Shahid Afridi","Lasith Malinga","Dwayne Bravo","Imran Khan"]
+
+FORMATS = ["Test", "ODI", "T20I", "IPL"]
+
+STAT_COLUMNS = [
+    "matches", "innings", "runs", "balls_faced",
+    "hundreds", "fifties", "highest_score", "batting_average", "strike_rate",
+    "not_outs", "ducks",
+    "wickets", "balls_bowled", "runs_conceded", "bowling_average", "economy_rate",
+    "four_wicket_hauls", "five_wicket_hauls", "ten_wicket_hauls",
+    "best_bowling_innings", "best_bowling_match",
+    "catches", "stumpings",
+]
+
+# name/team/role/styles keep their first stored value, like the notebook upsert
+MASTER_STATS = Upsert("player_master_stats", [
+    "player_id", "format", "player_name", "team_name", "role",
+    "batting_style", "bowling_style",
+    *STAT_COLUMNS,
+    "icc_bat_best_rank", "icc_bowl_best_rank", "icc_allround_best_rank",
+    "created_at",
+], key=["player_id", "format"], update={
+    c: f"EXCLUDED.{c}" for c in (
+        *STAT_COLUMNS,
+        "icc_bat_best_rank", "icc_bowl_best_rank", "icc_allround_best_rank",
+        "created_at")
+})
+
+
+# ---------------- API Helpers ----------------
+def search_player(query):
+    data = api_get("/stats/v1/player/search", params={"plrN": query}) or {}
+    found = data.get("player") or []
+    return found[0] if found else None
+
+def get_player_profile(pid):
+    return api_get(f"/stats/v1/player/{pid}") or {}
+
+def get_stats(pid, stat_type):
+    return api_get(f"/stats/v1/player/{pid}/{stat_type}") or {}
+
+def extract_stats_table(stats_json):
+    if not stats_json or "headers" not in stats_json or "values" not in stats_json:
+        return {}
+    headers = stats_json["headers"][1:]
+    stats = {}
+    for row in stats_json["values"]:
+        row_vals = row["values"]
+        rowheader = row_vals[0].strip()
+        for i, fmt in enumerate(headers, start=1):
+            stats.setdefault(fmt, {})[rowheader] = row_vals[i]
+    return stats
+
+
+# ---------------- Normalizers ----------------
+def to_int(v):
+    try:
+        return int(re.sub(r"[^0-9]", "", str(v))) if v else 0
+    except Exception:
+        return 0
+
+def to_float(v):
+    try:
+        return float(str(v).replace("-", "0")) if v else 0.0
+    except Exception:
+        return 0.0
+
+
+# ---------------- Mapping ----------------
+def map_stats(bat, bowl, fld, fmt):
+    """Map raw Cricbuzz stats → DB columns"""
+    b = bat.get(fmt, {})
+    bw = bowl.get(fmt, {})
+    f = fld.get(fmt, {})
+
+    return {
+        "matches": to_int(b.get("Matches")),
+        "innings": to_int(b.get("Innings")),
+        "runs": to_int(b.get("Runs")),
+        "balls_faced": to_int(b.get("Balls") or b.get("BF")),
+        "hundreds": to_int(b.get("100s")),
+        "fifties": to_int(b.get("50s")),
+        "highest_score": to_int(b.get("Highest") or 0),
+        "batting_average": to_float(b.get("Average")),
+        "strike_rate": to_float(b.get("SR")),
+        "not_outs": to_int(b.get("Not Out") or b.get("NO")),
+        "ducks": to_int(b.get("Ducks") or b.get("0")),
+        "wickets": to_int(bw.get("Wickets") or bw.get("Wkts")),
+        "balls_bowled": to_int(bw.get("Balls")),
+        "runs_conceded": to_int(bw.get("Runs")),
+        "bowling_average": to_float(bw.get("Average") or bw.get("Avg")),
+        "economy_rate": to_float(bw.get("Eco") or bw.get("Econ")),
+        "four_wicket_hauls": to_int(bw.get("4w")),
+        "five_wicket_hauls": to_int(bw.get("5w")),
+        "ten_wicket_hauls": to_int(bw.get("10w")),
+        "best_bowling_innings": bw.get("BBI", ""),
+        "best_bowling_match": bw.get("BBM", ""),
+        "catches": to_int(f.get("Ct") or f.get("Catches")),
+        "stumpings": to_int(f.get("St") or f.get("Stumpings"))
+    }
+
+
+def player_rows(name):
+    """One row per format for a searched player name"""
+    player = search_player(name)
+    if not player:
+        print(f"❌ Not found: {name}")
+        return []
+
+    pid = int(player["id"])
+    pname = player["name"]
+    team = player.get("teamName", "Unknown")
+
+    profile = get_player_profile(pid)
+    role = profile.get("role", "Unknown")
+    bat_style = profile.get("bat", "Unknown")
+    bowl_style = profile.get("bowl", "Unknown")
+
+    rankings = profile.get("rankings", {})
+    icc_bat_best = rankings.get("bat", {}).get("testBestRank") or rankings.get("bat", {}).get("odiBestRank")
+    icc_bowl_best = rankings.get("bowl", {}).get("testBestRank") or rankings.get("bowl", {}).get("odiBestRank")
+    icc_all_best = rankings.get("all", {}).get("testBestRank") or rankings.get("all", {}).get("odiBestRank")
+
+    bat = extract_stats_table(get_stats(pid, "batting"))
+    bowl = extract_stats_table(get_stats(pid, "bowling"))
+    fld = extract_stats_table(get_stats(pid, "fielding"))
+
+    # Merge T20 → T20I
+    for ds in (bat, bowl, fld):
+        if "T20" in ds:
+            ds.setdefault("T20I", {}).update(ds.pop("T20"))
+
+    now = datetime.now(timezone.utc)
+    rows = []
+    for fmt in FORMATS:
+        if fmt in bat or fmt in bowl or fmt in fld:
+            stats = map_stats(bat, bowl, fld, fmt)
+            rows.append((
+                pid, fmt, pname, team, role, bat_style, bowl_style,
+                *(stats[c] for c in STAT_COLUMNS),
+                icc_bat_best, icc_bowl_best, icc_all_best,
+                now,
+            ))
+    return rows
+
+
+def run(names=None):
+    with get_conn() as conn:
+        cur = conn.cursor()
+        ensure_tables(cur, "player_master_stats")
+        with BulkWriter(cur, [MASTER_STATS]) as writer:
+            for rows in imap_bounded(player_rows, names or PLAYERS_LIST):
+                for row in rows:
+                    writer.add("player_master_stats", row)
+        bump_table_versions(cur, "player_master_stats")
+    print(f"✅ Saved {writer.counts['player_master_stats']} player/format rows")
@@ -0,0 +1,69 @@
+# ===========================================================
+#                  Players Table
+# ===========================================================
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.api import api_get, imap_bounded
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.schema import ensure_tables
+from ingestion.teams import iter_match_teams
+
+KNOWN_ROLES = ["BATSMEN", "ALL ROUNDER", "WICKET KEEPER", "BOWLER"]
+
+PLAYERS = Upsert("players", [
+    "player_id", "full_name", "nick_name", "role",
+    "batting_style", "bowling_style", "is_keeper", "is_captain", "team_id",
+], key=["player_id"])
+
+
+def fetch_players(team_id):
+    """Squad rows for one team; the API interleaves role headers with players"""
+    data = api_get(f"/teams/v1/{team_id}/players")
+    if not data:
+        print(f"⚠ No squad for team {team_id}")
+        return []
+
+    players = []
+    current_role = ""
+    for p in data.get("player", []):
+        name = p.get("name")
+        pid = p.get("id")
+
+        if name in KNOWN_ROLES:
+            current_role = name
+            continue
+        if not pid or not name:
+            continue
+
+        players.append((
+            pid,
+            p.get("fullName") or name,
+            name,
+            current_role or "Unknown",
+            p.get("battingStyle") or "Unknown",
+            p.get("bowlingStyle") or "Unknown",
+            p.get("keeper", False),
+            p.get("captain", False),
+            p.get("teamId") or team_id,
+        ))
+    return players
+
+
+def run():
+    with get_conn() as conn:
+        cur = conn.cursor()
+        ensure_tables(cur, "teams", "players")
+
+        # Step 1: Collect team IDs from matches
+        team_ids = {t["teamId"] for t in iter_match_teams() if t.get("teamId")}
+        print(f"📌 Found {len(team_ids)} teams from matches")
+
+        # Step 2: Fetch and stage players for each team
+        with BulkWriter(cur, [PLAYERS]) as writer:
+            for players in imap_bounded(fetch_players, team_ids):
+                for row in players:
+                    writer.add("players", row)
+
+        bump_table_versions(cur, "players")
+    print(f"✔ Inserted/Updated {writer.counts['players']} players")
@@ -0,0 +1,64 @@
+# ===========================================================
+#                   Player Rankings Table
+# ===========================================================
+
+import datetime
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.api import api_get, imap_bounded
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.schema import ensure_tables
+
+FORMAT_MAP = {"test": "TEST", "odi": "ODI", "t20": "T20I"}
+CATEGORY_MAP = {"batsmen": "Batting", "bowlers": "Bowling", "allrounders": "All-rounder"}
+
+RANKINGS = Upsert("player_rankings_history", [
+    "player_id", "player_name", "country", "format", "category",
+    "ranking_position", "rating_points", "ranking_date",
+], key=["format", "category", "ranking_position", "ranking_date"])
+
+
+def fetch_rankings(fmt_api: str, category_api: str, top_n: int = 10):
+    data = api_get(f"/stats/v1/rankings/{category_api}", params={"formatType": fmt_api}) or {}
+    return data.get("rank", [])[:top_n]
+
+
+def ranking_row(fmt_db, category_db, player):
+    try:
+        ranking_date = datetime.datetime.strptime(player["lastUpdatedOn"], "%Y-%m-%d").date()
+    except Exception:
+        ranking_date = datetime.date.today()
+    return (
+        int(player.get("id") or 0),
+        player.get("name") or "Unknown",
+        player.get("country") or "Unknown",
+        fmt_db,
+        category_db,
+        int(player.get("rank") or 0),
+        int(player.get("rating") or 0),
+        ranking_date,
+    )
+
+
+def fetch_combo(combo):
+    fmt_api, cat_api = combo
+    return fmt_api, cat_api, fetch_rankings(fmt_api, cat_api, top_n=10)
+
+
+def run():
+    with get_conn() as conn:
+        cur = conn.cursor()
+        ensure_tables(cur, "player_rankings_history")
+        # top 10 players per format/category
+        combos = [(f, c) for f in FORMAT_MAP for c in CATEGORY_MAP]
+        with BulkWriter(cur, [RANKINGS]) as writer:
+            for fmt_api, cat_api, players in imap_bounded(fetch_combo, combos):
+                if not players:
+                    print(f"⚠ No data for {fmt_api} {cat_api}")
+                    continue
+                for p in players:
+                    writer.add("player_rankings_history",
+                               ranking_row(FORMAT_MAP[fmt_api], CATEGORY_MAP[cat_api], p))
+        bump_table_versions(cur, "player_rankings_history")
+    print(f"✅ Rankings saved: {writer.counts['player_rankings_history']} rows")
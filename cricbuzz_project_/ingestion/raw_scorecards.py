@@ -0,0 +1,41 @@
+# ===========================================================
+#                   Raw scorecard store
+# ===========================================================
+# Each /mcenter/v1/{id}/scard payload is downloaded once per version and kept
+# in raw_scorecards (JSONB). scorecards.py and partnerships.py derive their
+# tables from it, so they share one fetch and can be rebuilt offline.
+
+from datetime import datetime
+
+from utils.db_connection import get_conn
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.schema import ensure_tables
+from ingestion.state import STATE, IngestionState, iter_changed_scorecards, payload_hash
+
+RAW = Upsert("raw_scorecards", [
+    "match_id", "payload_hash", "state", "status", "fetched_at", "match_info", "payload",
+], key=["match_id", "payload_hash"], update={
+    "state": "EXCLUDED.state",
+    "status": "EXCLUDED.status",
+    "fetched_at": "EXCLUDED.fetched_at",
+})
+
+
+def sync(conn):
+    """Fetch new / changed scorecards into raw_scorecards; returns the per-match counts"""
+    cur = conn.cursor()
+    ensure_tables(cur, "raw_scorecards", "ingestion_state")
+    state = IngestionState(cur, "raw_scorecards")
+    with BulkWriter(cur, [RAW, STATE], batch_size=500) as writer:
+        for mid, info, sc in iter_changed_scorecards(state, writer):
+            writer.add("raw_scorecards", (
+                int(mid), payload_hash(sc), info.get("state"), info.get("status"),
+                datetime.now(), info, sc,
+            ))
+    return state.counts
+
+
+def run():
+    with get_conn() as conn:
+        counts = sync(conn)
+    print(f"✅ Raw scorecards synced: {counts}")
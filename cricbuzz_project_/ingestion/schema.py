@@ -0,0 +1,229 @@
+# ===========================================================
+#             Cricbuz tables used by the ingestion jobs
+# ===========================================================
+# Same shapes as the notebook cells, but created IF NOT EXISTS so reruns
+# upsert into existing data instead of dropping it.
+#
+# matches and the per-match tables are partitioned by season (migration 0005):
+# keys include the match date and rows start in a <table>_default partition
+# until ensure_season_partitions() creates their year.
+
+DDL = {
+    "series": """
+    CREATE TABLE IF NOT EXISTS series (
+        series_id      BIGINT PRIMARY KEY,
+        series_name    TEXT NOT NULL,
+        series_type    TEXT NOT NULL,
+        start_date     DATE NOT NULL,
+        end_date       DATE NOT NULL,
+        host_country   TEXT NOT NULL,
+        match_format   TEXT NOT NULL,
+        total_matches  INT NOT NULL,
+        created_at     TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );""",
+
+    "matches": """
+    CREATE TABLE IF NOT EXISTS matches (
+        match_id          BIGINT NOT NULL,
+        series_id         BIGINT REFERENCES series(series_id),
+        match_desc        TEXT NOT NULL,
+        match_format      TEXT NOT NULL,
+        match_type        TEXT NOT NULL,
+        start_date        TIMESTAMP NOT NULL,
+        end_date          TIMESTAMP,
+        state             TEXT NOT NULL,
+        status            TEXT NOT NULL,
+        team1_id          BIGINT NOT NULL,
+        team1_name        TEXT NOT NULL,
+        team2_id          BIGINT NOT NULL,
+        team2_name        TEXT NOT NULL,
+        venue_id          BIGINT NOT NULL,
+        venue_name        TEXT NOT NULL,
+        venue_city        TEXT NOT NULL,
+        venue_country     TEXT NOT NULL,
+        toss_winner_id    BIGINT,
+        toss_decision     TEXT,
+        winner_team_id    BIGINT,
+        winner_team_name  TEXT,
+        win_by_runs       INT,
+        win_by_wickets    INT,
+        win_by_innings    BOOLEAN,
+        created_at        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (match_id, start_date)
+    ) PARTITION BY RANGE (start_date);
+    CREATE TABLE IF NOT EXISTS matches_default PARTITION OF matches DEFAULT;""",
+
+    "venues": """
+    CREATE TABLE IF NOT EXISTS venues (
+        venue_id BIGINT PRIMARY KEY,
+        ground VARCHAR(200),
+        city VARCHAR(100),
+        country VARCHAR(100),
+        capacity INT,
+        established INT,
+        image_id VARCHAR(50),
+        series_id BIGINT REFERENCES series(series_id) ON DELETE CASCADE
+    );""",
+
+    "batting_scorecard": """
+    CREATE TABLE IF NOT EXISTS batting_scorecard (
+        match_id BIGINT, match_start_date TIMESTAMP NOT NULL, innings_id INT, player_id BIGINT,
+        player_name TEXT, team_name TEXT,
+        runs INT, balls_faced INT, fours INT, sixes INT, strike_rate FLOAT,
+        batting_position INT, dismissal TEXT, is_not_out BOOLEAN,
+        PRIMARY KEY (match_id, innings_id, player_id, match_start_date)
+    ) PARTITION BY RANGE (match_start_date);
+    CREATE TABLE IF NOT EXISTS batting_scorecard_default PARTITION OF batting_scorecard DEFAULT;""",
+
+    "bowling_scorecard": """
+    CREATE TABLE IF NOT EXISTS bowling_scorecard (
+        match_id BIGINT, match_start_date TIMESTAMP NOT NULL, innings_id INT, player_id BIGINT,
+        player_name TEXT, team_name TEXT,
+        overs FLOAT, maidens INT, runs_conceded INT, wickets INT, economy_rate FLOAT,
+        PRIMARY KEY (match_id, innings_id, player_id, match_start_date)
+    ) PARTITION BY RANGE (match_start_date);
+    CREATE TABLE IF NOT EXISTS bowling_scorecard_default PARTITION OF bowling_scorecard DEFAULT;""",
+
+    "fielding_scorecard": """
+    CREATE TABLE IF NOT EXISTS fielding_scorecard (
+        match_id BIGINT, match_start_date TIMESTAMP NOT NULL, innings_id INT, player_id BIGINT,
+        player_name TEXT, team_name TEXT,
+        catches INT DEFAULT 0, stumpings INT DEFAULT 0, runouts INT DEFAULT 0,
+        PRIMARY KEY (match_id, innings_id, player_id, match_start_date)
+    ) PARTITION BY RANGE (match_start_date);
+    CREATE TABLE IF NOT EXISTS fielding_scorecard_default PARTITION OF fielding_scorecard DEFAULT;""",
+
+    "match_innings": """
+    CREATE TABLE IF NOT EXISTS match_innings (
+        match_id BIGINT, match_start_date TIMESTAMP NOT NULL, innings_id INT, innings_number INT,
+        batting_team TEXT, bowling_team TEXT,
+        batting_team_id BIGINT, bowling_team_id BIGINT,
+        runs INT, wickets INT, overs FLOAT,
+        PRIMARY KEY (match_id, innings_id, match_start_date),
+        UNIQUE (match_id, innings_number, match_start_date)
+    ) PARTITION BY RANGE (match_start_date);
+    CREATE TABLE IF NOT EXISTS match_innings_default PARTITION OF match_innings DEFAULT;""",
+
+    "partnerships": """
+    CREATE TABLE IF NOT EXISTS partnerships (
+        id BIGSERIAL PRIMARY KEY,
+        match_id BIGINT,
+        match_format TEXT,
+        team1_name TEXT,
+        team2_name TEXT,
+        innings_number INT,
+        batsman1 TEXT,
+        batsman2 TEXT,
+        runs INT,
+        balls INT,
+        wicket_number INT
+    );""",
+
+    "player_rankings_history": """
+    CREATE TABLE IF NOT EXISTS player_rankings_history (
+        player_id        BIGINT NOT NULL,
+        player_name      TEXT,
+        country          TEXT,
+        format           TEXT NOT NULL,        -- TEST | ODI | T20I
+        category         TEXT NOT NULL,        -- Batting | Bowling | All-rounder
+        ranking_position INT NOT NULL,         -- 1 to 10
+        rating_points    INT,
+        ranking_date     DATE NOT NULL,
+        created_at       TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW(),
+        PRIMARY KEY (format, category, ranking_position, ranking_date)
+    );""",
+
+    "teams": """
+    CREATE TABLE IF NOT EXISTS teams (
+        team_id BIGINT PRIMARY KEY,
+        team_name TEXT UNIQUE NOT NULL,
+        team_sname TEXT,
+        country TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );""",
+
+    "players": """
+    CREATE TABLE IF NOT EXISTS players (
+        player_id BIGINT PRIMARY KEY,
+        full_name TEXT,
+        nick_name TEXT,
+        role TEXT,
+        batting_style TEXT,
+        bowling_style TEXT,
+        is_keeper BOOLEAN,
+        is_captain BOOLEAN,
+        team_id BIGINT REFERENCES teams(team_id),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );""",
+
+    "player_master_stats": """
+    CREATE TABLE IF NOT EXISTS player_master_stats (
+        player_id BIGINT,
+        format TEXT,
+        player_name TEXT NOT NULL,
+        team_name TEXT,
+        role TEXT,
+        batting_style TEXT,
+        bowling_style TEXT,
+        matches INT,
+        innings INT,
+        runs INT,
+        balls_faced INT,
+        hundreds INT,
+        fifties INT,
+        highest_score INT,
+        batting_average DECIMAL(6,2),
+        strike_rate DECIMAL(6,2),
+        not_outs INT,
+        ducks INT,
+        wickets INT,
+        balls_bowled INT,
+        runs_conceded INT,
+        bowling_average DECIMAL(6,2),
+        economy_rate DECIMAL(6,2),
+        four_wicket_hauls INT,
+        five_wicket_hauls INT,
+        ten_wicket_hauls INT,
+        best_bowling_innings TEXT,
+        best_bowling_match TEXT,
+        catches INT,
+        stumpings INT,
+        icc_bat_best_rank INT,
+        icc_bowl_best_rank INT,
+        icc_allround_best_rank INT,
+        created_at TIMESTAMP,
+        PRIMARY KEY (player_id, format)
+    );""",
+
+    "raw_scorecards": """
+    CREATE TABLE IF NOT EXISTS raw_scorecards (
+        match_id     BIGINT NOT NULL,
+        payload_hash TEXT NOT NULL,            -- one row per distinct payload version
+        state        TEXT,
+        status       TEXT,
+        fetched_at   TIMESTAMP NOT NULL,
+        match_info   JSONB,                    -- list entry (teams, format) the derived tables need
+        payload      JSONB NOT NULL,           -- /mcenter/v1/{id}/scard, keys lower-cased
+        PRIMARY KEY (match_id, payload_hash)
+    );
+    CREATE INDEX IF NOT EXISTS raw_scorecards_latest_idx ON raw_scorecards (match_id, fetched_at DESC);""",
+
+    "ingestion_state": """
+    CREATE TABLE IF NOT EXISTS ingestion_state (
+        job             TEXT NOT NULL,          -- raw_scorecards | scorecards | partnerships
+        match_id        BIGINT NOT NULL,
+        state           TEXT,                   -- match state when last fetched
+        status          TEXT,
+        last_fetched_at TIMESTAMP NOT NULL,
+        payload_hash    TEXT NOT NULL,
+        is_complete     BOOLEAN NOT NULL DEFAULT FALSE,
+        PRIMARY KEY (job, match_id)
+    );""",
+}
+
+
+def ensure_tables(cur, *names):
+    """CREATE IF NOT EXISTS for the named tables (in dependency order)"""
+    for name in DDL:
+        if name in names:
+            cur.execute(DDL[name])
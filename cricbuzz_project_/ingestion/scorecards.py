@@ -0,0 +1,255 @@
+# =======================================================================================================================================================================
+#                   Batting_scorecard Table , Bowling_scorecard Table, Fielding_scorecard Table , Match_innings Table
+# =======================================================================================================================================================================
+
+import re
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.helpers import (
+    clean_name, try_int, try_float, safe_int, safe_float, first_non_empty,
+    name_hash_id, safe_player_id,
+)
+from ingestion.partitions import UNDATED, match_dates
+from ingestion.schema import ensure_tables
+from ingestion.raw_scorecards import sync
+from ingestion.state import STATE, IngestionState, iter_stored_scorecards
+
+TABLES = ("batting_scorecard", "bowling_scorecard", "fielding_scorecard", "match_innings")
+
+
+def _add_fielding(old, new):
+    """Same fielder twice in one innings → sum the counters"""
+    return old[:6] + tuple(a + b for a, b in zip(old[6:], new[6:]))
+
+
+# match_start_date is the match's start_date (UNDATED until it is loaded): same season partition as the match
+INNINGS = Upsert("match_innings", [
+    "match_id", "match_start_date", "innings_id", "innings_number",
+    "batting_team", "bowling_team", "batting_team_id", "bowling_team_id",
+    "runs", "wickets", "overs",
+], key=["match_id", "innings_id"], partition_by="match_start_date", update={
+    "innings_number": "EXCLUDED.innings_number",
+    "batting_team": "COALESCE(EXCLUDED.batting_team, match_innings.batting_team)",
+    "bowling_team": "COALESCE(EXCLUDED.bowling_team, match_innings.bowling_team)",
+    "batting_team_id": "COALESCE(EXCLUDED.batting_team_id, match_innings.batting_team_id)",
+    "bowling_team_id": "COALESCE(EXCLUDED.bowling_team_id, match_innings.bowling_team_id)",
+    "runs": "EXCLUDED.runs",
+    "wickets": "EXCLUDED.wickets",
+    "overs": "EXCLUDED.overs",
+})
+
+BATTING = Upsert("batting_scorecard", [
+    "match_id", "match_start_date", "innings_id", "player_id", "player_name", "team_name",
+    "runs", "balls_faced", "fours", "sixes", "strike_rate",
+    "batting_position", "dismissal", "is_not_out",
+], key=["match_id", "innings_id", "player_id"], partition_by="match_start_date", update={
+    "team_name": "COALESCE(EXCLUDED.team_name, batting_scorecard.team_name)",
+    **{c: f"EXCLUDED.{c}" for c in (
+        "runs", "balls_faced", "fours", "sixes", "strike_rate",
+        "batting_position", "dismissal", "is_not_out")},
+})
+
+BOWLING = Upsert("bowling_scorecard", [
+    "match_id", "match_start_date", "innings_id", "player_id", "player_name", "team_name",
+    "overs", "maidens", "runs_conceded", "wickets", "economy_rate",
+], key=["match_id", "innings_id", "player_id"], partition_by="match_start_date", update={
+    "team_name": "COALESCE(EXCLUDED.team_name, bowling_scorecard.team_name)",
+    **{c: f"EXCLUDED.{c}" for c in ("overs", "maidens", "runs_conceded", "wickets", "economy_rate")},
+})
+
+# fielding events are summed per innings in memory, so a rerun overwrites instead of double counting
+FIELDING = Upsert("fielding_scorecard", [
+    "match_id", "match_start_date", "innings_id", "player_id", "player_name", "team_name",
+    "catches", "stumpings", "runouts",
+], key=["match_id", "innings_id", "player_id"], partition_by="match_start_date", update={
+    "team_name": "COALESCE(EXCLUDED.team_name, fielding_scorecard.team_name)",
+    "catches": "EXCLUDED.catches",
+    "stumpings": "EXCLUDED.stumpings",
+    "runouts": "EXCLUDED.runouts",
+}, merge=_add_fielding)
+
+SPECS = [INNINGS, BATTING, BOWLING, FIELDING]
+
+
+# ---------------- Dismissal parsing ----------------
+DISMISSAL_RE = {
+    "catch": re.compile(r"^c\s+([^b]+)", re.I),
+    "stump": re.compile(r"^st\s+([^(]+)", re.I),
+    "runout": re.compile(r"run out\s*\(([^)]+)\)", re.I),
+}
+SCORE_RX = re.compile(r"(\d+)(?:/(\d+))?")
+
+def get_out_text(row): return row.get("outdec") or row.get("outdesc") or row.get("outtext")
+
+def parse_fielding(out_text):
+    if not out_text: return []
+    evts = []
+    m = DISMISSAL_RE["catch"].search(out_text)
+    if m: evts.append((clean_name(m.group(1)), "catch"))
+    m = DISMISSAL_RE["stump"].search(out_text)
+    if m: evts.append((clean_name(m.group(1)), "stumping"))
+    m = DISMISSAL_RE["runout"].search(out_text)
+    if m:
+        for n in m.group(1).split("/"):
+            evts.append((clean_name(n), "runout"))
+    return evts
+
+def extract_runs_wkts_overs(inns):
+    runs = try_int(inns.get("runs"))
+    wkts = try_int(inns.get("wickets"))
+    overs = try_float(inns.get("overs"))
+    score_val = inns.get("score")
+    if (runs is None or wkts is None) and score_val:
+        m = SCORE_RX.search(str(score_val))
+        if m:
+            if runs is None: runs = int(m.group(1))
+            if wkts is None: wkts = int(m.group(2) or 0)
+    return runs or 0, wkts or 0, overs or 0.0
+
+def build_team_catalog(match_info):
+    # names <-> ids from match_info.team1/team2
+    t1 = (match_info.get("team1") or {})
+    t2 = (match_info.get("team2") or {})
+    t1_id, t1_name = try_int(t1.get("teamid")), clean_name(t1.get("teamname"))
+    t2_id, t2_name = try_int(t2.get("teamid")), clean_name(t2.get("teamname"))
+    names_to_ids = {}
+    if t1_id and t1_name: names_to_ids[t1_name.lower()] = t1_id
+    if t2_id and t2_name: names_to_ids[t2_name.lower()] = t2_id
+    pair = ((t1_id, t1_name), (t2_id, t2_name))
+    return names_to_ids, pair
+
+def extract_teams_from_innings(inns, match_info):
+    """
+    Robustly extract batting/bowling team name & id from many possible shapes.
+    """
+    bd = inns.get("batteamdetails") or {}
+    bowld = inns.get("bowlteamdetails") or {}
+
+    bat_name = first_non_empty(
+        bd.get("batteamname"),
+        inns.get("batteamname"),
+        (inns.get("batteam") or {}).get("name"),
+        inns.get("batteamshortname"),
+    )
+    bowl_name = first_non_empty(
+        bowld.get("bowlteamname"),
+        inns.get("bowlteamname"),
+        (inns.get("bowlteam") or {}).get("name"),
+        inns.get("bowlteamshortname"),
+    )
+    bat_id = first_non_empty(
+        try_int(bd.get("batteamid")),
+        try_int(inns.get("batteamid")),
+        try_int((inns.get("batteam") or {}).get("id")),
+    )
+    bowl_id = first_non_empty(
+        try_int(bowld.get("bowlteamid")),
+        try_int(inns.get("bowlteamid")),
+        try_int((inns.get("bowlteam") or {}).get("id")),
+    )
+
+    # deduce the missing side as "the other" team from match_info
+    names_to_ids, ((t1_id, t1_name), (t2_id, t2_name)) = build_team_catalog(match_info)
+    if t1_name and t2_name:
+        if bat_name and not bowl_name:
+            bowl_name = t2_name if bat_name == t1_name else t1_name
+        if bowl_name and not bat_name:
+            bat_name = t1_name if bowl_name == t2_name else t2_name
+
+    # fill missing IDs from name using catalog
+    if bat_name and not bat_id:
+        bat_id = names_to_ids.get(bat_name.lower())
+    if bowl_name and not bowl_id:
+        bowl_id = names_to_ids.get(bowl_name.lower())
+
+    bat_name = clean_name(bat_name) if bat_name else None
+    bowl_name = clean_name(bowl_name) if bowl_name else None
+    return bat_id, bat_name, bowl_id, bowl_name
+
+
+# ---------------- Rows ----------------
+def batting_row(match_id, played, innings_id, team, pos, b):
+    out = get_out_text(b)
+    return (
+        match_id, played, innings_id,
+        safe_player_id(b, extra=team),
+        clean_name(b.get("name")),
+        team,
+        safe_int(b.get("runs")),
+        safe_int(b.get("balls")),
+        safe_int(b.get("fours")),
+        safe_int(b.get("sixes")),
+        safe_float(first_non_empty(b.get("strkrate"), b.get("strikerate"))),
+        pos,
+        out,
+        not out,
+    )
+
+def bowling_row(match_id, played, innings_id, team, bowler):
+    return (
+        match_id, played, innings_id,
+        safe_player_id(bowler, extra=team),
+        clean_name(bowler.get("name")),
+        team,
+        safe_float(bowler.get("overs")),
+        safe_int(bowler.get("maidens")),
+        safe_int(bowler.get("runs")),
+        safe_int(bowler.get("wickets")),
+        safe_float(bowler.get("economy")),
+    )
+
+def fielding_row(match_id, played, innings_id, team, fielder, action):
+    return (
+        match_id, played, innings_id, name_hash_id(fielder, team), clean_name(fielder), team,
+        int(action == "catch"), int(action == "stumping"), int(action == "runout"),
+    )
+
+
+def add_scorecard(writer, mid, info, sc, counters, played=UNDATED):
+    """Stage innings/batting/bowling/fielding rows for one normalized scorecard (`played`: the match's start_date)"""
+    scards = (sc or {}).get("scorecard") or []
+    if not scards:
+        return
+    for i, inns in enumerate(scards, start=1):
+        innings_id = try_int(inns.get("inningsid")) or i
+        bat_id, bat_name, bowl_id, bowl_name = extract_teams_from_innings(inns, info)
+        runs, wkts, overs = extract_runs_wkts_overs(inns)
+
+        writer.add("match_innings", (mid, played, innings_id, i, bat_name, bowl_name, bat_id, bowl_id, runs, wkts, overs))
+        counters["innings"] += 1
+
+        for pos, b in enumerate(inns.get("batsman") or [], start=1):
+            writer.add("batting_scorecard", batting_row(mid, played, innings_id, bat_name, pos, b))
+            counters["batting"] += 1
+            # Fielding attribution from dismissals -> bowling team
+            for fname, act in parse_fielding(get_out_text(b)):
+                writer.add("fielding_scorecard", fielding_row(mid, played, innings_id, bowl_name, fname, act))
+                counters["fielding"] += 1
+
+        # Bowling (belongs to bowling/fielding team)
+        for bowler in inns.get("bowler") or []:
+            writer.add("bowling_scorecard", bowling_row(mid, played, innings_id, bowl_name, bowler))
+            counters["bowling"] += 1
+
+    counters["matches"] += 1
+
+
+# ---------------- Main ----------------
+def run(rebuild=False):
+    """Derive the scorecard tables from raw_scorecards (synced first unless `rebuild`, which re-derives every match offline)"""
+    counters = {"matches": 0, "innings": 0, "batting": 0, "bowling": 0, "fielding": 0}
+    with get_conn() as conn:
+        if not rebuild:
+            sync(conn)
+            conn.commit()
+        cur = conn.cursor()
+        ensure_tables(cur, *TABLES, "raw_scorecards", "ingestion_state")
+        state = IngestionState(cur, "scorecards")
+        dates = match_dates(cur)
+        with BulkWriter(cur, SPECS + [STATE]) as writer:
+            for mid, info, sc in iter_stored_scorecards(conn, state, writer, rebuild):
+                add_scorecard(writer, mid, info, sc, counters, dates.get(mid, UNDATED))
+        bump_table_versions(cur, *TABLES)
+    print(f"\n✅ Insert summary: {counters}, matches: {state.counts}")
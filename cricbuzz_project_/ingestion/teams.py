@@ -0,0 +1,43 @@
+# ===========================================================
+#                   Team Tables
+# ===========================================================
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.api import api_get
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.schema import ensure_tables
+
+MATCH_ENDPOINTS = ["/matches/v1/live", "/matches/v1/recent"]
+
+TEAMS = Upsert("teams", ["team_id", "team_name", "team_sname", "country"], key=["team_id"])
+
+
+def iter_match_teams():
+    """Yield team1/team2 dicts from the live + recent match lists"""
+    for path in MATCH_ENDPOINTS:
+        data = api_get(path)
+        if not data:
+            print(f"⚠ No data from {path}")
+            continue
+        for type_match in data.get("typeMatches", []):
+            for series_item in type_match.get("seriesMatches", []):
+                series_info = series_item.get("seriesAdWrapper", {})
+                for match in series_info.get("matches", []):
+                    match_info = match.get("matchInfo", {})
+                    for team in (match_info.get("team1"), match_info.get("team2")):
+                        if team:
+                            yield team
+
+
+def run():
+    with get_conn() as conn:
+        cur = conn.cursor()
+        ensure_tables(cur, "teams")
+        with BulkWriter(cur, [TEAMS]) as writer:
+            for team in iter_match_teams():
+                team_id, team_name = team.get("teamId"), team.get("teamName")
+                if team_id and team_name:
+                    writer.add("teams", (team_id, team_name, team.get("teamSName"), team_name))
+        bump_table_versions(cur, "teams")
+    print(f"✔ Inserted/Updated {writer.counts['teams']} teams")
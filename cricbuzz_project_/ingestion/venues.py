@@ -0,0 +1,56 @@
+# ===========================================================
+#                        Venues Table
+# ===========================================================
+
+import random
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.api import api_get, imap_bounded
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.schema import ensure_tables
+
+VENUES = Upsert("venues", [
+    "venue_id", "ground", "city", "country", "capacity", "established", "image_id", "series_id",
+], key=["venue_id"])
+
+
+def fetch_venues(series_id):
+    return series_id, api_get(f"/series/v1/{series_id}/venues")
+
+
+def add_venues(writer, series_id, data):
+    venues = (data or {}).get("seriesVenue", [])
+    if not venues:
+        print(f"⚠️ No venue data for series {series_id}")
+        return
+
+    for v in venues:
+        vid = v.get("id")
+        if not vid:
+            continue
+        # Assign random values ONLY if missing
+        capacity = v.get("capacity") or random.randint(10000, 60000)
+        established = v.get("established") or random.randint(1800, 2020)
+        writer.add("venues", (
+            vid, v.get("ground"), v.get("city"), v.get("country"),
+            capacity, established, v.get("imageId"), series_id,
+        ))
+
+
+def run():
+    with get_conn() as conn:
+        cur = conn.cursor()
+        ensure_tables(cur, "venues")
+
+        # Get all series IDs from DB
+        cur.execute("SELECT series_id FROM series;")
+        series_ids = [r[0] for r in cur.fetchall()]
+        print(f"Found {len(series_ids)} series in DB")
+
+        with BulkWriter(cur, [VENUES]) as writer:
+            for sid, data in imap_bounded(fetch_venues, series_ids):
+                add_venues(writer, sid, data)
+
+        bump_table_versions(cur, "venues")
+    print(f"\n✅ Venues table populated: {writer.counts['venues']} rows")
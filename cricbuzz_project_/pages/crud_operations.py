@@ -1,26 +1,11 @@
 import streamlit as st
 import pandas as pd
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from dotenv import load_dotenv
-import os
+from psycopg2.extras import RealDictCursor, execute_values
 from streamlit_option_menu import option_menu
-
-# ---------------- Load ENV ----------------
-dotenv_path = r"C:\Users\Amirtha\Downloads\cricbuzz_project_sanjay\utils\.env"
-load_dotenv(dotenv_path)
-
-DB_HOST = os.getenv("DB_HOST", "localhost")
-DB_PORT = os.getenv("DB_PORT", "5432")
-DB_NAME = os.getenv("DB_NAME", "Cricbuz")
-DB_USER = os.getenv("DB_USER", "postgres")
-DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
-
-def get_conn():
-    return psycopg2.connect(
-        host=DB_HOST, port=DB_PORT, dbname=DB_NAME,
-        user=DB_USER, password=DB_PASSWORD
-    )
+from utils.db_connection import get_conn
+from utils.query_cache import invalidate_tables, query_cache
+from utils.player_bulk import BulkError, export_players, file_format, import_players
+import io
 
 # ---------------- Helpers ----------------
 def fetch_players():
@@ -28,14 +13,86 @@ def fetch_players():
         cur.execute("SELECT player_id, full_name FROM players ORDER BY full_name;")
         return cur.fetchall()
 
-def fetch_teams():
+TEAMS_SQL = "SELECT team_id, team_name, country FROM teams ORDER BY team_name;"
+
+def _read_dicts(query, params):
     with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
-        cur.execute("SELECT team_id, team_name, country FROM teams ORDER BY team_name;")
+        cur.execute(query, params)
         return cur.fetchall()
 
-def fetch_all_players():
-    with get_conn() as conn:
-        df = pd.read_sql("""
+def fetch_teams():
+    # shared cache, dropped whenever the teams table version is bumped
+    return query_cache.get_or_run(TEAMS_SQL, None, _read_dicts)
+
+def team_options():
+    """{label: team_id} for team pickers"""
+    team_map = {"— None —": None}
+    for t in fetch_teams(): team_map[f"{t['team_name']} ({t['country']})"] = t["team_id"]
+    return team_map
+
+EDIT_SEARCH_LIMIT = 1000
+
+def search_players_for_edit(name, limit=EDIT_SEARCH_LIMIT):
+    """Players whose name / nick name contains `name`, by name, for the Update page
+    → (DataFrame with editable columns as stored, True when `limit` cut the list)"""
+    with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute("""
+            SELECT p.player_id, p.full_name, p.nick_name, p.role, p.batting_style, p.bowling_style,
+                   p.team_id, COALESCE(t.team_name,'—') AS team
+            FROM players p
+            LEFT JOIN teams t ON p.team_id = t.team_id
+            WHERE %(q)s = '' OR p.full_name ILIKE %(like)s OR p.nick_name ILIKE %(like)s
+            ORDER BY COALESCE(p.full_name, ''), p.player_id
+            LIMIT %(n)s;
+        """, {"q": name, "like": f"%{name}%", "n": limit + 1})
+        rows = cur.fetchall()
+    return pd.DataFrame(rows[:limit]), len(rows) > limit
+
+# sortable columns → SQL expression (COALESCE keeps keyset comparisons NULL-safe;
+# the players expressions are indexed by migration 0002). Sentinels must survive the
+# round trip as a cursor: '-infinity' would come back as datetime.min, past NULL rows.
+SORT_COLUMNS = {
+    "player_id": "p.player_id",
+    "full_name": "COALESCE(p.full_name, '')",
+    "role": "COALESCE(p.role, '—')",
+    "team": "COALESCE(t.team_name, '—')",
+    "country": "COALESCE(t.country, '—')",
+    "created_at": "COALESCE(p.created_at, '1900-01-01'::timestamp)",
+}
+PAGE_SIZE = 50
+
+def fetch_player_page(filters=None, sort="player_id", descending=False, after=None, limit=PAGE_SIZE):
+    """One keyset page of players → (DataFrame, cursor for the next page or None)
+
+    filters: {"name", "team", "country", "role"}; after: the cursor returned for the previous page
+    """
+    filters = filters or {}
+    expr = SORT_COLUMNS[sort]
+    where, params = [], []
+    if filters.get("name"):
+        where.append("(p.full_name ILIKE %s OR p.nick_name ILIKE %s)")
+        params += [f"%{filters['name']}%"] * 2
+    if filters.get("team"):
+        where.append("t.team_name ILIKE %s")
+        params.append(f"%{filters['team']}%")
+    if filters.get("country"):
+        where.append("t.country ILIKE %s")
+        params.append(f"%{filters['country']}%")
+    if filters.get("role"):
+        where.append("p.role = %s")
+        params.append(filters["role"])
+    if after is not None:
+        op = "<" if descending else ">"
+        if sort == "player_id":
+            where.append(f"p.player_id {op} %s")
+            params.append(after[1])
+        else:
+            where.append(f"({expr}, p.player_id) {op} (%s, %s)")
+            params += list(after)
+    order = "DESC" if descending else "ASC"
+
+    with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"""
             SELECT p.player_id, p.full_name,
                    COALESCE(p.nick_name,'—') AS nick_name,
                    COALESCE(t.team_name,'—') AS team,
@@ -44,12 +101,27 @@ def fetch_all_players():
                    COALESCE(p.batting_style,'N/A') AS batting_style,
                    COALESCE(p.bowling_style,'N/A') AS bowling_style,
                    p.team_id,
-                   p.created_at
+                   p.created_at,
+                   {expr} AS _sort_key
             FROM players p
             LEFT JOIN teams t ON p.team_id = t.team_id
-            ORDER BY p.player_id;
-        """, conn)
-    return df
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY {expr} {order}, p.player_id {order}
+            LIMIT %s;
+        """, params + [limit + 1])
+        rows = cur.fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = (rows[-1]["_sort_key"], rows[-1]["player_id"])
+    df = pd.DataFrame(rows)
+    return df.drop(columns=["_sort_key"], errors="ignore"), next_cursor
+
+def fetch_roles():
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute("SELECT DISTINCT role FROM players WHERE role IS NOT NULL ORDER BY role;")
+        return [r[0] for r in cur.fetchall()]
 
 def insert_player(data):
     with get_conn() as conn, conn.cursor() as cur:
@@ -65,7 +137,9 @@ def insert_player(data):
         ))
         row = cur.fetchone()
         conn.commit()
-        return row[0] if row else None
+    if row:
+        invalidate_tables("players")
+    return row[0] if row else None
 
 def update_player(pid, data):
     with get_conn() as conn, conn.cursor() as cur:
@@ -80,11 +154,33 @@ def update_player(pid, data):
             data["team_id"], pid
         ))
         conn.commit()
+    invalidate_tables("players")
+
+EDITABLE_COLUMNS = ["full_name", "nick_name", "role", "batting_style", "bowling_style", "team_id"]
+
+def update_players(rows):
+    """Apply many edits in one transaction with a single UPDATE ... FROM (VALUES ...)"""
+    if not rows:
+        return 0
+    with get_conn() as conn, conn.cursor() as cur:
+        execute_values(cur, f"""
+            UPDATE players AS p
+            SET full_name = v.full_name, nick_name = v.nick_name, role = v.role,
+                batting_style = v.batting_style, bowling_style = v.bowling_style,
+                team_id = v.team_id::bigint
+            FROM (VALUES %s) AS v (player_id, {", ".join(EDITABLE_COLUMNS)})
+            WHERE p.player_id = v.player_id::bigint
+        """, [(r["player_id"], *(r[c] for c in EDITABLE_COLUMNS)) for r in rows], page_size=len(rows))
+        count = cur.rowcount
+        conn.commit()
+    invalidate_tables("players")
+    return count
 
 def delete_player(pid):
     with get_conn() as conn, conn.cursor() as cur:
         cur.execute("DELETE FROM players WHERE player_id=%s", (pid,))
         conn.commit()
+    invalidate_tables("players")
 
 # ---------------- Page Config ----------------
 st.set_page_config(page_title="✍️ Cricbuzz CRUD Manager", layout="wide")
@@ -186,8 +282,8 @@ st.markdown("""
 with st.sidebar:
     menu = option_menu(
         "Navigation",
-        ["➕ Add Player", "✏️ Update Player", "🗑 Delete Player", "📊 View Players"],
-        icons=["plus-circle", "pencil-square", "trash", "table"],
+        ["➕ Add Player", "✏️ Update Player", "🗑 Delete Player", "📊 View Players", "📦 Bulk Import / Export"],
+        icons=["plus-circle", "pencil-square", "trash", "table", "box-seam"],
         menu_icon="cast",
         default_index=0,
         styles={
@@ -222,9 +318,7 @@ if menu == "➕ Add Player":
         with col2:
             bat_style = st.selectbox("Batting Style", batting_styles)
             bowl_style = st.selectbox("Bowling Style", bowling_styles)
-        teams = fetch_teams()
-        team_map = {"— None —": None}
-        for t in teams: team_map[f"{t['team_name']} ({t['country']})"] = t["team_id"]
+        team_map = team_options()
         team_label = st.selectbox("Team", list(team_map.keys()))
         team_id = team_map[team_label]
         submit = st.form_submit_button("✅ Add Player")
@@ -247,13 +341,24 @@ if menu == "➕ Add Player":
 # ---------------- Update ----------------
 elif menu == "✏️ Update Player":
     st.subheader("✏️ Update Player")
-    players = fetch_players()
-    if not players: st.warning("No players found.")
-    else:
-        pick = st.selectbox("🔍 Search Player", players, format_func=lambda x: x['full_name'])
+    mode = st.radio("Mode", ["Single player", "Grid (many players)"], horizontal=True, label_visibility="collapsed")
+    team_map = team_options()
+    team_labels = {v: k for k, v in team_map.items()}
+    query = st.text_input("🔍 Search Player")
+    # raw values: the grid saves every editable column, so display placeholders must not reach it
+    matches, truncated = search_players_for_edit(query.strip())
+    if truncated:
+        st.info(f"ℹ️ Showing the first {EDIT_SEARCH_LIMIT:,} players by name, refine your search to find others.")
+
+    if matches.empty: st.warning("No players found.")
+    elif mode == "Single player":
+        picks = matches.to_dict("records")
+        pick = st.selectbox("Select Player", picks, format_func=lambda x: f"{x['full_name']} ({x['team']})")
         sel_id = pick["player_id"]
-        df = fetch_all_players()
-        row = df[df["player_id"] == sel_id].iloc[0]
+        # form placeholders for unset columns, as on the View page
+        row = {**pick, **{c: pick[c] if isinstance(pick[c], str) and pick[c] else shown
+                          for c, shown in (("nick_name", "—"), ("role", "—"),
+                                           ("batting_style", "N/A"), ("bowling_style", "N/A"))}}
         with st.form("update_form", clear_on_submit=False):
             col1, col2 = st.columns(2)
             with col1:
@@ -263,9 +368,6 @@ elif menu == "✏️ Update Player":
             with col2:
                 bat_style = st.selectbox("Batting Style", batting_styles, index=batting_styles.index(row["batting_style"]) if row["batting_style"] in batting_styles else 2)
                 bowl_style = st.selectbox("Bowling Style", bowling_styles, index=bowling_styles.index(row["bowling_style"]) if row["bowling_style"] in bowling_styles else len(bowling_styles)-1)
-            teams = fetch_teams()
-            team_map = {"— None —": None}
-            for t in teams: team_map[f"{t['team_name']} ({t['country']})"] = t["team_id"]
             team_label = st.selectbox("Team", list(team_map.keys()), index=list(team_map.values()).index(row["team_id"]) if row["team_id"] in team_map.values() else 0)
             team_id = team_map[team_label]
             submit = st.form_submit_button("🔄 Update Player")
@@ -278,6 +380,31 @@ elif menu == "✏️ Update Player":
                 st.session_state.last_modified_id, st.session_state.last_deleted_id = sel_id, None
                 st.success(f"✅ Player **{full_name}** updated successfully")
                 st.balloons()
+    else:
+        # edits are collected client-side and saved together in one transaction
+        grid = matches[["player_id", *EDITABLE_COLUMNS]].copy()
+        grid["team_id"] = grid["team_id"].map(lambda t: team_labels.get(t, "— None —"))
+        edited = st.data_editor(
+            grid, key="players_grid", hide_index=True, num_rows="fixed", use_container_width=True,
+            disabled=["player_id"],
+            column_config={"team_id": st.column_config.SelectboxColumn("team", options=list(team_map.keys()), required=True)},
+        )
+        changed = edited[(edited[EDITABLE_COLUMNS].fillna("") != grid[EDITABLE_COLUMNS].fillna("")).any(axis=1)]
+        st.caption(f"{len(changed)} player(s) changed")
+        if st.button("💾 Save changes", disabled=changed.empty):
+            rows = changed.to_dict("records")
+            for r in rows:
+                r["player_id"] = int(r["player_id"])
+                r["team_id"] = team_map.get(r["team_id"])
+                r["full_name"] = (r["full_name"] or "").strip()
+                for c in ("nick_name", "role", "batting_style", "bowling_style"):
+                    r[c] = (r[c].strip() or None) if isinstance(r[c], str) else None   # cleared / NaN cells → NULL
+            if any(not r["full_name"] for r in rows):
+                st.error("⚠️ Full Name is required")
+            else:
+                count = update_players(rows)
+                st.session_state.last_modified_id, st.session_state.last_deleted_id = rows[-1]["player_id"], None
+                st.success(f"✅ {count} player(s) updated in one transaction")
 
 # ---------------- Delete ----------------
 elif menu == "🗑 Delete Player":
@@ -300,9 +427,26 @@ elif menu == "🗑 Delete Player":
 # ---------------- View ----------------
 elif menu == "📊 View Players":
     st.subheader("📊 Player Records")
-    df = fetch_all_players()
-    search = st.text_input("🔍 Search Player")
-    if search: df = df[df["full_name"].str.contains(search, case=False)]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1: search = st.text_input("🔍 Search Player")
+    with col2: team_q = st.text_input("🏳️ Team")
+    with col3: country_q = st.text_input("🌍 Country")
+    with col4: role_q = st.selectbox("🧢 Role", ["All", *fetch_roles()])
+    col5, col6 = st.columns([3, 1])
+    with col5: sort = st.selectbox("↕️ Sort by", list(SORT_COLUMNS), format_func=lambda c: c.replace("_", " ").title())
+    with col6: descending = st.toggle("Descending")
+
+    filters = {"name": search.strip(), "team": team_q.strip(), "country": country_q.strip(),
+               "role": None if role_q == "All" else role_q}
+    # cursors of the pages visited so far; any filter/sort change starts over at page 1
+    view_key = (tuple(filters.items()), sort, descending)
+    if st.session_state.get("players_view") != view_key:
+        st.session_state.players_view = view_key
+        st.session_state.players_cursors = [None]
+    cursors = st.session_state.players_cursors
+
+    df, next_cursor = fetch_player_page(filters, sort, descending, after=cursors[-1])
+
     def highlight_row(x):
         if 'player_id' in x:
             if st.session_state.last_modified_id and x['player_id'] == st.session_state.last_modified_id:
@@ -310,4 +454,61 @@ elif menu == "📊 View Players":
             if st.session_state.last_deleted_id and x['player_id'] == st.session_state.last_deleted_id:
                 return ['background-color: #f8cdda'] * len(x)
         return [''] * len(x)
-    st.dataframe(df.style.apply(highlight_row, axis=1))
+    if df.empty:
+        st.warning("No players match these filters.")
+    else:
+        st.dataframe(df.style.apply(highlight_row, axis=1))
+
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("⬅️ Previous", disabled=len(cursors) == 1):
+            cursors.pop()
+            st.rerun()
+    with page_col:
+        st.caption(f"Page {len(cursors)} · {PAGE_SIZE} players per page")
+    with next_col:
+        if st.button("Next ➡️", disabled=next_cursor is None):
+            cursors.append(next_cursor)
+            st.rerun()
+
+# ---------------- Bulk ----------------
+elif menu == "📦 Bulk Import / Export":
+    st.subheader("📦 Bulk Import / Export")
+    st.caption("Files stream through COPY in batches. For files bigger than the upload limit use "
+               "`python -m utils.player_bulk import|export <file>`.")
+
+    st.write("### ⬆️ Import roster")
+    st.caption("Columns: player_id, full_name (required), nick_name, role, batting_style, bowling_style, "
+               "is_keeper, is_captain, team_id. Blank cells keep the stored value.")
+    upload = st.file_uploader("CSV or Parquet file", type=["csv", "parquet"])
+    if upload and st.button("🚀 Import players"):
+        rejects = io.StringIO()
+        try:
+            with st.spinner("Importing..."):
+                result = import_players(upload, file_format(upload.name), rejects)
+        except BulkError as e:
+            st.error(f"⚠️ {e}")
+        else:
+            st.success(f"✅ {result.loaded} player(s) merged from {result.read} row(s)")
+            if result.rejected:
+                st.warning(f"⚠️ {result.rejected} row(s) rejected")
+                st.dataframe(pd.DataFrame(
+                    [{"line": line, "reason": reason, **record} for line, reason, record in result.samples]
+                ), use_container_width=True)
+                st.download_button("⬇️ Download rejected rows", rejects.getvalue(), "rejected_players.csv", "text/csv")
+
+    st.write("### ⬇️ Export players")
+    fmt = st.radio("Format", ["csv", "parquet"], horizontal=True)
+    if st.button("📤 Prepare export"):
+        # COPY / Arrow batches straight into the buffer, never built up as a DataFrame
+        buf = io.BytesIO()
+        try:
+            with st.spinner("Exporting..."):
+                export_players(buf, fmt)
+            st.session_state.players_export = (buf.getvalue(), fmt)
+        except BulkError as e:
+            st.error(f"⚠️ {e}")
+    if "players_export" in st.session_state:
+        data, exported = st.session_state.players_export
+        st.download_button(f"⬇️ Download players.{exported}", data, f"players.{exported}",
+                           "text/csv" if exported == "csv" else "application/octet-stream")
@@ -1,11 +1,9 @@
 import streamlit as st
-import requests
 import pandas as pd
 from datetime import datetime
-
-# 🔑 API Key
-CRICBUZZ_API_KEY = "d723372ef9mshf19bc74dba24b9fp17cbc7jsn6ff8a547531f"
-CRICBUZZ_HOST = "cricbuzz-cricket.p.rapidapi.com"
+from utils.api_utils import get_client
+from utils.live_poller import get_poller, iter_live_matches, match_summary
+from utils.live_scorecard import get_live_scorecards, parse_innings
 
 # ---------------- Theme CSS ----------------
 st.markdown("""
@@ -76,29 +74,23 @@ st.markdown("""
 
 # ---------------- API Class ----------------
 class CricbuzzAPI:
+    """Page-level wrapper over the shared keep-alive client (errors surface as st.error)"""
+
     def __init__(self):
-        self.headers = {
-            "x-rapidapi-key": CRICBUZZ_API_KEY,
-            "x-rapidapi-host": CRICBUZZ_HOST,
-        }
-        self.base_url = "https://cricbuzz-cricket.p.rapidapi.com"
+        self.client = get_client()
+        self.headers = self.client.headers
+        self.base_url = self.client.base_url
 
     def get_live_matches(self):
         try:
-            url = f"{self.base_url}/matches/v1/live"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_live_matches()
         except Exception as e:
             st.error(f"⚠ Error fetching live matches: {e}")
             return {}
 
     def get_scorecard(self, match_id: str):
         try:
-            url = f"{self.base_url}/mcenter/v1/{match_id}/scard"
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self.client.get_scorecard(match_id)
         except Exception as e:
             st.error(f"⚠ Error fetching scorecard: {e}")
             return {}
@@ -112,76 +104,96 @@ def format_time(epoch_ms):
     except:
         return "N/A"
 
-def show_innings_scorecard(api: CricbuzzAPI, match_id: str):
-    data = api.get_scorecard(match_id)
-    if not data or "scorecard" not in data:
-        st.warning("⚠ No scorecard data available.")
-        return
-
-    for i, innings in enumerate(data.get("scorecard", []), start=1):
-        team_name = innings.get("batteamname", "Unknown")
-        st.subheader(f"📊 Inning {i} - {team_name}")
-
-        # 🏏 Batting
-        batsmen_df = pd.DataFrame([
-            {
-                "Batsman": b.get("name", ""),
-                "Runs": b.get("runs", 0),
-                "Balls": b.get("balls", 0),
-                "4s": b.get("fours", 0),
-                "6s": b.get("sixes", 0),
-                "SR": b.get("strkrate", 0),
-                "Out": b.get("outdec", ""),
-            }
-            for b in innings.get("batsman", [])
-        ])
-
-        # ☄️ Bowling
-        bowlers_df = pd.DataFrame([
-            {
-                "Bowler": bl.get("name", ""),
-                "Overs": bl.get("overs", 0),
-                "Runs": bl.get("runs", 0),
-                "Wickets": bl.get("wickets", 0),
-                "Economy": bl.get("economy", 0),
-            }
-            for bl in innings.get("bowler", [])
-        ])
-
-        # 🔎 Summary
-        if not batsmen_df.empty:
-            top_bat = batsmen_df.loc[batsmen_df["Runs"].idxmax()]
-            bat_summary = f"🏏 Top Scorer: **{top_bat['Batsman']}** with {top_bat['Runs']} runs ({top_bat['Balls']} balls, SR {top_bat['SR']})"
-        else:
-            bat_summary = "🏏 No batting data"
-
-        if not bowlers_df.empty:
-            top_bowl = bowlers_df.loc[bowlers_df["Wickets"].idxmax()]
-            bowl_summary = f"☄️ Best Bowler: **{top_bowl['Bowler']}** with {top_bowl['Wickets']} wickets, Econ {top_bowl['Economy']}"
-        else:
-            bowl_summary = "☄️ No bowling data"
-
+@st.cache_data(max_entries=256, show_spinner=False)
+def innings_frames(match_id, innings_no, version):
+    """Batting/bowling frames for one live innings; rebuilt only when its version moves"""
+    parsed = get_live_scorecards().innings(match_id).get(innings_no) or {"batters": {}, "bowlers": {}}
+    return pd.DataFrame(list(parsed["batters"].values())), pd.DataFrame(list(parsed["bowlers"].values()))
+
+def show_delta(delta):
+    """What changed in this innings since the previous refresh"""
+    lines = []
+    if delta.get("totals") and not delta.get("new_innings"):
+        t = delta["totals"]
+        lines.append(f"📈 Score now {t['runs']}/{t['wickets']} ({t['overs']} ov)")
+    for w in delta.get("wickets", []):
+        lines.append(f"☝️ Wicket: <b>{w['batsman']}</b> {w['how']} — {w['runs']} ({w['balls']})")
+    if not delta.get("new_innings"):
+        for b in delta.get("batters", []):
+            lines.append(f"🏏 {b['Batsman']}: {b['Runs']} ({b['Balls']})")
+        for bl in delta.get("bowlers", []):
+            lines.append(f"☄️ {bl['Bowler']}: {bl['Wickets']}/{bl['Runs']} in {bl['Overs']} ov")
+    if lines:
         st.markdown(f"""
         <div class="chat-box">
-        🤖 Match Summary (Inning {i}):<br>
-        {bat_summary}<br>
-        {bowl_summary}
+        🆕 Since last update:<br>
+        {"<br>".join(lines)}
         </div>
         """, unsafe_allow_html=True)
 
-        # Batting Table + Chart
-        if not batsmen_df.empty:
-            st.write("### 🏏 Batting")
-            st.dataframe(batsmen_df, use_container_width=True)
-            st.bar_chart(batsmen_df.set_index("Batsman")["Runs"])
+def render_innings(i, team_name, batsmen_df, bowlers_df, delta=None):
+    st.subheader(f"📊 Inning {i} - {team_name}")
+
+    # 🔎 Summary
+    if not batsmen_df.empty:
+        top_bat = batsmen_df.loc[batsmen_df["Runs"].idxmax()]
+        bat_summary = f"🏏 Top Scorer: **{top_bat['Batsman']}** with {top_bat['Runs']} runs ({top_bat['Balls']} balls, SR {top_bat['SR']})"
+    else:
+        bat_summary = "🏏 No batting data"
+
+    if not bowlers_df.empty:
+        top_bowl = bowlers_df.loc[bowlers_df["Wickets"].idxmax()]
+        bowl_summary = f"☄️ Best Bowler: **{top_bowl['Bowler']}** with {top_bowl['Wickets']} wickets, Econ {top_bowl['Economy']}"
+    else:
+        bowl_summary = "☄️ No bowling data"
+
+    st.markdown(f"""
+    <div class="chat-box">
+    🤖 Match Summary (Inning {i}):<br>
+    {bat_summary}<br>
+    {bowl_summary}
+    </div>
+    """, unsafe_allow_html=True)
 
-        # Bowling Table + Chart
-        if not bowlers_df.empty:
-            st.write("### ☄️ Bowling")
-            st.dataframe(bowlers_df, use_container_width=True)
-            st.bar_chart(bowlers_df.set_index("Bowler")["Wickets"])
+    if delta:
+        show_delta(delta)
 
-        st.markdown("---")
+    # Batting Table + Chart
+    if not batsmen_df.empty:
+        st.write("### 🏏 Batting")
+        st.dataframe(batsmen_df, use_container_width=True)
+        st.bar_chart(batsmen_df.set_index("Batsman")["Runs"])
+
+    # Bowling Table + Chart
+    if not bowlers_df.empty:
+        st.write("### ☄️ Bowling")
+        st.dataframe(bowlers_df, use_container_width=True)
+        st.bar_chart(bowlers_df.set_index("Bowler")["Wickets"])
+
+    st.markdown("---")
+
+def show_innings_scorecard(api: CricbuzzAPI, match_id: str):
+    # live matches: parsed once by the shared model, frames reused until the innings changes
+    model = get_live_scorecards()
+    live_innings = model.innings(match_id)
+    if live_innings:
+        for no, parsed in sorted(live_innings.items()):
+            batsmen_df, bowlers_df = innings_frames(match_id, no, model.version(match_id, no))
+            render_innings(no, parsed["team"], batsmen_df, bowlers_df, model.last_delta(match_id, no))
+        return
+
+    data = api.get_scorecard(match_id)
+    if not data or "scorecard" not in data:
+        st.warning("⚠ No scorecard data available.")
+        return
+
+    for i, innings in enumerate(data.get("scorecard", []), start=1):
+        parsed = parse_innings(innings)
+        render_innings(
+            i, parsed["team"],
+            pd.DataFrame(list(parsed["batters"].values())),
+            pd.DataFrame(list(parsed["bowlers"].values())),
+        )
 
 # ---------------- Live Matches ----------------
 def show_live_matches():
@@ -193,21 +205,24 @@ def show_live_matches():
     """, unsafe_allow_html=True)
 
     api = CricbuzzAPI()
-    data = api.get_live_matches()
+    # shared snapshot from the background poller — no upstream call on rerun
+    snap = get_poller().snapshot(wait=True)
+    data = snap.live
+
+    if snap.error:
+        st.caption(f"⚠ Last refresh failed ({snap.error}); showing the previous update.")
+    if snap.age is not None:
+        st.caption(f"🔄 Updated {snap.age:.0f}s ago")
 
     if not data or "typeMatches" not in data:
         st.warning("⚠ No live matches available right now.")
         return
 
     series_options = {}
-    for type_match in data.get("typeMatches", []):
-        match_type = type_match.get("matchType", "Unknown")
-        for series in type_match.get("seriesMatches", []):
-            series_info = series.get("seriesAdWrapper", {})
-            if "matches" in series_info:
-                series_name = series_info.get("seriesName", "Unknown Series")
-                key = f"{series_name} ({match_type})"
-                series_options[key] = series_info["matches"]
+    for match_type, series_info, match in iter_live_matches(data):
+        m = match_summary(match_type, series_info, match)
+        key = f"{m['series']} ({match_type})"
+        series_options.setdefault(key, []).append(m)
 
     if not series_options:
         st.warning("⚠ No active series at the moment.")
@@ -216,34 +231,20 @@ def show_live_matches():
     selected_series = st.selectbox("🛑 LIVE 🎥 Select a Live Series", list(series_options.keys()))
     matches = series_options[selected_series]
 
-    for match in matches:
-        match_info = match.get("matchInfo", {})
-        match_score = match.get("matchScore", {})
-
-        team1 = match_info.get("team1", {}).get("teamName", "Team 1")
-        team2 = match_info.get("team2", {}).get("teamName", "Team 2")
-        match_id = match_info.get("matchId", "")
+    for m in matches:
+        team1, team2, match_id = m["team1"], m["team2"], m["match_id"]
 
         st.markdown(f"<div class='match-card'><h3>🆚 {team1} vs {team2}</h3>", unsafe_allow_html=True)
-        st.write(f"**Match:** {match_info.get('matchDesc', '')} ({match_info.get('matchFormat', '')})")
-        st.write(f"**Status:** {match_info.get('status', '')}")
-        st.write(f"**State:** {match_info.get('stateTitle', '')}")
-
-        venue = match_info.get("venueInfo", {})
-        st.write(f"**Venue:** {venue.get('ground', '')}, {venue.get('city', '')}")
-        st.write(f"**Start Time:** {format_time(match_info.get('startDate'))}")
-        st.write(f"**End Time:** {format_time(match_info.get('endDate'))}")
+        st.write(f"**Match:** {m['desc']} ({m['format']})")
+        st.write(f"**Status:** {m['status']}")
+        st.write(f"**State:** {m['state']}")
+        st.write(f"**Venue:** {m['venue']}")
+        st.write(f"**Start Time:** {format_time(m['start_date'])}")
+        st.write(f"**End Time:** {format_time(m['end_date'])}")
 
         # Scores
-        if "team1Score" in match_score:
-            t1 = match_info.get("team1", {}).get("teamSName", "Team 1")
-            t1_inn = match_score.get("team1Score", {}).get("inngs1", {})
-            st.success(f"{t1}: {t1_inn.get('runs', 0)}/{t1_inn.get('wickets', 0)} in {t1_inn.get('overs', 0)} overs")
-
-        if "team2Score" in match_score:
-            t2 = match_info.get("team2", {}).get("teamSName", "Team 2")
-            t2_inn = match_score.get("team2Score", {}).get("inngs1", {})
-            st.success(f"{t2}: {t2_inn.get('runs', 0)}/{t2_inn.get('wickets', 0)} in {t2_inn.get('overs', 0)} overs")
+        for sc in m["scores"]:
+            st.success(f"{sc['team']}: {sc['runs']}/{sc['wickets']} in {sc['overs']} overs")
 
         if match_id and st.button(f"📑 View Scorecard - {team1} vs {team2}", key=f"btn_{match_id}"):
             show_innings_scorecard(api, match_id)
@@ -5,28 +5,60 @@ Execute 25+ SQL queries with progressive difficulty levels
 
 import streamlit as st
 import pandas as pd
-import psycopg2
-
-# ---------- DB CONFIG ----------
-DB_CONFIG = {
-    "host": "localhost",
-    "port": 5432,
-    "dbname": "Cricbuz",
-    "user": "postgres",
-    "password": "susmitha2102"
-}
+from utils.db_connection import pool_stats
+from utils.query_cache import query_cache
+from utils.queries import QUERIES
+from utils.query_profile import history, profile, with_trend, PROFILE_REGRESSION
+from utils.query_engine import QueryJob, QUERY_ROW_LIMIT, QUERY_TIMEOUT_MS, DONE, TRUNCATED, CANCELLED, TIMEOUT
+import time
 
 # ---------- Helper Functions ----------
-def run_query(query):
-    """Execute query and return dataframe"""
-    try:
-        conn = psycopg2.connect(**DB_CONFIG)
-        df = pd.read_sql(query, conn)
-        conn.close()
-        return df
-    except Exception as e:
-        st.error(f"❌ Database Error: {e}")
-        return pd.DataFrame()
+PREVIEW_ROWS = 1000   # rows rendered while a query is still streaming
+
+def show_job_progress(job, slot):
+    """Live metrics for a streaming query"""
+    with slot.container():
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rows fetched", f"{job.row_count:,}")
+        col2.metric("Elapsed", f"{job.elapsed:.1f}s")
+        col3.metric("Rows / sec", f"{job.rows_per_sec:,.0f}")
+
+def show_profile_panel(title, sql):
+    """EXPLAIN ANALYZE the question on demand and chart its timing history"""
+    st.markdown("#### 🔬 Query Profile")
+    if st.button("🔬 Profile with EXPLAIN ANALYZE"):
+        try:
+            with st.spinner("Profiling..."):
+                run = profile(title, sql)
+        except Exception as e:
+            st.error(f"❌ Profiling failed: {e}")
+        else:
+            col1, col2, col3, col4 = st.columns(4)
+            delta = None
+            if run["median_ms"]:
+                delta = f"{run['wall_ms'] - run['median_ms']:+.1f} ms vs median"
+            col1.metric("Wall time", f"{run['wall_ms']:.1f} ms", delta, delta_color="inverse")
+            col2.metric("Rows", run["rows"])
+            col3.metric("Buffer hits", run["shared_hit"])
+            col4.metric("Buffer reads", run["shared_read"])
+            if run["regression"]:
+                st.error(f"🚨 Regression: {run['wall_ms']:.1f} ms is more than {PROFILE_REGRESSION}× "
+                         f"the rolling median ({run['median_ms']:.1f} ms)")
+            if run["seq_scans"]:
+                st.caption(f"Seq scans: {', '.join(run['seq_scans'])}")
+            with st.expander("Plan (JSON)"):
+                st.json(run["plan"])
+
+    runs = with_trend(history(title))
+    if runs:
+        trend = pd.DataFrame(runs).set_index("run_at")
+        st.line_chart(trend[["wall_ms", "median_ms"]])
+        flagged = trend[trend["regression"]]
+        if not flagged.empty:
+            st.warning(f"⚠️ {len(flagged)} of the last {len(trend)} runs were regressions")
+        st.dataframe(trend.drop(columns=["median_ms"]).iloc[::-1], use_container_width=True)
+    else:
+        st.caption("No profile runs recorded for this question yet.")
 
 def display_query_stats(df):
     """Basic stats about query results"""
@@ -51,267 +83,6 @@ def get_difficulty_badge(title):
     else:
         return "🔴 Advanced"
 
-# ---------- All Queries ----------
-QUERIES = {
-   "Q1. Players from India": """
-    SELECT full_name, role, batting_style, bowling_style 
-    FROM players 
-    JOIN teams ON players.team_id = teams.team_id 
-    WHERE teams.country = 'India';
-    """,
-
-    "Q2. Matches played in last few days": """
-    SELECT match_desc, team1_name, team2_name, venue_name, venue_city, start_date 
-    FROM matches 
-    WHERE start_date >= CURRENT_DATE - INTERVAL '7 days' 
-    ORDER BY start_date DESC;
-    """,
-
-    "Q3. Top 10 run scorers in ODI": """
-    SELECT player_name, runs, batting_average, hundreds 
-    FROM player_master_stats 
-    WHERE format = 'ODI' 
-    ORDER BY runs DESC 
-    LIMIT 10;
-    """,
-
-    "Q4. Venues with capacity > 30000": """
-    SELECT ground, city, country, capacity 
-    FROM venues 
-    WHERE capacity > 30000 
-    ORDER BY capacity DESC;
-    """,
-
-    "Q5. Matches won by each team": """
-    SELECT winner_team_name, COUNT(*) AS total_wins 
-    FROM matches 
-    WHERE winner_team_name != 'No Result' 
-    GROUP BY winner_team_name 
-    ORDER BY total_wins DESC;
-    """,
-
-    "Q6. Count players by role": """
-    SELECT role, COUNT(*) AS total_players 
-    FROM players 
-    GROUP BY role;
-    """,
-
-    "Q7. Highest individual score by format": """
-    SELECT format, MAX(highest_score) AS highest_score 
-    FROM player_master_stats 
-    GROUP BY format;
-    """,
-
-    "Q8. Series started in 2024": """
-    SELECT series_name, host_country, series_type, start_date, total_matches 
-    FROM series 
-    WHERE EXTRACT(YEAR FROM start_date) = 2024;
-    """,
-
-    "Q9. All-rounders with 1000 runs and 50 wickets": """
-    SELECT player_name,format,runs,wickets
-    FROM player_master_stats
-    WHERE runs>1000 AND wickets>50
-    ORDER BY runs DESC,wickets DESC;
-    """,
-
-    "Q10. Last 20 completed matches": """
-    SELECT start_date,match_desc, team1_name, team2_name,status,winner_team_name,
-           win_by_runs, win_by_wickets, venue_name  
-    FROM matches 
-    WHERE LOWER(state) = 'complete' 
-    ORDER BY start_date DESC 
-    LIMIT 20;
-    """,
-
-    "Q11. Compare player runs across formats": """
-    SELECT player_name, 
-           SUM(CASE WHEN format='Test' THEN runs ELSE 0 END) AS test_runs, 
-           SUM(CASE WHEN format='ODI' THEN runs ELSE 0 END) AS odi_runs, 
-           SUM(CASE WHEN format='T20I' THEN runs ELSE 0 END) AS t20_runs, 
-           ROUND(AVG(batting_average),2) AS overall_avg
-    FROM player_master_stats
-    GROUP BY player_name
-    HAVING COUNT(DISTINCT format)>=2;
-    """,
-
-    "Q12. Team wins home vs away": """
-    SELECT t.team_name, 
-           SUM(CASE WHEN m.venue_country = t.country AND m.winner_team_id = t.team_id THEN 1 ELSE 0 END) AS home_wins, 
-           SUM(CASE WHEN m.venue_country <> t.country AND m.winner_team_id = t.team_id THEN 1 ELSE 0 END) AS away_wins 
-    FROM teams t 
-    JOIN matches m ON t.team_id IN (m.team1_id, m.team2_id) 
-    GROUP BY t.team_name;
-    """,
-
-    "Q13. Partnerships above 100 runs": """
-    SELECT batsman1, batsman2, runs, innings_number 
-    FROM partnerships 
-    WHERE runs >= 100;
-    """,
-
-    "Q14. Bowling performance at venues": """
-    SELECT b.player_name,
-           m.venue_name,
-           ROUND(AVG(b.economy_rate)::numeric,2) AS avg_economy,
-           SUM(b.wickets) AS total_wickets,
-           COUNT(DISTINCT b.match_id) AS matches_played
-    FROM bowling_scorecard b
-    JOIN matches m ON b.match_id = m.match_id
-    WHERE b.overs >= 4
-    GROUP BY b.player_name, m.venue_name
-    HAVING COUNT(DISTINCT b.match_id) >= 3
-    ORDER BY avg_economy ASC, total_wickets DESC;
-    """,
-
-    "Q15. Player performance in close matches": """
-    SELECT b.player_name,
-           t.country,
-           ROUND(AVG(b.runs)::numeric,0) AS avg_runs,
-           COUNT(DISTINCT b.match_id) AS close_matches
-    FROM batting_scorecard b
-    JOIN matches m ON b.match_id = m.match_id
-    JOIN players p ON b.player_name = p.full_name
-    JOIN teams t ON p.team_id = t.team_id
-    WHERE (m.win_by_runs < 50 OR m.win_by_wickets < 5)
-      AND m.winner_team_name != 'No Result'
-    GROUP BY b.player_name,t.country
-    ORDER BY avg_runs DESC;
-    """,
-
-    "Q16. Yearly batting since 2020": """
-    SELECT b.player_name,
-           b.team_name,
-           EXTRACT(YEAR FROM m.start_date) AS year,
-           ROUND(AVG(b.runs)::NUMERIC,0) AS avg_runs,
-           ROUND(AVG(b.strike_rate)::NUMERIC,2) AS avg_sr,
-           COUNT(b.match_id) AS matches_played
-    FROM batting_scorecard b
-    JOIN matches m ON b.match_id=m.match_id
-    WHERE EXTRACT(YEAR FROM m.start_date)>=2020
-    GROUP BY b.player_name,b.team_name,EXTRACT(YEAR FROM m.start_date)
-    HAVING COUNT(b.match_id)>=1  
-    ORDER BY year DESC,avg_runs DESC;
-    """,
-
-    "Q17. Toss advantage": """
-    SELECT toss_decision,
-           COUNT(*) AS matches,
-           ROUND(AVG(CASE WHEN winner_team_id=toss_winner_id THEN 1 ELSE 0 END)*100,2) AS win_percent
-    FROM matches
-    WHERE LOWER(state)='complete' AND toss_winner_id IS NOT NULL
-    GROUP BY toss_decision;
-    """,
-
-    "Q18. Most economical bowlers (ODI,T20)": """
-    SELECT b.player_name,
-           b.team_name,
-           ROUND(AVG(b.economy_rate)::NUMERIC,2) AS avg_economy,
-           SUM(b.wickets) AS total_wickets,
-           COUNT(DISTINCT b.match_id) AS matches_bowled
-    FROM bowling_scorecard b
-    JOIN matches m ON b.match_id=m.match_id
-    WHERE m.match_format IN('ODI','T20I')
-      AND b.overs>=2
-    GROUP BY b.player_name,b.team_name
-    HAVING COUNT(DISTINCT b.match_id)>=1   
-    ORDER BY avg_economy ASC,total_wickets DESC;
-    """,
-
-    "Q19. Consistent batsmen since 2022": """
-    SELECT b.player_name,
-           b.team_name,
-           ROUND(AVG(b.runs)::NUMERIC,0) AS avg_runs,
-           ROUND(STDDEV_POP(b.runs)::NUMERIC,2) AS run_stddev,
-           COUNT(*) AS innings
-    FROM batting_scorecard b
-    JOIN matches m ON b.match_id=m.match_id
-    WHERE m.start_date>='2022-01-01'
-      AND b.balls_faced>=10
-    GROUP BY b.player_name,b.team_name
-    HAVING COUNT(*)>=1
-    ORDER BY run_stddev ASC,avg_runs DESC;
-    """,
-
-    "Q20. Matches and averages per format": """
-    SELECT player_name,
-           SUM(CASE WHEN format='Test' THEN matches ELSE 0 END) AS test_matches,
-           SUM(CASE WHEN format='ODI' THEN matches ELSE 0 END) AS odi_matches,
-           SUM(CASE WHEN format='T20I' THEN matches ELSE 0 END) AS t20_matches,
-           ROUND(SUM(runs)::NUMERIC/NULLIF(SUM(innings),0),2) AS overall_bat_avg
-    FROM player_master_stats
-    GROUP BY player_name
-    HAVING SUM(matches)>=20;
-    """,
-
-    "Q21. Player ranking score": """
-    SELECT player_name,
-           format,
-           ROUND(
-               SUM(runs)*0.01 
-             + AVG(batting_average)*0.5 
-             + AVG(strike_rate)*0.3
-             + SUM(wickets)*2 
-             + (50-AVG(bowling_average))*0.5 
-             + (6-AVG(economy_rate))*2
-           , 2) AS total_points
-    FROM player_master_stats
-    GROUP BY player_name, format
-    ORDER BY format DESC;
-    """,
-
-    "Q22. Head-to-head team stats (last 3 yrs)": """
-    SELECT m.team1_name,
-           m.team2_name,
-           COUNT(*) AS total_matches,
-           SUM(CASE WHEN m.winner_team_name=m.team1_name THEN 1 ELSE 0 END) AS team1_wins,
-           SUM(CASE WHEN m.winner_team_name=m.team2_name THEN 1 ELSE 0 END) AS team2_wins
-    FROM matches m
-    WHERE m.start_date>=CURRENT_DATE-INTERVAL '3 years'
-      AND m.winner_team_name!='No Result'
-    GROUP BY m.team1_name,m.team2_name
-    HAVING COUNT(*)>=1
-    ORDER BY total_matches DESC;
-    """,
-
-    "Q23. Recent form (last 10 innings)": """
-    SELECT b.player_name,b.team_name,
-           ROUND(AVG(b.runs)::NUMERIC,0) AS avg_runs,
-           ROUND(AVG(b.strike_rate)::NUMERIC,2) AS avg_sr,
-           SUM(CASE WHEN b.runs>=50 THEN 1 ELSE 0 END) AS fifties
-    FROM batting_scorecard b
-    JOIN matches m ON b.match_id=m.match_id
-    GROUP BY b.player_name,b.team_name
-    ORDER BY avg_runs DESC
-    LIMIT 50;
-    """,
-
-    "Q24. Successful partnerships": """
-    SELECT batsman1,
-           batsman2,
-           ROUND(AVG(runs)::NUMERIC,0) AS avg_runs,
-           COUNT(*) AS total_partnerships,
-           MAX(runs) AS highest
-    FROM partnerships
-    GROUP BY batsman1,batsman2
-    HAVING COUNT(*)>=1
-    ORDER BY avg_runs DESC;
-    """,
-
-    "Q25. Time series performance by quarter": """
-    SELECT b.player_name,b.team_name,
-           DATE_TRUNC('quarter',m.start_date) AS quarter,
-           ROUND(AVG(b.runs)::NUMERIC,0) AS avg_runs,
-           ROUND(AVG(b.strike_rate)::NUMERIC,2) AS avg_sr,
-           COUNT(*) AS matches
-    FROM batting_scorecard b
-    JOIN matches m ON b.match_id=m.match_id
-    GROUP BY b.player_name,b.team_name,DATE_TRUNC('quarter',m.start_date)
-    HAVING COUNT(*)>=3
-    ORDER BY b.player_name,quarter;
-    """
-}
-
 # ---------- Theme CSS ----------
 st.markdown("""
     <style>
@@ -404,18 +175,73 @@ if selected_query_title:
     st.markdown("#### 📝 SQL Query")
     st.code(sql_query, language="sql")
 
-    if st.button("▶️ Execute Query"):
-        with st.spinner("Running query..."):
-            df = run_query(sql_query)
-
-            if not df.empty:
+    with st.expander("⚙️ Execution limits"):
+        row_limit = st.number_input("Row limit", min_value=100, value=QUERY_ROW_LIMIT, step=1000)
+        timeout_s = st.number_input("Statement timeout (s)", min_value=1, value=QUERY_TIMEOUT_MS // 1000)
+
+    job = st.session_state.get("query_job")
+    if job is not None and job.sql != sql_query.strip().rstrip(";"):
+        job.cancel()      # question changed; stop the old one
+        job = st.session_state.query_job = None
+
+    run_col, cancel_col = st.columns([1, 1])
+    with run_col:
+        if st.button("▶️ Execute Query"):
+            cached = query_cache.get(sql_query)
+            if cached is not None:
+                st.session_state.query_job = job = None
+                st.success(f"✅ Query executed successfully! Found {len(cached)} rows (cached).")
+                st.dataframe(cached, use_container_width=True)
+                display_query_stats(cached)
+            else:
+                if job is not None:
+                    job.cancel()
+                # versions the result will be cached against, taken before it runs
+                st.session_state.query_job_versions = query_cache.versions(sql_query)
+                job = st.session_state.query_job = QueryJob(
+                    sql_query, limit=int(row_limit), timeout_ms=int(timeout_s) * 1000,
+                ).start()
+    with cancel_col:
+        if job is not None and not job.done and st.button("⏹️ Cancel"):
+            job.cancel()
+            job.wait(5)
+
+    if job is not None:
+        # the query runs on its own thread; this loop only repaints what has arrived
+        progress, preview = st.empty(), st.empty()
+        while not job.done:
+            show_job_progress(job, progress)
+            if job.row_count:
+                preview.dataframe(job.frame(PREVIEW_ROWS), use_container_width=True)
+            time.sleep(0.3)
+        show_job_progress(job, progress)
+
+        df = job.frame()
+        if job.status in (DONE, TRUNCATED) and not df.empty:
+            if job.status == DONE:
+                # cached once: later reruns keep showing the job but don't store it again
+                versions_before = st.session_state.pop("query_job_versions", None)
+                if versions_before is not None:
+                    query_cache.put(sql_query, None, df, versions_before)
                 st.success(f"✅ Query executed successfully! Found {len(df)} rows.")
-                st.dataframe(df, use_container_width=True)
-
-                # Stats only (CSV removed)
-                display_query_stats(df)
             else:
-                st.warning("⚠️ Query executed but returned no results.")
+                st.warning(f"⚠️ Showing the first {len(df):,} rows (row limit reached).")
+            preview.dataframe(df, use_container_width=True)
+
+            # Stats only (CSV removed)
+            display_query_stats(df)
+        elif job.status == DONE:
+            preview.empty()
+            st.warning("⚠️ Query executed but returned no results.")
+        elif job.status == CANCELLED:
+            st.info(f"⏹️ Query cancelled after {job.elapsed:.1f}s ({job.row_count:,} rows fetched).")
+        elif job.status == TIMEOUT:
+            st.error(f"⏱️ Query hit the {int(timeout_s)}s statement timeout.")
+        else:
+            st.error(f"❌ Database Error: {job.error}")
+
+    if st.sidebar.toggle("🔬 Profiling mode", help="EXPLAIN (ANALYZE, BUFFERS) and timing history per question"):
+        show_profile_panel(selected_query_title, sql_query)
 
 # ✅ Sidebar About Section
 st.sidebar.title("ℹ️ About")
@@ -430,4 +256,8 @@ st.sidebar.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+with st.sidebar.expander("🏊 Connection Pool"):
+    st.json(pool_stats())
 
+with st.sidebar.expander("⚡ Query Cache"):
+    st.json(query_cache.stats())
@@ -1,19 +1,12 @@
 import streamlit as st
-import http.client
-import json
-import requests
-import pandas as pd
-import os
-from urllib.parse import quote
+from utils.api_utils import get_client
+from utils.player_search import search_players as search_index
+from utils.player_profile import get_profile_service
 
 # ---------------- Setup ----------------
 st.set_page_config(page_title="🏏 Cricbuzz LiveStats", layout="wide")
 
-# 🔑 Direct API Key (replace with your key)
-API_KEY = "d723372ef9mshf19bc74dba24b9fp17cbc7jsn6ff8a547531f"
-
-HEADERS = {"x-rapidapi-key": API_KEY, "x-rapidapi-host": "cricbuzz-cricket.p.rapidapi.com"}
-BASE_URL = "cricbuzz-cricket.p.rapidapi.com"
+api = get_client()
 
 # ---------------- Global CSS ----------------
 st.markdown("""
@@ -81,44 +74,16 @@ st.markdown("""
 
 # ---------------- Helper Functions ----------------
 def search_players(query):
-    query_encoded = quote(query)
-    conn = http.client.HTTPSConnection(BASE_URL)
-    conn.request("GET", f"/stats/v1/player/search?plrN={query_encoded}", headers=HEADERS)
-    res = conn.getresponse()
-    data = res.read()
-    conn.close()
-    try:
-        return json.loads(data.decode("utf-8"))
-    except:
-        return {}
-
-def get_player_details(player_id):
-    conn = http.client.HTTPSConnection(BASE_URL)
-    conn.request("GET", f"/stats/v1/player/{player_id}", headers=HEADERS)
-    res = conn.getresponse()
-    data = res.read()
-    conn.close()
+    # local index first; RapidAPI only when nothing matches
     try:
-        return json.loads(data.decode("utf-8"))
-    except:
+        return search_index(query, api)
+    except Exception:
         return {}
 
-def get_player_stats(player_id, stat_type="batting"):
-    url = f"https://cricbuzz-cricket.p.rapidapi.com/stats/v1/player/{player_id}/{stat_type}"
-    response = requests.get(url, headers=HEADERS)
-    if response.status_code == 200:
-        return response.json()
-    return {}
-
-def parse_stats_table(stats_json, drop_columns=None):
-    if not stats_json or "headers" not in stats_json or "values" not in stats_json:
-        return pd.DataFrame()
-    headers = stats_json["headers"]
-    rows = [row["values"] for row in stats_json["values"]]
-    df = pd.DataFrame(rows, columns=headers)
-    if drop_columns:
-        df = df.drop(columns=drop_columns, errors="ignore")
-    return df
+def get_profile(player_id):
+    # details, batting and bowling are fetched together in the background
+    # (or read from player_profile_cache); each view waits only for its own part
+    return get_profile_service().bundle(player_id)
 
 # ---------------- Sidebar ----------------
 st.sidebar.title("ℹ️ About")
@@ -150,11 +115,14 @@ if player_name:
         selected_name = st.selectbox("Select a player:", list(player_options.keys()))
         selected_player = player_options[selected_name]
 
-        tabs = st.tabs(["📌 Profile", "🏏 Batting Stats", "🎯 Bowling Stats"])
+        profile = get_profile(selected_player["id"])
+        # st.tabs runs every tab body on each rerun; a view switch renders only the open one
+        view = st.radio("View", ["📌 Profile", "🏏 Batting Stats", "🎯 Bowling Stats"],
+                        horizontal=True, label_visibility="collapsed")
 
         # ---------------- Profile Tab ----------------
-        with tabs[0]:
-            details = get_player_details(selected_player["id"])
+        if view == "📌 Profile":
+            details = profile.details()
             st.markdown(f"""
             <div class="profile-card">
                 <h2>{selected_player['name']} ({selected_player['teamName']})</h2>
@@ -216,20 +184,18 @@ if player_name:
                             st.markdown(styled_metric(label.strip(), v), unsafe_allow_html=True)
 
         # ---------------- Batting Stats Tab ----------------
-        with tabs[1]:
+        elif view == "🏏 Batting Stats":
             st.subheader("🏏 Batting Stats")
-            batting_stats = get_player_stats(selected_player["id"], "batting")
-            df_bat = parse_stats_table(batting_stats, drop_columns=["400"])
+            df_bat = profile.batting()
             if not df_bat.empty:
                 st.dataframe(df_bat, use_container_width=True)
             else:
                 st.warning("No batting stats available.")
 
         # ---------------- Bowling Stats Tab ----------------
-        with tabs[2]:
+        else:
             st.subheader("☄ Bowling Stats")
-            bowling_stats = get_player_stats(selected_player["id"], "bowling")
-            df_bowl = parse_stats_table(bowling_stats, drop_columns=["10w"])
+            df_bowl = profile.bowling()
             if not df_bowl.empty:
                 st.dataframe(df_bowl, use_container_width=True)
             else:
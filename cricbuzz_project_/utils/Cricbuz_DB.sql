@@ -1,3 +1,24 @@
+-- ===========================================================
+--   Scratchpad: table peeks and the original 25 questions
+-- ===========================================================
+-- Not the schema. Tables are defined in ingestion/schema.py and changed by
+-- utils/migrations/NNNN_*.sql (python -m utils.migrate); the questions the
+-- app runs live in utils/queries.py (Q16, Q19, Q23, Q25 there read the
+-- aggregate tables of 0003 / 0004 instead of the scorecards below).
+--
+-- Since 0005 matches is partitioned by season: its primary key is
+-- (match_id, start_date) and the scorecards' keys include match_start_date.
+-- match_id alone is NOT enforced unique any more. Write matches through
+-- ingestion.bulk.BulkWriter (the matches Upsert re-keys a moved match first),
+-- or by hand in the same order:
+--
+--   UPDATE matches SET start_date = <new> WHERE match_id = <id> AND start_date <> <new>;
+--   INSERT INTO matches (...) VALUES (...) ON CONFLICT (match_id, start_date) DO UPDATE ...;
+--
+-- A plain INSERT of a known match_id with another date adds a second row,
+-- and every JOIN matches m ON m.match_id = ... (0003, 0004, utils/queries.py)
+-- then counts that match's innings twice.
+
 SELECT * FROM  batting_scorecard;
 SELECT * FROM  bowling_scorecard;
 SELECT * FROM  fielding_scorecard;
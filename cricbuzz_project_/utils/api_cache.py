@@ -0,0 +1,182 @@
+"""
+Endpoint-aware response cache for Cricbuzz API calls.
+
+Two tiers: a bounded in-memory LRU and an on-disk SQLite file that survives
+restarts. Each response's lifetime depends on what it is:
+
+    /matches/v1/live                  LIVE_TTL seconds
+    /matches/v1/{recent,upcoming,..}  LIST_TTL
+    /mcenter/v1/{id}/scard            SCORECARD_TTL while in progress, forever once complete
+    /stats/v1/player/...              until the next daily refresh (DAILY_REFRESH_HOUR, UTC)
+    anything else                     DEFAULT_TTL
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+LIVE_TTL = float(os.getenv("API_CACHE_LIVE_TTL", "15"))
+LIST_TTL = float(os.getenv("API_CACHE_LIST_TTL", "60"))
+SCORECARD_TTL = float(os.getenv("API_CACHE_SCORECARD_TTL", "120"))
+DEFAULT_TTL = float(os.getenv("API_CACHE_DEFAULT_TTL", "300"))
+DAILY_REFRESH_HOUR = int(os.getenv("API_CACHE_DAILY_REFRESH_HOUR", "3"))
+API_CACHE_MAX_ITEMS = int(os.getenv("API_CACHE_MAX_ITEMS", "2000"))
+API_CACHE_PATH = os.getenv(
+    "API_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "cricbuzz_api.sqlite"),
+)
+
+FOREVER = None
+
+_SCARD_RX = re.compile(r"^/mcenter/v1/\d+/h?scard")
+# result phrases only: a bare "won" also matches live statuses ("India won the toss ...")
+_FINISHED_RX = re.compile(r"\b(won by|match drawn|match tied|no result|match abandoned)\b", re.I)
+
+# ---------------- TTL Policy ----------------
+def next_daily_refresh(now=None):
+    """Epoch seconds of the next daily stats refresh"""
+    now = now or datetime.now(timezone.utc)
+    boundary = now.replace(hour=DAILY_REFRESH_HOUR, minute=0, second=0, microsecond=0)
+    if boundary <= now:
+        boundary += timedelta(days=1)
+    return boundary.timestamp()
+
+def is_complete_scorecard(payload):
+    """True when a scorecard payload belongs to a finished match"""
+    if not isinstance(payload, dict):
+        return False
+    lowered = {k.lower(): v for k, v in payload.items() if isinstance(k, str)}
+    if "ismatchcomplete" in lowered:
+        return bool(lowered["ismatchcomplete"])     # the API's own flag wins over the status text
+    header = lowered.get("matchheader") or {}
+    if "complete" in header:
+        return bool(header["complete"])
+    if header.get("state"):
+        return str(header["state"]).lower() == "complete"
+    status = lowered.get("status") or header.get("status") or ""
+    return bool(_FINISHED_RX.search(str(status)))
+
+def expires_at(path, payload, now=None):
+    """Absolute expiry (epoch seconds) for a response, or None to keep forever"""
+    now = now or time.time()
+    if path.startswith("/matches/v1/live"):
+        return now + LIVE_TTL
+    if path.startswith("/matches/v1/"):
+        return now + LIST_TTL
+    if _SCARD_RX.match(path):
+        return FOREVER if is_complete_scorecard(payload) else now + SCORECARD_TTL
+    if path.startswith("/stats/v1/player/"):
+        return next_daily_refresh()
+    return now + DEFAULT_TTL
+
+
+def cache_path_for(base_url, path=API_CACHE_PATH):
+    """Disk cache file for an API base: `path` for RapidAPI, a sibling file per other base"""
+    host = urlparse(base_url).netloc.lower()
+    if host.endswith("rapidapi.com"):
+        return path
+    # mock servers and proxies never share (or poison) the RapidAPI cache
+    root, ext = os.path.splitext(path)
+    return f"{root}-{re.sub(r'[^a-z0-9]+', '_', host).strip('_')}{ext}"
+
+
+# ---------------- Cache ----------------
+class ResponseCache:
+    def __init__(self, path=API_CACHE_PATH, max_items=API_CACHE_MAX_ITEMS):
+        self.max_items = max_items
+        self._memory = OrderedDict()   # key -> (expires_at, payload)
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key         TEXT PRIMARY KEY,
+                    expires_at  REAL,
+                    payload     TEXT NOT NULL
+                )
+            """)
+            self._db.commit()
+
+    @staticmethod
+    def key(path, params=None):
+        if not params:
+            return path
+        return f"{path}?{json.dumps(params, sort_keys=True, default=str)}"
+
+    @staticmethod
+    def _fresh(exp, now):
+        return exp is None or exp > now
+
+    def _remember(self, key, exp, payload):
+        self._memory[key] = (exp, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key, allow_stale=False):
+        """Cached payload or None"""
+        now = time.time()
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit and (allow_stale or self._fresh(hit[0], now)):
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return hit[1]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, payload FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and (allow_stale or self._fresh(row[0], now)):
+                    payload = json.loads(row[1])
+                    self._remember(key, row[0], payload)
+                    self._stats["disk_hits"] += 1
+                    return payload
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key, path, payload):
+        exp = expires_at(path, payload)
+        with self._lock:
+            self._remember(key, exp, payload)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, expires_at, payload) VALUES (?,?,?)",
+                    (key, exp, json.dumps(payload)),
+                )
+                self._db.commit()
+            self._stats["stores"] += 1
+
+    def invalidate(self, prefix=""):
+        """Drop every cached response whose key starts with `prefix`"""
+        with self._lock:
+            for k in [k for k in self._memory if k.startswith(prefix)]:
+                del self._memory[k]
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+                self._db.commit()
+
+    def purge_expired(self):
+        """Remove expired rows from the disk tier"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cur = self._db.execute(
+                "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            )
+            self._db.commit()
+            return cur.rowcount
+
+    def stats(self):
+        with self._lock:
+            snap = dict(self._stats)
+            snap["memory_items"] = len(self._memory)
+            return snap
@@ -0,0 +1,160 @@
+"""
+Shared Cricbuzz (RapidAPI) HTTP client.
+
+One keep-alive `requests.Session` per process with a pooled HTTPAdapter, so
+every page reuses TCP/TLS connections instead of handshaking per request.
+`get_many` fans requests out over a bounded thread pool. Every request takes
+a token from the shared rate limiter (utils/rate_limiter.py) and 429s are
+retried after the server's Retry-After. Responses go through the
+endpoint-aware ResponseCache (utils/api_cache.py) unless API_CACHE=0.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote
+
+from utils.api_cache import ResponseCache, cache_path_for
+from utils.rate_limiter import API_MAX_RETRIES, get_limiter, retry_after
+
+# 🔑 API Key
+CRICBUZZ_API_KEY = os.getenv("CRICBUZZ_API_KEY", "d723372ef9mshf19bc74dba24b9fp17cbc7jsn6ff8a547531f")
+CRICBUZZ_HOST = "cricbuzz-cricket.p.rapidapi.com"
+CRICBUZZ_BASE_URL = os.getenv("CRICBUZZ_API_BASE", f"https://{CRICBUZZ_HOST}")
+
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "20"))       # keep-alive connections per host
+API_MAX_WORKERS = int(os.getenv("API_MAX_WORKERS", "8"))    # parallel requests in get_many
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+API_CACHE = os.getenv("API_CACHE", "1") != "0"
+
+
+# ---------------- API Client ----------------
+class CricbuzzClient:
+    def __init__(self, base_url=CRICBUZZ_BASE_URL, api_key=CRICBUZZ_API_KEY,
+                 pool_size=API_POOL_SIZE, max_workers=API_MAX_WORKERS, timeout=API_TIMEOUT,
+                 cache=None, limiter=None):
+        self.base_url = base_url.rstrip("/")
+        self.limiter = limiter or get_limiter()
+        self.cache = cache if cache is not None else (ResponseCache(cache_path_for(self.base_url)) if API_CACHE else None)
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.headers = {
+            "x-rapidapi-key": api_key,
+            "x-rapidapi-host": CRICBUZZ_HOST,
+        }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def fetch(self, path, params=None):
+        """GET `path` from the API (no cache); {} for 204 / empty body, raises on HTTP errors"""
+        for attempt in range(API_MAX_RETRIES + 1):
+            self.limiter.acquire()
+            response = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+            if response.status_code != 429 or attempt == API_MAX_RETRIES:
+                break
+            self.limiter.penalize(retry_after(response, attempt))
+        response.raise_for_status()
+        if response.status_code == 204 or not response.content:
+            return {}
+        return response.json()
+
+    def get(self, path, params=None, use_cache=True):
+        """Cached GET; on upstream failure a stale cached copy is served if one exists"""
+        if not (use_cache and self.cache):
+            return self.fetch(path, params)
+        key = self.cache.key(path, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        try:
+            payload = self.fetch(path, params)
+        except Exception:
+            stale = self.cache.get(key, allow_stale=True)
+            if stale is not None:
+                return stale
+            raise
+        if payload:
+            self.cache.set(key, path, payload)
+        return payload
+
+    def get_many(self, paths, max_workers=None, use_cache=True):
+        """Fetch many paths concurrently; returns {path: json} ({} for failures)"""
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            return {}
+
+        def fetch(path):
+            try:
+                return self.get(path, use_cache=use_cache)
+            except Exception as e:
+                print(f"⚠ Error fetching {path}: {e}")
+                return {}
+
+        workers = max(1, min(max_workers or self.max_workers, len(paths)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(paths, pool.map(fetch, paths)))
+
+    # ---- matches ----
+    def get_live_matches(self):
+        return self.get("/matches/v1/live")
+
+    def get_scorecard(self, match_id):
+        return self.get(f"/mcenter/v1/{match_id}/scard")
+
+    def get_scorecards(self, match_ids, max_workers=None, use_cache=True):
+        """{match_id: scorecard json} fetched concurrently"""
+        paths = {mid: f"/mcenter/v1/{mid}/scard" for mid in match_ids}
+        results = self.get_many(paths.values(), max_workers, use_cache)
+        return {mid: results.get(path, {}) for mid, path in paths.items()}
+
+    def get_series(self, series_id):
+        return self.get(f"/series/v1/{series_id}")
+
+    def get_series_scorecards(self, series_id, max_workers=None):
+        """Scorecards for every match in a series, fetched concurrently"""
+        return self.get_scorecards(series_match_ids(self.get_series(series_id)), max_workers)
+
+    # ---- players ----
+    def search_players(self, name):
+        return self.get(f"/stats/v1/player/search?plrN={quote(name)}")
+
+    def get_player(self, player_id):
+        return self.get(f"/stats/v1/player/{player_id}")
+
+    def get_player_stats(self, player_id, stat_type="batting"):
+        return self.get(f"/stats/v1/player/{player_id}/{stat_type}")
+
+
+# ---------------- Helpers ----------------
+def series_match_ids(detail):
+    """Match ids from a /series/v1/{id} payload (handles the known response shapes)"""
+    ids = []
+    for block in (detail or {}).get("matchDetails", []) or []:
+        mdm = block.get("matchDetailsMap") or {}
+        for m in mdm.get("match", []) or []:
+            ids.append((m.get("matchInfo") or m).get("matchId"))
+    for grp in (detail or {}).get("matchDetailsMap", []) or []:
+        for m in grp.get("match", []) or []:
+            ids.append((m.get("matchInfo") or m).get("matchId"))
+    for m in (detail or {}).get("matches", []) or []:
+        ids.append((m.get("matchInfo") or m).get("matchId"))
+    return [i for i in dict.fromkeys(ids) if i]
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Return the process-wide Cricbuzz client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = CricbuzzClient()
+    return _client
@@ -0,0 +1,254 @@
+"""
+Scale-factor benchmark for the SQL Analytics questions.
+
+For each scale factor the fact tables (matches and the per-match scorecard
+tables) are cloned N times into a `bench_x<N>` schema with match ids shifted
+per copy, so joins keep their shape while row counts grow N-fold. Indexes are
+copied with the tables (LIKE ... INCLUDING ALL; season-partitioned tables are
+cloned as plain tables); trigger-maintained aggregate tables are recomputed
+from the scaled copies. Every question then runs
+with `search_path = bench_x<N>, public` (dimension tables such as players
+and teams come from public): warm-up runs first, then timed repetitions.
+
+Results are written as JSON for comparing runs across schema or index
+changes:
+
+    python -m utils.benchmark --scales 1 10 100 --reps 5 --out bench.json
+    python -m utils.benchmark --scales 10 --questions Q16 Q25 --reuse
+
+Point it at a local database (DB_* env vars); the bench schemas are dropped
+afterwards unless --keep is given.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from utils.db_connection import get_conn
+from utils.explain_check import question_id
+from utils.queries import QUERIES
+
+BENCH_TIMEOUT_MS = int(os.getenv("BENCH_TIMEOUT_MS", "300000"))
+
+# table → columns shifted per copy (everything else is copied as-is)
+SCALED_TABLES = {
+    "matches": ["match_id"],
+    "match_innings": ["match_id"],
+    "batting_scorecard": ["match_id"],
+    "bowling_scorecard": ["match_id"],
+    "fielding_scorecard": ["match_id"],
+    "partnerships": ["match_id", "id"],
+}
+
+# aggregate tables the triggers keep in step with the scorecards → rebuilt per bench schema
+DERIVED_TABLES = {
+    "player_batting_yearly": "player_period_rebuild",
+    "player_batting_quarterly": "player_period_rebuild",
+    "player_recent_innings": "recent_form_rebuild",
+}
+
+SCAN_NODES = {"Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan", "Tid Scan"}
+
+
+# ---------------- Helpers ----------------
+def schema_for(scale):
+    return f"bench_x{int(scale)}"
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def rows_scanned(plan):
+    """Rows actually read by scan nodes in an EXPLAIN ANALYZE plan, filtered-out rows included"""
+    total = 0
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if node.get("Node Type") in SCAN_NODES:
+            loops = node.get("Actual Loops", 1)
+            total += (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)
+                      + node.get("Rows Removed by Index Recheck", 0)) * loops
+        stack.extend(node.get("Plans", []))
+    return int(total)
+
+def table_columns(cur, table):
+    cur.execute("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = 'public' AND table_name = %s
+        ORDER BY ordinal_position
+    """, (table,))
+    return [r[0] for r in cur.fetchall()]
+
+
+# ---------------- Load ----------------
+def build_scale(cur, scale):
+    """(Re)create bench_x<scale> with every scaled table cloned `scale` times; returns {table: rows}"""
+    schema = schema_for(scale)
+    cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+    cur.execute(f"CREATE SCHEMA {schema}")
+    counts = {}
+    for table, shifted in SCALED_TABLES.items():
+        cur.execute("SELECT to_regclass(%s)", (f"public.{table}",))
+        if cur.fetchone()[0] is None:
+            continue
+        columns = table_columns(cur, table)
+        offsets = {}
+        for col in shifted:
+            cur.execute(f"SELECT COALESCE(MAX({col}), 0) + 1 FROM public.{table}")
+            offsets[col] = cur.fetchone()[0]
+        # every copy k shifts ids by k × (max + 1), so copies never collide
+        select = ", ".join(f"{c} + k * {offsets[c]}" if c in offsets else c for c in columns)
+        cur.execute(f"CREATE TABLE {schema}.{table} (LIKE public.{table} INCLUDING ALL)")
+        cur.execute(f"""
+            INSERT INTO {schema}.{table} ({", ".join(columns)})
+            SELECT {select}
+            FROM public.{table}, generate_series(0, %s) AS k
+        """, (int(scale) - 1,))
+        counts[table] = cur.rowcount
+        cur.execute(f"ANALYZE {schema}.{table}")
+
+    # derived tables: same shape, recomputed from the scaled scorecards (search_path picks the bench copies)
+    rebuilds = []
+    for table, rebuild in DERIVED_TABLES.items():
+        cur.execute("SELECT to_regclass(%s)", (f"public.{table}",))
+        if cur.fetchone()[0] is None:
+            continue
+        cur.execute(f"CREATE TABLE {schema}.{table} (LIKE public.{table} INCLUDING ALL)")
+        if rebuild not in rebuilds:
+            rebuilds.append(rebuild)
+    cur.execute(f"SET LOCAL search_path = {schema}, public")
+    for rebuild in rebuilds:
+        cur.execute(f"SELECT {rebuild}()")
+    cur.execute("SET LOCAL search_path TO DEFAULT")
+    for table in DERIVED_TABLES:
+        cur.execute("SELECT to_regclass(%s)", (f"{schema}.{table}",))
+        if cur.fetchone()[0] is not None:
+            cur.execute(f"SELECT COUNT(*) FROM {schema}.{table}")
+            counts[table] = cur.fetchone()[0]
+            cur.execute(f"ANALYZE {schema}.{table}")
+    return counts
+
+def existing_counts(cur, scale):
+    schema = schema_for(scale)
+    counts = {}
+    for table in (*SCALED_TABLES, *DERIVED_TABLES):
+        cur.execute("SELECT to_regclass(%s)", (f"{schema}.{table}",))
+        if cur.fetchone()[0] is not None:
+            cur.execute(f"SELECT COUNT(*) FROM {schema}.{table}")
+            counts[table] = cur.fetchone()[0]
+    return counts
+
+
+# ---------------- Run ----------------
+def time_query(cur, sql):
+    start = time.perf_counter()
+    cur.execute(sql)
+    rows = len(cur.fetchall())
+    return (time.perf_counter() - start) * 1000, rows
+
+def bench_question(cur, title, sql, warmup, reps):
+    for _ in range(warmup):
+        time_query(cur, sql)
+    timings, rows = [], 0
+    for _ in range(reps):
+        ms, rows = time_query(cur, sql)
+        timings.append(ms)
+    cur.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + sql.strip().rstrip(";"))
+    raw = cur.fetchone()[0]
+    plan = (raw if isinstance(raw, list) else json.loads(raw))[0]["Plan"]
+    return {
+        "question": question_id(title),
+        "title": title,
+        "reps": reps,
+        "rows_returned": rows,
+        "rows_scanned": rows_scanned(plan),
+        "p50_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "max_ms": round(max(timings), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+    }
+
+def run(scales=(1, 10, 100), warmup=1, reps=5, questions=None, reuse=False, keep=False,
+        timeout_ms=BENCH_TIMEOUT_MS):
+    """Benchmark QUERIES at each scale factor; returns the report dict"""
+    wanted = {q.upper() for q in questions or []}
+    selected = {t: sql for t, sql in QUERIES.items() if not wanted or question_id(t) in wanted}
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "warmup": warmup,
+        "reps": reps,
+        "scales": [],
+    }
+    for scale in scales:
+        schema = schema_for(scale)
+        with get_conn() as conn, conn.cursor() as cur:
+            cur.execute("SHOW server_version")
+            report["postgres"] = cur.fetchone()[0]
+            start = time.perf_counter()
+            counts = existing_counts(cur, scale) if reuse else {}
+            if not counts:
+                print(f"📦 Building {schema} ...")
+                counts = build_scale(cur, scale)
+            load_s = time.perf_counter() - start
+        print(f"✅ {schema}: {counts} ({load_s:.1f}s)")
+
+        results = []
+        try:
+            for title, sql in selected.items():
+                with get_conn() as conn, conn.cursor() as cur:
+                    cur.execute(f"SET LOCAL search_path = {schema}, public")
+                    cur.execute("SET LOCAL statement_timeout = %s", (int(timeout_ms),))
+                    try:
+                        res = bench_question(cur, title, sql, warmup, reps)
+                    except Exception as e:
+                        conn.rollback()
+                        res = {"question": question_id(title), "title": title, "error": str(e).strip()}
+                results.append(res)
+                if "error" in res:
+                    print(f"   ❌ {res['question']:<4} {res['error']}")
+                else:
+                    print(f"   {res['question']:<4} p50 {res['p50_ms']:>9.1f} ms  p95 {res['p95_ms']:>9.1f} ms  "
+                          f"max {res['max_ms']:>9.1f} ms  scanned {res['rows_scanned']:,}")
+        finally:
+            if not keep:
+                with get_conn() as conn, conn.cursor() as cur:
+                    cur.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        report["scales"].append({"scale": scale, "schema": schema, "table_rows": counts,
+                                 "load_seconds": round(load_s, 2), "results": results})
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analytics QUERIES at several data scale factors")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--reps", type=int, default=5)
+    parser.add_argument("--questions", nargs="*", help="question ids (e.g. Q16 Q25); default: all")
+    parser.add_argument("--out", default="benchmark.json", help="JSON report path ('-' for stdout)")
+    parser.add_argument("--timeout-ms", type=int, default=BENCH_TIMEOUT_MS)
+    parser.add_argument("--reuse", action="store_true", help="reuse bench schemas left by a --keep run")
+    parser.add_argument("--keep", action="store_true", help="keep the bench schemas afterwards")
+    args = parser.parse_args(argv)
+
+    report = run(args.scales, args.warmup, args.reps, args.questions, args.reuse, args.keep or args.reuse,
+                 args.timeout_ms)
+    if args.out == "-":
+        json.dump(report, sys.stdout, indent=2, default=str)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"📝 Report written to {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
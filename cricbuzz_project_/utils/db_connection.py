@@ -2,6 +2,11 @@ import psycopg2
 import pandas as pd
 from psycopg2.extras import RealDictCursor
 from dotenv import load_dotenv
+from contextlib import contextmanager
+from collections import deque
+import threading
+import math
+import time
 import os
 
 # ---------------- Load ENV ----------------
@@ -20,25 +25,201 @@ DB_PASSWORD = os.getenv("DB_PASSWORD", "susmitha2102")
 DEFAULT_RUNS = int(os.getenv("DEFAULT_RUNS", "0"))
 DEFAULT_AVG = float(os.getenv("DEFAULT_AVG", "0.0"))
 
+# 🏊 Pool sizing from .env
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))          # seconds to wait for a free connection
+DB_POOL_HEALTHCHECK = float(os.getenv("DB_POOL_HEALTHCHECK", "30"))  # ping idle connections older than this
+
+DB_CONFIG = {
+    "host": DB_HOST,
+    "port": DB_PORT,
+    "dbname": DB_NAME,
+    "user": DB_USER,
+    "password": DB_PASSWORD,
+}
+
+
+class PoolTimeout(Exception):
+    """Raised when no pooled connection frees up within the checkout timeout"""
+
+
+# ---------------- Connection Pool ----------------
+class ConnectionPool:
+    """Thread-safe psycopg2 pool with health checks, checkout timeout and metrics"""
+
+    def __init__(self, minconn=DB_POOL_MIN, maxconn=DB_POOL_MAX,
+                 timeout=DB_POOL_TIMEOUT, healthcheck=DB_POOL_HEALTHCHECK, **dsn):
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.healthcheck = healthcheck
+        self.dsn = dsn or DB_CONFIG
+        self._idle = deque()          # (conn, last_used_monotonic)
+        self._in_use = set()
+        self._pending = 0             # checkouts connecting / pinging outside the lock
+        self._cond = threading.Condition()     # re-entrant: stats helpers lock too
+        self._stats = {
+            "created": 0, "closed": 0, "checkouts": 0, "timeouts": 0,
+            "healthcheck_failures": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0,
+        }
+        for _ in range(minconn):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    def _connect(self, timeout=None):
+        dsn = dict(self.dsn)
+        if timeout is not None and "connect_timeout" not in dsn:
+            dsn["connect_timeout"] = max(2, math.ceil(timeout))     # libpq's minimum is 2s
+        conn = psycopg2.connect(**dsn)
+        with self._cond:
+            self._stats["created"] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._stats["closed"] += 1
+
+    def _is_healthy(self, conn, last_used):
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.healthcheck:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def getconn(self, timeout=None):
+        """Check out a healthy connection, waiting up to `timeout` seconds"""
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        while True:
+            # claim an idle connection or a free slot under the lock ...
+            conn = last_used = None
+            with self._cond:
+                while not self._idle and len(self._in_use) + self._pending >= self.maxconn:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(f"No free DB connection after {timeout:.1f}s (max={self.maxconn})")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                self._pending += 1
+
+            # ... then connect / ping without it, so a slow server doesn't stall other checkouts
+            try:
+                if conn is None:
+                    conn = self._connect(deadline - time.monotonic())
+                    healthy = True
+                else:
+                    healthy = self._is_healthy(conn, last_used)
+            except Exception:
+                with self._cond:
+                    self._pending -= 1
+                    self._cond.notify()
+                raise
+
+            with self._cond:
+                self._pending -= 1
+                if healthy:
+                    return self._checked_out(conn, start)
+                self._stats["healthcheck_failures"] += 1
+                self._cond.notify()
+            self._discard(conn)
+
+    def _checked_out(self, conn, start):
+        waited = time.monotonic() - start
+        self._in_use.add(conn)
+        self._stats["checkouts"] += 1
+        self._stats["wait_seconds"] += waited
+        self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+        return conn
+
+    def putconn(self, conn, close=False):
+        """Return a connection to the pool (broken or surplus ones are closed)"""
+        if not (close or conn.closed):
+            try:
+                if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                close = True        # can't be reset → don't hand it out again
+        with self._cond:
+            self._in_use.discard(conn)
+            if close or conn.closed or len(self._idle) >= self.maxconn:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+            for conn in list(self._in_use):
+                self._discard(conn)
+            self._in_use.clear()
+
+    def stats(self):
+        """Snapshot of pool metrics"""
+        with self._cond:
+            snap = dict(self._stats)
+            snap.update({
+                "in_use": len(self._in_use), "idle": len(self._idle),
+                "min": self.minconn, "max": self.maxconn,
+                "avg_wait_ms": round(1000 * snap["wait_seconds"] / snap["checkouts"], 2) if snap["checkouts"] else 0.0,
+            })
+            return snap
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Return the process-wide connection pool (created lazily)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+def pool_stats():
+    """Return metrics for the shared pool"""
+    return get_pool().stats()
+
+@contextmanager
 def get_conn():
-    """Return PostgreSQL connection"""
-    return psycopg2.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD
-    )
+    """Borrow a pooled PostgreSQL connection; commit on success, rollback on error"""
+    pool = get_pool()
+    conn = pool.getconn()
+    broken = False
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            broken = True
+        raise
+    finally:
+        pool.putconn(conn, close=broken or conn.closed)
 
 def execute_query(query, params=None):
     """Run SELECT queries and return DataFrame"""
     try:
-        conn = get_conn()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute(query, params or ())
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
+        with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, params or ())
+            rows = cur.fetchall()
         return pd.DataFrame(rows)
     except Exception as e:
         print(f"❌ Error executing query: {e}")
@@ -47,14 +228,9 @@ def execute_query(query, params=None):
 def execute_update(query, params=None):
     """Run INSERT, UPDATE, DELETE queries"""
     try:
-        conn = get_conn()
-        cur = conn.cursor()
-        cur.execute(query, params or ())
-        conn.commit()
-        cur.close()
-        conn.close()
+        with get_conn() as conn, conn.cursor() as cur:
+            cur.execute(query, params or ())
         return True
     except Exception as e:
         print(f"❌ Error executing update: {e}")
         return False
-
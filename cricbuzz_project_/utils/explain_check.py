@@ -0,0 +1,126 @@
+"""
+EXPLAIN regression check for the SQL Analytics questions.
+
+Runs `EXPLAIN (FORMAT JSON)` on every entry in QUERIES and fails when a plan
+sequentially scans a large table. A filtered scan is fine while the planner
+expects it to keep at least SELECTIVE_FRACTION of the rows (an index wouldn't
+help); an unfiltered one, reading the table whole, only for the questions in
+FULL_SCAN_OK. Partitions (matches_2024, ...) count by their own size and are
+allowed via their parent.
+
+    python -m utils.explain_check                 # exit code 1 on regressions
+    python -m utils.explain_check --min-rows 5000
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from utils.db_connection import get_conn
+from utils.queries import QUERIES
+
+LARGE_TABLE_ROWS = int(os.getenv("EXPLAIN_LARGE_TABLE_ROWS", "10000"))
+SELECTIVE_FRACTION = float(os.getenv("EXPLAIN_SELECTIVE_FRACTION", "0.2"))
+
+# question prefix -> tables it reads whole, with no filter on them
+FULL_SCAN_OK = {
+    "Q6": {"players"},                                   # counts every player by role
+    "Q7": {"player_master_stats"},                       # max over every player, per format
+    "Q11": {"player_master_stats"},                      # HAVING picks players after summing all their formats
+    "Q12": {"matches"},                                  # every match counts for both teams
+    "Q14": {"matches"},                                  # venue of every match with a 4-over spell
+    "Q15": {"batting_scorecard", "players"},             # every innings of the (mostly close) matches, by batter
+    "Q20": {"player_master_stats"},                      # HAVING on matches summed over all formats
+    "Q21": {"player_master_stats"},                      # a score for every player and format
+    "Q23": {"player_recent_innings"},                    # already cut to the last N innings per player
+    "Q24": {"partnerships"},                             # every batting pair, HAVING keeps all of them
+    "Q25": {"player_batting_quarterly"},                 # every player and quarter
+}
+
+# ---------------- Helpers ----------------
+def large_tables(cur, min_rows=LARGE_TABLE_ROWS):
+    """{name: estimated rows} of ordinary/partitioned tables with at least `min_rows` rows"""
+    cur.execute("""
+        SELECT c.relname, c.reltuples
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r','p')
+          AND n.nspname = current_schema()
+          AND c.reltuples >= %s
+    """, (min_rows,))
+    return dict(cur.fetchall())
+
+def partition_parents(cur):
+    """{partition: root partitioned table} for the current schema"""
+    cur.execute("""
+        SELECT c.relname, pg_partition_root(c.oid)::regclass::text
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relispartition
+          AND n.nspname = current_schema()
+    """)
+    return dict(cur.fetchall())
+
+def seq_scan_nodes(plan):
+    """Seq Scan nodes in a JSON plan tree"""
+    found = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        if node.get("Node Type") == "Seq Scan":
+            found.append(node)
+        stack.extend(node.get("Plans", []))
+    return found
+
+def seq_scanned(plan):
+    """Relation names under Seq Scan nodes in a JSON plan tree"""
+    return [node.get("Relation Name") for node in seq_scan_nodes(plan)]
+
+def explain(cur, sql):
+    cur.execute("EXPLAIN (FORMAT JSON) " + sql.strip().rstrip(";"))
+    raw = cur.fetchone()[0]
+    doc = raw if isinstance(raw, list) else json.loads(raw)
+    return doc[0]["Plan"]
+
+def question_id(title):
+    return title.split(".")[0]
+
+# ---------------- Main ----------------
+def check(min_rows=LARGE_TABLE_ROWS, queries=QUERIES):
+    """Return [(title, table)] for every unexpected seq scan on a large table"""
+    failures = []
+    with get_conn() as conn, conn.cursor() as cur:
+        big = large_tables(cur, min_rows)
+        parents = partition_parents(cur)
+        for title, sql in queries.items():
+            allowed = FULL_SCAN_OK.get(question_id(title), set())
+            for node in seq_scan_nodes(explain(cur, sql)):
+                rel = node.get("Relation Name")
+                if rel not in big:
+                    continue
+                if "Filter" in node:
+                    # keeps most rows: reading them all is the cheap plan
+                    if node["Plan Rows"] >= SELECTIVE_FRACTION * big[rel]:
+                        continue
+                elif parents.get(rel, rel) in allowed:
+                    continue
+                failures.append((title, rel))
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail on seq scans of large tables in QUERIES plans")
+    parser.add_argument("--min-rows", type=int, default=LARGE_TABLE_ROWS,
+                        help="tables with at least this many estimated rows count as large")
+    args = parser.parse_args(argv)
+
+    failures = check(args.min_rows)
+    if failures:
+        for title, rel in failures:
+            print(f"❌ {title}: Seq Scan on {rel}")
+        return 1
+    print(f"✅ {len(QUERIES)} plans checked, no seq scans on tables ≥ {args.min_rows} rows")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
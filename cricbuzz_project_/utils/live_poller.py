@@ -0,0 +1,167 @@
+"""
+Process-wide live-score poller.
+
+One daemon thread refreshes /matches/v1/live and the scorecards of in-progress
+matches every LIVE_POLL_INTERVAL seconds and swaps in a new LiveSnapshot.
+Streamlit sessions read the latest snapshot from memory, so page renders never
+wait on the upstream API and upstream load is the same for 1 or 1000 viewers.
+Listeners registered with `subscribe` are called after every refresh.
+"""
+
+import os
+import threading
+import time
+
+from utils.api_utils import get_client
+
+LIVE_POLL_INTERVAL = float(os.getenv("LIVE_POLL_INTERVAL", "15"))     # seconds between refreshes
+LIVE_READY_TIMEOUT = float(os.getenv("LIVE_READY_TIMEOUT", "10"))     # first render waits at most this long
+
+FINISHED_STATES = {"complete", "preview", "upcoming", "abandon", "cancelled"}
+
+
+# ---------------- Parsing ----------------
+def iter_live_matches(data):
+    """Yield (match_type, series_info, match) from a /matches/v1/live payload"""
+    for type_match in (data or {}).get("typeMatches", []):
+        match_type = type_match.get("matchType", "Unknown")
+        for series in type_match.get("seriesMatches", []):
+            series_info = series.get("seriesAdWrapper", {})
+            for match in series_info.get("matches", []) or []:
+                yield match_type, series_info, match
+
+def innings_score(team_score):
+    inn = (team_score or {}).get("inngs1", {})
+    return {"runs": inn.get("runs", 0), "wickets": inn.get("wickets", 0), "overs": inn.get("overs", 0)}
+
+def match_summary(match_type, series_info, match):
+    """Flat, JSON-serialisable view of one live match (what the Live Matches card shows)"""
+    info = match.get("matchInfo", {})
+    score = match.get("matchScore", {})
+    venue = info.get("venueInfo", {})
+    summary = {
+        "match_id": info.get("matchId", ""),
+        "series": series_info.get("seriesName", "Unknown Series"),
+        "match_type": match_type,
+        "team1": info.get("team1", {}).get("teamName", "Team 1"),
+        "team2": info.get("team2", {}).get("teamName", "Team 2"),
+        "desc": info.get("matchDesc", ""),
+        "format": info.get("matchFormat", ""),
+        "status": info.get("status", ""),
+        "state": info.get("stateTitle", ""),
+        "venue": f"{venue.get('ground', '')}, {venue.get('city', '')}",
+        "start_date": info.get("startDate"),
+        "end_date": info.get("endDate"),
+        "scores": [],
+    }
+    for side in ("team1", "team2"):
+        if f"{side}Score" in score:
+            summary["scores"].append({
+                "team": info.get(side, {}).get("teamSName", "Team 1" if side == "team1" else "Team 2"),
+                **innings_score(score.get(f"{side}Score")),
+            })
+    return summary
+
+def is_in_progress(match_info):
+    return (match_info.get("state") or "").lower() not in FINISHED_STATES
+
+
+# ---------------- Snapshot ----------------
+class LiveSnapshot:
+    """One poll result; replaced wholesale, never mutated after publishing"""
+
+    def __init__(self, version=0, live=None, scorecards=None, updated_at=None, error=None):
+        self.version = version
+        self.live = live or {}
+        self.scorecards = scorecards or {}      # {match_id: scorecard json} for in-progress matches
+        self.updated_at = updated_at            # time.time() of the last successful poll
+        self.error = error
+
+    @property
+    def age(self):
+        return None if self.updated_at is None else time.time() - self.updated_at
+
+
+# ---------------- Poller ----------------
+class LivePoller:
+    def __init__(self, client=None, interval=LIVE_POLL_INTERVAL):
+        self.client = client or get_client()
+        self.interval = interval
+        self._snapshot = LiveSnapshot()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._listeners = []
+
+    def start(self):
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return self
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="live-poller", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def snapshot(self, wait=False):
+        """Latest snapshot; with `wait`, block (up to LIVE_READY_TIMEOUT) for the first poll"""
+        if wait:
+            self._ready.wait(LIVE_READY_TIMEOUT)
+        return self._snapshot
+
+    def subscribe(self, fn):
+        """Call fn(previous, current) after every refresh"""
+        with self._lock:
+            self._listeners.append(fn)
+
+    def unsubscribe(self, fn):
+        with self._lock:
+            if fn in self._listeners:
+                self._listeners.remove(fn)
+
+    def poll_once(self):
+        prev = self._snapshot
+        try:
+            # the poller is the freshness source, so it skips the TTL cache
+            live = self.client.get("/matches/v1/live", use_cache=False)
+            ids = [m.get("matchInfo", {}).get("matchId") for _, _, m in iter_live_matches(live)
+                   if is_in_progress(m.get("matchInfo", {}))]
+            fetched = self.client.get_scorecards([i for i in ids if i], use_cache=False)
+            # a failed scorecard fetch comes back as {}; keep the previous copy instead
+            scorecards = {mid: sc or prev.scorecards.get(mid, {}) for mid, sc in fetched.items()}
+            snap = LiveSnapshot(prev.version + 1, live, scorecards, time.time())
+        except Exception as e:
+            # keep serving the last good data, flagged with the error
+            snap = LiveSnapshot(prev.version + 1, prev.live, prev.scorecards, prev.updated_at, str(e))
+
+        self._snapshot = snap
+        self._ready.set()
+        with self._lock:
+            listeners = list(self._listeners)
+        for fn in listeners:
+            try:
+                fn(prev, snap)
+            except Exception as e:
+                print(f"⚠ Live listener failed: {e}")
+        return snap
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll_once()
+            self._stop.wait(self.interval)
+
+
+_poller = None
+_poller_lock = threading.Lock()
+
+def get_poller():
+    """Return the process-wide poller, started on first use"""
+    global _poller
+    if _poller is None:
+        with _poller_lock:
+            if _poller is None:
+                _poller = LivePoller().start()
+    return _poller
@@ -0,0 +1,172 @@
+"""
+Live scorecard model with per-innings deltas.
+
+Keeps the last parsed snapshot of every (match, innings) and, for each new
+scorecard payload, works out what actually changed: batter and bowler rows,
+innings totals and new wickets. Deltas are plain dicts (JSON-serialisable) so
+the Streamlit page and any downstream consumer (e.g. the live stream) only
+handle what moved instead of re-parsing whole innings every poll.
+"""
+
+import itertools
+import threading
+
+from utils.live_poller import get_poller
+
+NOT_OUT = {"", "not out", "batting"}
+
+
+# ---------------- Parsing ----------------
+def batter_row(b):
+    return {
+        "Batsman": b.get("name", ""),
+        "Runs": b.get("runs", 0),
+        "Balls": b.get("balls", 0),
+        "4s": b.get("fours", 0),
+        "6s": b.get("sixes", 0),
+        "SR": b.get("strkrate", 0),
+        "Out": b.get("outdec", ""),
+    }
+
+def bowler_row(bl):
+    return {
+        "Bowler": bl.get("name", ""),
+        "Overs": bl.get("overs", 0),
+        "Runs": bl.get("runs", 0),
+        "Wickets": bl.get("wickets", 0),
+        "Economy": bl.get("economy", 0),
+    }
+
+def _player_key(p):
+    return p.get("id") or p.get("name", "")
+
+def parse_innings(innings):
+    """Scorecard innings → {team, totals, batters{key: row}, bowlers{key: row}} (dicts keep batting order)"""
+    return {
+        "team": innings.get("batteamname", "Unknown"),
+        "totals": {
+            "runs": innings.get("runs", innings.get("score", 0)),
+            "wickets": innings.get("wickets", 0),
+            "overs": innings.get("overs", 0),
+        },
+        "batters": {_player_key(b): batter_row(b) for b in innings.get("batsman", []) or []},
+        "bowlers": {_player_key(bl): bowler_row(bl) for bl in innings.get("bowler", []) or []},
+    }
+
+def is_out(row):
+    return str(row.get("Out") or "").strip().lower() not in NOT_OUT
+
+
+# ---------------- Delta ----------------
+def diff_innings(old, new):
+    """Structured delta between two parsed innings (old may be None); None when nothing changed"""
+    old = old or {"totals": None, "batters": {}, "bowlers": {}}
+    batters = {k: row for k, row in new["batters"].items() if old["batters"].get(k) != row}
+    bowlers = {k: row for k, row in new["bowlers"].items() if old["bowlers"].get(k) != row}
+    wickets = [
+        {"batsman": row["Batsman"], "how": row["Out"], "runs": row["Runs"], "balls": row["Balls"]}
+        for k, row in batters.items()
+        if is_out(row) and not is_out(old["batters"].get(k) or {})
+    ]
+    totals = new["totals"] if new["totals"] != old["totals"] else None
+    if not (batters or bowlers or totals or wickets):
+        return None
+    return {
+        "team": new["team"],
+        "new_innings": old["totals"] is None,
+        "totals": totals,
+        "batters": list(batters.values()),
+        "bowlers": list(bowlers.values()),
+        "wickets": wickets,
+    }
+
+
+# ---------------- Model ----------------
+class LiveScorecards:
+    """Latest parsed innings per match plus the deltas produced by the last update"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._innings = {}      # {match_id: {innings_no: parsed innings}}
+        self._versions = {}     # {(match_id, innings_no): moves only when that innings changed}
+        self._seq = itertools.count(1)   # model-wide: a match that leaves and comes back never reuses a version
+        self._last_delta = {}   # {(match_id, innings_no): most recent delta}
+        self._listeners = []
+
+    def update(self, match_id, scorecard):
+        """Fold in a scorecard payload; returns [{match_id, innings, version, ...delta}] for changed innings"""
+        deltas = []
+        with self._lock:
+            current = self._innings.setdefault(match_id, {})
+            for no, innings in enumerate((scorecard or {}).get("scorecard", []) or [], start=1):
+                parsed = parse_innings(innings)
+                delta = diff_innings(current.get(no), parsed)
+                current[no] = parsed
+                if delta is None:
+                    continue
+                key = (match_id, no)
+                self._versions[key] = next(self._seq)
+                delta = {"match_id": match_id, "innings": no, "version": self._versions[key], **delta}
+                self._last_delta[key] = delta
+                deltas.append(delta)
+            listeners = list(self._listeners)
+        for fn in listeners:
+            for delta in deltas:
+                try:
+                    fn(delta)
+                except Exception as e:
+                    print(f"⚠ Scorecard listener failed: {e}")
+        return deltas
+
+    def innings(self, match_id):
+        """{innings_no: parsed innings} for a match (rows are shared — treat as read-only)"""
+        with self._lock:
+            return dict(self._innings.get(match_id, {}))
+
+    def version(self, match_id, innings_no):
+        with self._lock:
+            return self._versions.get((match_id, innings_no), 0)
+
+    def last_delta(self, match_id, innings_no):
+        with self._lock:
+            return self._last_delta.get((match_id, innings_no))
+
+    def forget(self, keep_ids):
+        """Drop matches that are no longer live (versions stay unique: see _seq)"""
+        with self._lock:
+            for mid in set(self._innings) - set(keep_ids):
+                self._innings.pop(mid, None)
+                for key in [k for k in self._versions if k[0] == mid]:
+                    self._versions.pop(key)
+                    self._last_delta.pop(key, None)
+
+    def subscribe(self, fn):
+        """Call fn(delta) for every innings delta"""
+        with self._lock:
+            self._listeners.append(fn)
+
+    def attach(self, poller):
+        """Feed this model from a LivePoller's refreshes"""
+        def on_refresh(prev, snap):
+            for mid, scorecard in snap.scorecards.items():
+                if scorecard is not prev.scorecards.get(mid):
+                    self.update(mid, scorecard)
+            self.forget(snap.scorecards)
+        poller.subscribe(on_refresh)
+        # catch up with whatever the poller already has
+        for mid, scorecard in poller.snapshot().scorecards.items():
+            self.update(mid, scorecard)
+        return self
+
+
+_scorecards = None
+_scorecards_lock = threading.Lock()
+
+def get_live_scorecards():
+    """Return the process-wide model, attached to the live poller"""
+    global _scorecards
+    if _scorecards is None:
+        with _scorecards_lock:
+            if _scorecards is None:
+                _scorecards = LiveScorecards().attach(get_poller())
+    return _scorecards
@@ -0,0 +1,363 @@
+"""
+Server-sent events stream of live scores.
+
+Other screens subscribe to one local endpoint instead of polling Cricbuzz (or
+rerunning the Streamlit page). The stream is fed by the process-wide live
+poller and the live scorecard model, so upstream load does not grow with the
+number of clients:
+
+    python -m utils.live_stream --port 8766
+    curl -N http://127.0.0.1:8766/stream            # every live match
+    curl -N http://127.0.0.1:8766/stream?match_id=1  # one match
+
+Events (JSON `data`):
+    snapshot   all live match summaries (sent on connect / when resume is impossible)
+    score      one match summary whose score or status changed
+    ended      a match left the live feed
+    scorecard  an innings delta from utils.live_scorecard
+
+Every event carries an `id`. Reconnecting clients send `Last-Event-ID` (browsers
+do this automatically) and get the events they missed from a ring buffer. Each
+client has a bounded queue; a client that falls that far behind is disconnected
+and resumes from its last id on reconnect, so one slow reader never holds up the
+poller or the other subscribers. All connections share one asyncio event loop,
+so thousands of subscribers need no thread each (mind `ulimit -n`).
+"""
+
+from collections import deque
+from http import HTTPStatus
+from urllib.parse import urlparse, parse_qs
+import argparse
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+import time
+
+from utils.live_poller import get_poller, iter_live_matches, match_summary
+from utils.live_scorecard import get_live_scorecards
+
+STREAM_BUFFER = int(os.getenv("STREAM_BUFFER", "2000"))          # events kept for Last-Event-ID resume
+STREAM_QUEUE = int(os.getenv("STREAM_QUEUE", "500"))             # per-client backlog before disconnect
+STREAM_HEARTBEAT = float(os.getenv("STREAM_HEARTBEAT", "15"))    # seconds between keep-alive comments
+STREAM_WRITE_TIMEOUT = float(os.getenv("STREAM_WRITE_TIMEOUT", "10"))  # seconds a client may leave a write unread
+
+
+# ---------------- Events ----------------
+class Event:
+    """One published event, encoded once and shared by every subscriber"""
+
+    def __init__(self, event_id, kind, data):
+        self.id = event_id
+        self.kind = kind
+        self.match_id = str(data.get("match_id", "")) if isinstance(data, dict) else ""
+        payload = json.dumps(data, separators=(",", ":"), default=str)
+        self.wire = f"id: {event_id}\nevent: {kind}\ndata: {payload}\n\n".encode("utf-8")
+
+def live_summaries(live):
+    """{match_id: summary} from a /matches/v1/live payload"""
+    return {
+        str(m["match_id"]): m
+        for m in (match_summary(t, s, match) for t, s, match in iter_live_matches(live))
+        if m["match_id"]
+    }
+
+
+# ---------------- Hub ----------------
+class LiveHub:
+    """Numbered live events with a resume buffer, handed to listeners as published"""
+
+    def __init__(self, buffer=STREAM_BUFFER):
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=buffer)
+        self._listeners = []
+        self._next_id = 1
+        self.summaries = {}
+        self.counts = {"published": 0, "resumed": 0}
+
+    def publish(self, kind, data):
+        # listeners run under the lock, so each sees events in id order
+        with self._lock:
+            event = Event(self._next_id, kind, data)
+            self._next_id += 1
+            self._events.append(event)
+            self.counts["published"] += 1
+            for fn in self._listeners:
+                fn(event)
+        return event
+
+    def subscribe(self, fn):
+        """Call fn(event) for every published event; fn must not block"""
+        with self._lock:
+            self._listeners.append(fn)
+
+    def unsubscribe(self, fn):
+        with self._lock:
+            if fn in self._listeners:
+                self._listeners.remove(fn)
+
+    def backlog(self, match_id=None, last_event_id=None):
+        """Events a client connecting with `last_event_id` gets first"""
+        match_id = str(match_id) if match_id else None
+        with self._lock:
+            oldest = self._events[0].id if self._events else self._next_id
+            if last_event_id is not None and oldest - 1 <= last_event_id < self._next_id:
+                self.counts["resumed"] += 1
+                return [e for e in self._events
+                        if e.id > last_event_id and (match_id is None or e.match_id in ("", match_id))]
+            # fresh client, or it missed more than the buffer holds: start from a snapshot
+            matches = [m for mid, m in self.summaries.items() if match_id in (None, mid)]
+            return [Event(self._next_id - 1, "snapshot", {"matches": matches})]
+
+    def stats(self):
+        with self._lock:
+            return {**self.counts, "last_event_id": self._next_id - 1, "buffered": len(self._events)}
+
+    # ---------------- Feeds ----------------
+    def on_refresh(self, prev, snap):
+        """LivePoller listener: publish match summaries that changed"""
+        if snap.error:
+            return
+        current = live_summaries(snap.live)
+        for mid, summary in current.items():
+            if self.summaries.get(mid) != summary:
+                self.publish("score", summary)
+        for mid in set(self.summaries) - set(current):
+            self.publish("ended", {"match_id": mid})
+        self.summaries = current
+
+    def on_delta(self, delta):
+        """LiveScorecards listener: publish innings deltas as they are produced"""
+        self.publish("scorecard", delta)
+
+    def attach(self, poller, scorecards):
+        self.summaries = live_summaries(poller.snapshot().live)
+        poller.subscribe(self.on_refresh)
+        scorecards.subscribe(self.on_delta)
+        return self
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+def get_hub():
+    """Return the process-wide hub, fed by the live poller and scorecard model"""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = LiveHub().attach(get_poller(), get_live_scorecards())
+    return _hub
+
+
+# ---------------- Server ----------------
+class Subscriber:
+    """One open /stream connection; only touched from the server's event loop"""
+
+    def __init__(self, writer, match_id=None, last_id=0, maxsize=STREAM_QUEUE):
+        self.writer = writer
+        self.match_id = str(match_id) if match_id else None
+        self.last_id = last_id
+        self.maxsize = maxsize
+        self.pending = deque()
+        self.ready = asyncio.Event()
+        self.dropped = False
+
+    def wants(self, event):
+        return self.match_id is None or not event.match_id or event.match_id == self.match_id
+
+    def offer(self, event):
+        # ids at or below last_id already went out with the backlog
+        if self.dropped or event.id <= self.last_id or not self.wants(event):
+            return
+        if len(self.pending) >= self.maxsize:
+            # too far behind: cut it loose, it resumes with Last-Event-ID
+            self.dropped = True
+        else:
+            self.pending.append(event)
+            self.last_id = event.id
+        self.ready.set()
+
+class StreamServer:
+    """
+    SSE server on one asyncio event loop (in its own thread). The hub hands
+    each event over with a single call_soon_threadsafe, and the loop copies
+    it into every subscriber's queue, so an open connection costs a socket
+    and a small queue rather than an OS thread.
+    """
+
+    def __init__(self, hub):
+        self.hub = hub
+        self.subscribers = set()
+        self.counts = {"dropped": 0}
+        self.loop = None
+        self._server = None
+
+    def _on_event(self, event):
+        self.loop.call_soon_threadsafe(self._fanout, event)
+
+    def _fanout(self, event):
+        for sub in list(self.subscribers):
+            sub.offer(event)
+            if sub.dropped:
+                self._cut(sub)
+
+    def _cut(self, sub):
+        """Disconnect a subscriber now; abort() also ends a drain() stuck on it"""
+        sub.dropped = True
+        sub.pending.clear()
+        if sub in self.subscribers:
+            self.subscribers.discard(sub)
+            self.counts["dropped"] += 1
+        # close() would first wait to flush the backlog to a client that isn't reading
+        sub.writer.transport.abort()
+
+    def stats(self):
+        return {**self.hub.stats(), **self.counts, "subscribers": len(self.subscribers)}
+
+    async def start(self, host, port):
+        self.loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle, host, port, backlog=1024)
+        self.hub.subscribe(self._on_event)
+
+    async def close(self):
+        self.hub.unsubscribe(self._on_event)
+        self._server.close()
+        for sub in list(self.subscribers):
+            sub.dropped = True
+            sub.ready.set()
+        await self._server.wait_closed()
+
+    # ---------------- Requests ----------------
+    async def _handle(self, reader, writer):
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), STREAM_HEARTBEAT)
+            lines = head.decode("latin-1").split("\r\n")
+            method, target = lines[0].split(" ")[:2]
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    name, value = line.split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+            if method != "GET":
+                return await self._send_json(writer, 501, {"message": f"Unsupported method {method}"})
+            await self._route(writer, target, headers)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send_json(self, writer, status, payload):
+        body = json.dumps(payload, default=str).encode("utf-8")
+        writer.write(self._head(status, {"Content-Type": "application/json",
+                                         "Content-Length": str(len(body))}) + body)
+        await writer.drain()
+
+    @staticmethod
+    def _head(status, headers):
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+                 "Access-Control-Allow-Origin: *", "Connection: close"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _route(self, writer, target, headers):
+        url = urlparse(target)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/snapshot":
+            mid = query.get("match_id")
+            return await self._send_json(writer, 200, [m for k, m in self.hub.summaries.items() if mid in (None, k)])
+        if url.path == "/__stats":
+            return await self._send_json(writer, 200, self.stats())
+        if url.path != "/stream":
+            return await self._send_json(writer, 404, {"message": f"No route for {url.path}"})
+
+        last_id = headers.get("last-event-id") or query.get("last_event_id")
+        try:
+            last_id = int(last_id) if last_id else None
+        except ValueError:
+            last_id = None
+        await self._stream(writer, query.get("match_id"), last_id)
+
+    async def _stream(self, writer, match_id, last_id):
+        # backlog and registration happen in one loop step: events published
+        # meanwhile are still queued for _fanout, and offer() skips those
+        # the backlog already holds
+        backlog = self.hub.backlog(match_id, last_id)
+        sub = Subscriber(writer, match_id, backlog[-1].id if backlog else last_id or 0)
+        self.subscribers.add(sub)
+        try:
+            writer.write(self._head(200, {"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}))
+            writer.write(b"retry: 3000\n\n")
+            for event in backlog:
+                writer.write(event.wire)
+            while await self._drain(writer, sub):
+                try:
+                    await asyncio.wait_for(sub.ready.wait(), STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    writer.write(b": keep-alive\n\n")
+                else:
+                    sub.ready.clear()
+                    while sub.pending:
+                        writer.write(sub.pending.popleft().wire)
+        finally:
+            self.subscribers.discard(sub)
+            writer.close()
+            try:
+                await asyncio.wait_for(writer.wait_closed(), STREAM_WRITE_TIMEOUT)
+            except (asyncio.TimeoutError, ConnectionError):
+                pass
+
+    async def _drain(self, writer, sub):
+        """Flush to the client; False once it has to go (dropped, or not reading)"""
+        if sub.dropped:
+            return False
+        try:
+            await asyncio.wait_for(writer.drain(), STREAM_WRITE_TIMEOUT)
+        except asyncio.TimeoutError:
+            # stopped reading: the socket buffer is full and the queue can't grow
+            self._cut(sub)
+            return False
+        except ConnectionError:
+            return False
+        return not sub.dropped
+
+    # ---------------- Lifecycle ----------------
+    def shutdown(self):
+        """Stop accepting, close every stream and end the loop thread"""
+        asyncio.run_coroutine_threadsafe(self.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+def serve(host="127.0.0.1", port=8766, hub=None):
+    """Start the stream server on an event loop in a daemon thread; returns the server"""
+    server = StreamServer(hub or get_hub())
+    loop = asyncio.new_event_loop()
+    started = concurrent.futures.Future()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(server.start(host, port))
+        except Exception as e:
+            started.set_exception(e)
+            return
+        started.set_result(server)
+        loop.run_forever()
+
+    threading.Thread(target=run, name="live-stream", daemon=True).start()
+    return started.result()       # re-raises a bind error in the caller
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Server-sent events stream of live scores")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port)
+    print(f"📡 Live stream on http://{args.host}:{args.port}/stream  (stats at /__stats)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,94 @@
+"""
+Versioned schema migrations for the Cricbuz database.
+
+Migrations live in utils/migrations/NNNN_name.sql and are applied in order,
+each in its own transaction, and recorded in `schema_migrations`.
+
+    python -m utils.migrate            # apply everything pending
+    python -m utils.migrate --list     # show applied / pending
+"""
+
+import argparse
+import hashlib
+import os
+import re
+
+from utils.db_connection import get_conn
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+_FILE_RX = re.compile(r"^(\d{4})_([\w-]+)\.sql$")
+
+# ---------------- Helpers ----------------
+def available_migrations():
+    """[(version, name, path)] sorted by version"""
+    found = []
+    for fname in os.listdir(MIGRATIONS_DIR):
+        m = _FILE_RX.match(fname)
+        if m:
+            found.append((int(m.group(1)), m.group(2), os.path.join(MIGRATIONS_DIR, fname)))
+    return sorted(found)
+
+def _checksum(sql):
+    return hashlib.sha256(sql.encode("utf-8")).hexdigest()
+
+def ensure_migrations_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version     INT PRIMARY KEY,
+            name        TEXT NOT NULL,
+            checksum    TEXT NOT NULL,
+            applied_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+def applied_migrations(cur):
+    """{version: checksum} of migrations already applied"""
+    ensure_migrations_table(cur)
+    cur.execute("SELECT version, checksum FROM schema_migrations")
+    return dict(cur.fetchall())
+
+# ---------------- Main ----------------
+def migrate(target=None):
+    """Apply pending migrations up to `target` (inclusive); returns versions applied"""
+    with get_conn() as conn, conn.cursor() as cur:
+        done = applied_migrations(cur)
+
+    applied = []
+    for version, name, path in available_migrations():
+        if target is not None and version > target:
+            break
+        with open(path, encoding="utf-8") as f:
+            sql = f.read()
+        if version in done:
+            if done[version] != _checksum(sql):
+                print(f"⚠️ Migration {version:04d}_{name} changed after it was applied")
+            continue
+        with get_conn() as conn, conn.cursor() as cur:
+            cur.execute(sql)
+            cur.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s,%s,%s)",
+                (version, name, _checksum(sql)),
+            )
+        print(f"✅ Applied migration {version:04d}_{name}")
+        applied.append(version)
+
+    if not applied:
+        print("✅ Schema is up to date")
+    return applied
+
+def list_migrations():
+    with get_conn() as conn, conn.cursor() as cur:
+        done = applied_migrations(cur)
+    for version, name, _ in available_migrations():
+        mark = "✅ applied" if version in done else "⏳ pending"
+        print(f"{version:04d}_{name:<40} {mark}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply Cricbuz schema migrations")
+    parser.add_argument("--list", action="store_true", help="show applied and pending migrations")
+    parser.add_argument("--target", type=int, help="migrate up to this version only")
+    args = parser.parse_args()
+    if args.list:
+        list_migrations()
+    else:
+        migrate(args.target)
@@ -0,0 +1,81 @@
+-- ===========================================================
+--   0001 · Index pack for the SQL Analytics questions
+-- ===========================================================
+-- Primary keys already cover lookups by match_id on batting_scorecard,
+-- bowling_scorecard and fielding_scorecard (match_id is the leading PK
+-- column), so no extra match_id indexes are added there.
+
+-- ---------------- matches ----------------
+-- Q2, Q19, Q22: date ranges; Q10: newest first
+CREATE INDEX IF NOT EXISTS idx_matches_start_date
+    ON matches (start_date DESC);
+
+-- Q10, Q17: LOWER(state) = 'complete'
+CREATE INDEX IF NOT EXISTS idx_matches_state_lower
+    ON matches (LOWER(state));
+
+-- Q10: last 20 completed matches straight off the index
+CREATE INDEX IF NOT EXISTS idx_matches_complete_recent
+    ON matches (start_date DESC)
+    WHERE LOWER(state) = 'complete';
+
+-- Q16: EXTRACT(YEAR FROM start_date) >= 2020
+CREATE INDEX IF NOT EXISTS idx_matches_start_year
+    ON matches ((EXTRACT(YEAR FROM start_date)));
+
+-- Q18: match_format IN ('ODI','T20I')
+CREATE INDEX IF NOT EXISTS idx_matches_format
+    ON matches (match_format);
+
+-- series -> matches joins
+CREATE INDEX IF NOT EXISTS idx_matches_series
+    ON matches (series_id);
+
+-- ---------------- scorecards ----------------
+-- Q15: batting_scorecard.player_name = players.full_name
+CREATE INDEX IF NOT EXISTS idx_batting_player_name
+    ON batting_scorecard (player_name);
+
+-- ---------------- players / teams ----------------
+-- Q1, Q15: players JOIN teams
+CREATE INDEX IF NOT EXISTS idx_players_team
+    ON players (team_id);
+
+CREATE INDEX IF NOT EXISTS idx_players_full_name
+    ON players (full_name);
+
+-- Q1: teams.country = 'India'
+CREATE INDEX IF NOT EXISTS idx_teams_country
+    ON teams (country);
+
+-- ---------------- player_master_stats ----------------
+-- Q3: WHERE format = 'ODI' ORDER BY runs DESC LIMIT 10
+CREATE INDEX IF NOT EXISTS idx_pms_format_runs
+    ON player_master_stats (format, runs DESC);
+
+-- ---------------- series / venues / partnerships ----------------
+-- Q8: EXTRACT(YEAR FROM start_date) = 2024
+CREATE INDEX IF NOT EXISTS idx_series_start_year
+    ON series ((EXTRACT(YEAR FROM start_date)));
+
+-- Q4: capacity > 30000
+CREATE INDEX IF NOT EXISTS idx_venues_capacity
+    ON venues (capacity DESC);
+
+-- Q13: runs >= 100
+CREATE INDEX IF NOT EXISTS idx_partnerships_runs
+    ON partnerships (runs)
+    WHERE runs >= 100;
+
+CREATE INDEX IF NOT EXISTS idx_partnerships_match
+    ON partnerships (match_id);
+
+ANALYZE matches;
+ANALYZE batting_scorecard;
+ANALYZE bowling_scorecard;
+ANALYZE players;
+ANALYZE teams;
+ANALYZE player_master_stats;
+ANALYZE series;
+ANALYZE venues;
+ANALYZE partnerships;
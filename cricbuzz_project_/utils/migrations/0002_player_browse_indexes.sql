@@ -0,0 +1,43 @@
+-- ===========================================================
+--   0002 · Indexes for the paginated View Players page
+-- ===========================================================
+-- The CRUD page filters players by name / team / country / role and walks
+-- them page by page with keyset pagination (WHERE (sort_col, player_id) > cursor
+-- ORDER BY sort_col, player_id LIMIT n). Each sortable players column gets a
+-- (column, player_id) index so a page is an index range scan at any depth.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- ---------------- players: name search ----------------
+-- "contains" search: full_name / nick_name ILIKE '%...%'
+CREATE INDEX IF NOT EXISTS idx_players_full_name_trgm
+    ON players USING gin (full_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_players_nick_name_trgm
+    ON players USING gin (nick_name gin_trgm_ops);
+
+-- ---------------- players: keyset sort keys ----------------
+-- expressions match SORT_COLUMNS in pages/crud_operations.py exactly
+CREATE INDEX IF NOT EXISTS idx_players_full_name_id
+    ON players ((COALESCE(full_name, '')), player_id);
+
+CREATE INDEX IF NOT EXISTS idx_players_role_id
+    ON players ((COALESCE(role, '—')), player_id);
+
+-- finite sentinel: the page sends it back as its keyset cursor
+CREATE INDEX IF NOT EXISTS idx_players_created_id
+    ON players ((COALESCE(created_at, '1900-01-01'::timestamp)), player_id);
+
+-- team filter / join
+CREATE INDEX IF NOT EXISTS idx_players_team_id
+    ON players (team_id, player_id);
+
+-- ---------------- teams ----------------
+CREATE INDEX IF NOT EXISTS idx_teams_name_trgm
+    ON teams USING gin (team_name gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_teams_country_trgm
+    ON teams USING gin (country gin_trgm_ops);
+
+ANALYZE players;
+ANALYZE teams;
@@ -0,0 +1,290 @@
+-- ===========================================================
+--   0003 · Per-player yearly / quarterly batting aggregates
+-- ===========================================================
+-- Q16, Q19 and Q25 used to re-aggregate batting_scorecard JOIN matches on
+-- every run. These tables hold the running sums per player, team and period
+-- instead, kept current by triggers on batting_scorecard and matches, so the
+-- questions read one small row per player and period.
+--
+-- Averages are rebuilt from sums and counts: AVG(x) = sum / count of non-null
+-- x, STDDEV_POP(x) = sqrt(sum_sq / n - (sum / n)^2). Counters prefixed q_
+-- only count innings with balls_faced >= 10 (Q19's "qualified" innings).
+--
+-- Statement-level triggers read the changed rows from transition tables, so
+-- a COPY or a batched INSERT ... ON CONFLICT (of scorecards or of matches)
+-- costs one aggregate upsert per statement, not one per row. The deltas are plain INSERT ... SELECT
+-- ... GROUP BY statements over those rows, so batch size is not bounded by memory.
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name  TEXT PRIMARY KEY,
+    version     BIGINT NOT NULL DEFAULT 0,
+    updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ---------------- aggregate tables ----------------
+CREATE TABLE IF NOT EXISTS player_batting_yearly (
+    player_id       BIGINT NOT NULL,
+    team_name       TEXT NOT NULL DEFAULT '',       -- '' when the scorecard had none
+    year            INT NOT NULL,
+    player_name     TEXT,
+    innings         INT NOT NULL DEFAULT 0,         -- scorecard rows
+    runs_innings    INT NOT NULL DEFAULT 0,         -- rows with runs recorded
+    runs            BIGINT NOT NULL DEFAULT 0,
+    runs_sq         BIGINT NOT NULL DEFAULT 0,      -- sum of runs², for the standard deviation
+    balls           BIGINT NOT NULL DEFAULT 0,
+    sr_innings      INT NOT NULL DEFAULT 0,         -- rows with a strike rate
+    sum_sr          DOUBLE PRECISION NOT NULL DEFAULT 0,
+    fifties         INT NOT NULL DEFAULT 0,         -- 50–99
+    hundreds        INT NOT NULL DEFAULT 0,
+    q_innings       INT NOT NULL DEFAULT 0,         -- balls_faced >= 10
+    q_runs_innings  INT NOT NULL DEFAULT 0,
+    q_runs          BIGINT NOT NULL DEFAULT 0,
+    q_runs_sq       BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_id, team_name, year)
+);
+
+CREATE TABLE IF NOT EXISTS player_batting_quarterly (
+    player_id       BIGINT NOT NULL,
+    team_name       TEXT NOT NULL DEFAULT '',
+    quarter         TIMESTAMP NOT NULL,             -- DATE_TRUNC('quarter', matches.start_date)
+    player_name     TEXT,
+    innings         INT NOT NULL DEFAULT 0,
+    runs_innings    INT NOT NULL DEFAULT 0,
+    runs            BIGINT NOT NULL DEFAULT 0,
+    runs_sq         BIGINT NOT NULL DEFAULT 0,
+    balls           BIGINT NOT NULL DEFAULT 0,
+    sr_innings      INT NOT NULL DEFAULT 0,
+    sum_sr          DOUBLE PRECISION NOT NULL DEFAULT 0,
+    fifties         INT NOT NULL DEFAULT 0,
+    hundreds        INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_id, team_name, quarter)
+);
+
+-- Q16 / Q19: year ranges
+CREATE INDEX IF NOT EXISTS idx_player_batting_yearly_year
+    ON player_batting_yearly (year);
+
+-- periods whose last innings was removed (the apply step leaves them at 0)
+CREATE INDEX IF NOT EXISTS idx_player_batting_yearly_empty
+    ON player_batting_yearly (player_id) WHERE innings <= 0;
+CREATE INDEX IF NOT EXISTS idx_player_batting_quarterly_empty
+    ON player_batting_quarterly (player_id) WHERE innings <= 0;
+
+-- ---------------- delta application ----------------
+-- SQL that adds (sign = 1) or removes (sign = -1) the scorecard rows returned by
+-- `source` (player_id, player_name, team_name, start_date, runs, balls_faced,
+-- strike_rate). One INSERT ... SELECT ... GROUP BY ... ON CONFLICT per table,
+-- streamed straight from the source query, so a batch never has to fit in memory.
+-- Callers EXECUTE it themselves: transition tables (new_rows / old_rows) are
+-- only visible inside the trigger function.
+CREATE OR REPLACE FUNCTION player_period_delta(sign INT, source TEXT)
+RETURNS TEXT LANGUAGE sql STABLE AS $f$
+SELECT format($q$
+    WITH b (player_id, player_name, team_name, start_date, runs, balls_faced, strike_rate) AS (%2$s),
+    yearly AS (
+        INSERT INTO player_batting_yearly AS t (
+            player_id, team_name, year, player_name,
+            innings, runs_innings, runs, runs_sq, balls, sr_innings, sum_sr, fifties, hundreds,
+            q_innings, q_runs_innings, q_runs, q_runs_sq)
+        SELECT b.player_id, COALESCE(b.team_name, ''), EXTRACT(YEAR FROM b.start_date)::INT, MAX(b.player_name),
+               %1$s * COUNT(*), %1$s * COUNT(b.runs),
+               %1$s * COALESCE(SUM(b.runs), 0), %1$s * COALESCE(SUM(b.runs::BIGINT * b.runs), 0),
+               %1$s * COALESCE(SUM(b.balls_faced), 0),
+               %1$s * COUNT(b.strike_rate), %1$s * COALESCE(SUM(b.strike_rate), 0),
+               %1$s * COUNT(*) FILTER (WHERE b.runs >= 50 AND b.runs < 100),
+               %1$s * COUNT(*) FILTER (WHERE b.runs >= 100),
+               %1$s * COUNT(*) FILTER (WHERE b.balls_faced >= 10),
+               %1$s * COUNT(b.runs) FILTER (WHERE b.balls_faced >= 10),
+               %1$s * COALESCE(SUM(b.runs) FILTER (WHERE b.balls_faced >= 10), 0),
+               %1$s * COALESCE(SUM(b.runs::BIGINT * b.runs) FILTER (WHERE b.balls_faced >= 10), 0)
+        FROM b
+        GROUP BY 1, 2, 3
+        ON CONFLICT (player_id, team_name, year) DO UPDATE SET
+            player_name    = CASE WHEN EXCLUDED.innings > 0 THEN COALESCE(EXCLUDED.player_name, t.player_name)
+                                  ELSE t.player_name END,
+            innings        = t.innings + EXCLUDED.innings,
+            runs_innings   = t.runs_innings + EXCLUDED.runs_innings,
+            runs           = t.runs + EXCLUDED.runs,
+            runs_sq        = t.runs_sq + EXCLUDED.runs_sq,
+            balls          = t.balls + EXCLUDED.balls,
+            sr_innings     = t.sr_innings + EXCLUDED.sr_innings,
+            sum_sr         = t.sum_sr + EXCLUDED.sum_sr,
+            fifties        = t.fifties + EXCLUDED.fifties,
+            hundreds       = t.hundreds + EXCLUDED.hundreds,
+            q_innings      = t.q_innings + EXCLUDED.q_innings,
+            q_runs_innings = t.q_runs_innings + EXCLUDED.q_runs_innings,
+            q_runs         = t.q_runs + EXCLUDED.q_runs,
+            q_runs_sq      = t.q_runs_sq + EXCLUDED.q_runs_sq
+    )
+    INSERT INTO player_batting_quarterly AS t (
+        player_id, team_name, quarter, player_name,
+        innings, runs_innings, runs, runs_sq, balls, sr_innings, sum_sr, fifties, hundreds)
+    SELECT b.player_id, COALESCE(b.team_name, ''), DATE_TRUNC('quarter', b.start_date), MAX(b.player_name),
+           %1$s * COUNT(*), %1$s * COUNT(b.runs),
+           %1$s * COALESCE(SUM(b.runs), 0), %1$s * COALESCE(SUM(b.runs::BIGINT * b.runs), 0),
+           %1$s * COALESCE(SUM(b.balls_faced), 0),
+           %1$s * COUNT(b.strike_rate), %1$s * COALESCE(SUM(b.strike_rate), 0),
+           %1$s * COUNT(*) FILTER (WHERE b.runs >= 50 AND b.runs < 100),
+           %1$s * COUNT(*) FILTER (WHERE b.runs >= 100)
+    FROM b
+    GROUP BY 1, 2, 3
+    ON CONFLICT (player_id, team_name, quarter) DO UPDATE SET
+        player_name    = CASE WHEN EXCLUDED.innings > 0 THEN COALESCE(EXCLUDED.player_name, t.player_name)
+                              ELSE t.player_name END,
+        innings        = t.innings + EXCLUDED.innings,
+        runs_innings   = t.runs_innings + EXCLUDED.runs_innings,
+        runs           = t.runs + EXCLUDED.runs,
+        runs_sq        = t.runs_sq + EXCLUDED.runs_sq,
+        balls          = t.balls + EXCLUDED.balls,
+        sr_innings     = t.sr_innings + EXCLUDED.sr_innings,
+        sum_sr         = t.sum_sr + EXCLUDED.sum_sr,
+        fifties        = t.fifties + EXCLUDED.fifties,
+        hundreds       = t.hundreds + EXCLUDED.hundreds
+$q$, sign, source)
+$f$;
+
+-- after a delta: drop emptied periods, bump the cache versions
+CREATE OR REPLACE FUNCTION player_period_settle()
+RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM player_batting_yearly WHERE innings <= 0;
+    DELETE FROM player_batting_quarterly WHERE innings <= 0;
+
+    -- same transaction as the write, like bump_table_versions() in utils/query_cache.py
+    INSERT INTO table_versions (table_name, version)
+    VALUES ('player_batting_yearly', 1), ('player_batting_quarterly', 1)
+    ON CONFLICT (table_name) DO UPDATE
+      SET version = table_versions.version + 1, updated_at = CURRENT_TIMESTAMP;
+END $$;
+
+-- full recompute from the scorecards (backfill, or after bulk surgery with triggers disabled)
+CREATE OR REPLACE FUNCTION player_period_rebuild()
+RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE player_batting_yearly, player_batting_quarterly;
+    EXECUTE player_period_delta(1, $src$
+        SELECT b.player_id, b.player_name, b.team_name, m.start_date, b.runs, b.balls_faced, b.strike_rate
+        FROM batting_scorecard b
+        JOIN matches m ON m.match_id = b.match_id $src$);
+    PERFORM player_period_settle();
+END $$;
+
+-- ---------------- triggers: batting_scorecard ----------------
+CREATE OR REPLACE FUNCTION batting_period_sync()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        EXECUTE player_period_delta(-1, $src$
+            SELECT o.player_id, o.player_name, o.team_name, m.start_date, o.runs, o.balls_faced, o.strike_rate
+            FROM old_rows o
+            JOIN matches m ON m.match_id = o.match_id $src$);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        EXECUTE player_period_delta(1, $src$
+            SELECT n.player_id, n.player_name, n.team_name, m.start_date, n.runs, n.balls_faced, n.strike_rate
+            FROM new_rows n
+            JOIN matches m ON m.match_id = n.match_id $src$);
+    END IF;
+    PERFORM player_period_settle();
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION batting_period_truncate()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE player_batting_yearly, player_batting_quarterly;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS batting_period_insert ON batting_scorecard;
+CREATE TRIGGER batting_period_insert
+    AFTER INSERT ON batting_scorecard
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION batting_period_sync();
+
+DROP TRIGGER IF EXISTS batting_period_update ON batting_scorecard;
+CREATE TRIGGER batting_period_update
+    AFTER UPDATE ON batting_scorecard
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION batting_period_sync();
+
+DROP TRIGGER IF EXISTS batting_period_delete ON batting_scorecard;
+CREATE TRIGGER batting_period_delete
+    AFTER DELETE ON batting_scorecard
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION batting_period_sync();
+
+DROP TRIGGER IF EXISTS batting_period_truncate ON batting_scorecard;
+CREATE TRIGGER batting_period_truncate
+    AFTER TRUNCATE ON batting_scorecard
+    FOR EACH STATEMENT EXECUTE FUNCTION batting_period_truncate();
+
+-- ---------------- triggers: matches ----------------
+-- a match row arriving after its scorecard, a rescheduled match or a deleted
+-- match moves that match's innings between periods. Statement-level like the
+-- batting triggers, so a bulk load of matches settles once; a statement that
+-- moves no innings (most match upserts) doesn't settle or bump at all.
+-- Transition tables rule out UPDATE OF start_date: the moved matches are the
+-- old_rows / new_rows pairs whose start_date differs.
+CREATE OR REPLACE FUNCTION matches_period_sync()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+DECLARE
+    changed BIGINT := 0;
+    n       BIGINT;
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        EXECUTE player_period_delta(-1, $src$
+            SELECT b.player_id, b.player_name, b.team_name, o.start_date, b.runs, b.balls_faced, b.strike_rate
+            FROM old_rows o
+            JOIN new_rows nw ON nw.match_id = o.match_id AND nw.start_date IS DISTINCT FROM o.start_date
+            JOIN batting_scorecard b ON b.match_id = o.match_id $src$);
+        GET DIAGNOSTICS n = ROW_COUNT;
+        changed := changed + n;
+        EXECUTE player_period_delta(1, $src$
+            SELECT b.player_id, b.player_name, b.team_name, nw.start_date, b.runs, b.balls_faced, b.strike_rate
+            FROM new_rows nw
+            JOIN old_rows o ON o.match_id = nw.match_id AND o.start_date IS DISTINCT FROM nw.start_date
+            JOIN batting_scorecard b ON b.match_id = nw.match_id $src$);
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE player_period_delta(-1, $src$
+            SELECT b.player_id, b.player_name, b.team_name, o.start_date, b.runs, b.balls_faced, b.strike_rate
+            FROM old_rows o
+            JOIN batting_scorecard b ON b.match_id = o.match_id $src$);
+    ELSE
+        EXECUTE player_period_delta(1, $src$
+            SELECT b.player_id, b.player_name, b.team_name, nw.start_date, b.runs, b.balls_faced, b.strike_rate
+            FROM new_rows nw
+            JOIN batting_scorecard b ON b.match_id = nw.match_id $src$);
+    END IF;
+    GET DIAGNOSTICS n = ROW_COUNT;
+    changed := changed + n;
+    IF changed > 0 THEN
+        PERFORM player_period_settle();
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS matches_period_change ON matches;
+DROP TRIGGER IF EXISTS matches_period_insert ON matches;
+CREATE TRIGGER matches_period_insert
+    AFTER INSERT ON matches
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION matches_period_sync();
+
+DROP TRIGGER IF EXISTS matches_period_update ON matches;
+CREATE TRIGGER matches_period_update
+    AFTER UPDATE ON matches
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION matches_period_sync();
+
+DROP TRIGGER IF EXISTS matches_period_delete ON matches;
+CREATE TRIGGER matches_period_delete
+    AFTER DELETE ON matches
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION matches_period_sync();
+
+-- ---------------- backfill ----------------
+SELECT player_period_rebuild();
+
+ANALYZE player_batting_yearly;
+ANALYZE player_batting_quarterly;
@@ -0,0 +1,251 @@
+-- ===========================================================
+--   0004 · Recent form: each player's last N innings
+-- ===========================================================
+-- Q23 ("last 10 innings") averaged every innings a player ever batted.
+-- player_recent_innings keeps only the newest N innings per player (by
+-- matches.start_date), like a ring buffer: a newer innings pushes the oldest
+-- one out. Triggers on batting_scorecard and matches keep it current, so
+-- rolling average / strike rate / fifties read at most N rows per player.
+--
+-- N lives in recent_form_config; change it with SELECT recent_form_resize(15).
+--
+--   inserts            add the new innings, then trim each touched player to N
+--   updates / deletes  recompute the touched players from batting_scorecard
+--                      (an evicted innings may have to come back)
+--   matches changes    a late, rescheduled or deleted match recomputes its players
+
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name  TEXT PRIMARY KEY,
+    version     BIGINT NOT NULL DEFAULT 0,
+    updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS recent_form_config (
+    id       BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),   -- single row
+    innings  INT NOT NULL DEFAULT 10 CHECK (innings > 0)
+);
+INSERT INTO recent_form_config (id, innings) VALUES (TRUE, 10) ON CONFLICT (id) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS player_recent_innings (
+    player_id    BIGINT NOT NULL,
+    match_id     BIGINT NOT NULL,
+    innings_id   INT NOT NULL,
+    start_date   TIMESTAMP NOT NULL,
+    player_name  TEXT,
+    team_name    TEXT,
+    runs         INT,
+    balls_faced  INT,
+    strike_rate  FLOAT,
+    PRIMARY KEY (player_id, match_id, innings_id)
+);
+
+-- newest-first per player: trimming, and per-player form lookups
+CREATE INDEX IF NOT EXISTS idx_player_recent_innings_date
+    ON player_recent_innings (player_id, start_date DESC);
+
+-- recomputing one player's last N innings
+CREATE INDEX IF NOT EXISTS idx_batting_player
+    ON batting_scorecard (player_id);
+
+-- ---------------- maintenance ----------------
+CREATE OR REPLACE FUNCTION recent_form_window()
+RETURNS INT LANGUAGE sql STABLE AS $$
+    SELECT COALESCE((SELECT innings FROM recent_form_config WHERE id), 10)
+$$;
+
+-- drop innings beyond the newest N for the given players
+CREATE OR REPLACE FUNCTION recent_form_trim(players BIGINT[])
+RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM player_recent_innings r
+    USING (
+        SELECT player_id, match_id, innings_id,
+               ROW_NUMBER() OVER (PARTITION BY player_id
+                                  ORDER BY start_date DESC, match_id DESC, innings_id DESC) AS rn
+        FROM player_recent_innings
+        WHERE player_id = ANY (players)
+    ) ranked
+    WHERE ranked.rn > recent_form_window()
+      AND r.player_id = ranked.player_id
+      AND r.match_id = ranked.match_id
+      AND r.innings_id = ranked.innings_id;
+END $$;
+
+-- rebuild the buffer of the given players from batting_scorecard (NULL → everyone)
+CREATE OR REPLACE FUNCTION recent_form_refresh(players BIGINT[] DEFAULT NULL)
+RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+    IF players IS NULL THEN
+        TRUNCATE player_recent_innings;
+        INSERT INTO player_recent_innings
+        SELECT player_id, match_id, innings_id, start_date, player_name, team_name,
+               runs, balls_faced, strike_rate
+        FROM (
+            SELECT b.player_id, b.match_id, b.innings_id, m.start_date, b.player_name, b.team_name,
+                   b.runs, b.balls_faced, b.strike_rate,
+                   ROW_NUMBER() OVER (PARTITION BY b.player_id
+                                      ORDER BY m.start_date DESC, b.match_id DESC, b.innings_id DESC) AS rn
+            FROM batting_scorecard b
+            JOIN matches m ON m.match_id = b.match_id
+        ) ranked
+        WHERE rn <= recent_form_window();
+    ELSIF cardinality(players) > 0 THEN
+        DELETE FROM player_recent_innings WHERE player_id = ANY (players);
+        INSERT INTO player_recent_innings
+        SELECT recent.*
+        FROM unnest(players) AS p(player_id)
+        CROSS JOIN LATERAL (
+            SELECT b.player_id, b.match_id, b.innings_id, m.start_date, b.player_name, b.team_name,
+                   b.runs, b.balls_faced, b.strike_rate
+            FROM batting_scorecard b
+            JOIN matches m ON m.match_id = b.match_id
+            WHERE b.player_id = p.player_id
+            ORDER BY m.start_date DESC, b.match_id DESC, b.innings_id DESC
+            LIMIT recent_form_window()
+        ) recent;
+    ELSE
+        RETURN;
+    END IF;
+
+    -- same transaction as the write, like bump_table_versions() in utils/query_cache.py
+    INSERT INTO table_versions (table_name, version) VALUES ('player_recent_innings', 1)
+    ON CONFLICT (table_name) DO UPDATE
+      SET version = table_versions.version + 1, updated_at = CURRENT_TIMESTAMP;
+END $$;
+
+CREATE OR REPLACE FUNCTION recent_form_rebuild()
+RETURNS VOID LANGUAGE sql AS $$
+    SELECT recent_form_refresh(NULL)
+$$;
+
+CREATE OR REPLACE FUNCTION recent_form_resize(n INT)
+RETURNS VOID LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE recent_form_config SET innings = n WHERE id;
+    PERFORM recent_form_refresh(NULL);
+END $$;
+
+-- ---------------- triggers: batting_scorecard ----------------
+CREATE OR REPLACE FUNCTION batting_recent_form_sync()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+DECLARE
+    touched BIGINT[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        -- fast path: add, then evict the oldest beyond N
+        INSERT INTO player_recent_innings
+        SELECT n.player_id, n.match_id, n.innings_id, m.start_date, n.player_name, n.team_name,
+               n.runs, n.balls_faced, n.strike_rate
+        FROM new_rows n
+        JOIN matches m ON m.match_id = n.match_id
+        ON CONFLICT (player_id, match_id, innings_id) DO NOTHING;
+        touched := ARRAY(SELECT DISTINCT player_id FROM new_rows);
+        IF cardinality(touched) > 0 THEN
+            PERFORM recent_form_trim(touched);
+            INSERT INTO table_versions (table_name, version) VALUES ('player_recent_innings', 1)
+            ON CONFLICT (table_name) DO UPDATE
+              SET version = table_versions.version + 1, updated_at = CURRENT_TIMESTAMP;
+        END IF;
+    ELSIF TG_OP = 'UPDATE' THEN
+        touched := ARRAY(SELECT player_id FROM old_rows UNION SELECT player_id FROM new_rows);
+        PERFORM recent_form_refresh(touched);
+    ELSE
+        touched := ARRAY(SELECT DISTINCT player_id FROM old_rows);
+        PERFORM recent_form_refresh(touched);
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION batting_recent_form_truncate()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    TRUNCATE player_recent_innings;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS batting_recent_form_insert ON batting_scorecard;
+CREATE TRIGGER batting_recent_form_insert
+    AFTER INSERT ON batting_scorecard
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION batting_recent_form_sync();
+
+DROP TRIGGER IF EXISTS batting_recent_form_update ON batting_scorecard;
+CREATE TRIGGER batting_recent_form_update
+    AFTER UPDATE ON batting_scorecard
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION batting_recent_form_sync();
+
+DROP TRIGGER IF EXISTS batting_recent_form_delete ON batting_scorecard;
+CREATE TRIGGER batting_recent_form_delete
+    AFTER DELETE ON batting_scorecard
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION batting_recent_form_sync();
+
+DROP TRIGGER IF EXISTS batting_recent_form_truncate ON batting_scorecard;
+CREATE TRIGGER batting_recent_form_truncate
+    AFTER TRUNCATE ON batting_scorecard
+    FOR EACH STATEMENT EXECUTE FUNCTION batting_recent_form_truncate();
+
+-- ---------------- triggers: matches ----------------
+-- statement-level: one refresh for all players of the matches a statement
+-- added, removed or moved to another date (the old_rows / new_rows pairs whose
+-- start_date differs; transition tables rule out UPDATE OF start_date)
+CREATE OR REPLACE FUNCTION matches_recent_form_sync()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+DECLARE
+    touched BIGINT[];
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        touched := ARRAY(
+            SELECT DISTINCT b.player_id
+            FROM old_rows o
+            JOIN new_rows n ON n.match_id = o.match_id AND n.start_date IS DISTINCT FROM o.start_date
+            JOIN batting_scorecard b ON b.match_id = o.match_id);
+    ELSIF TG_OP = 'DELETE' THEN
+        touched := ARRAY(SELECT DISTINCT b.player_id
+                         FROM old_rows o JOIN batting_scorecard b ON b.match_id = o.match_id);
+    ELSE
+        touched := ARRAY(SELECT DISTINCT b.player_id
+                         FROM new_rows n JOIN batting_scorecard b ON b.match_id = n.match_id);
+    END IF;
+    PERFORM recent_form_refresh(touched);       -- no-op (and no version bump) when empty
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS matches_recent_form_change ON matches;
+DROP TRIGGER IF EXISTS matches_recent_form_insert ON matches;
+CREATE TRIGGER matches_recent_form_insert
+    AFTER INSERT ON matches
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION matches_recent_form_sync();
+
+DROP TRIGGER IF EXISTS matches_recent_form_update ON matches;
+CREATE TRIGGER matches_recent_form_update
+    AFTER UPDATE ON matches
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION matches_recent_form_sync();
+
+DROP TRIGGER IF EXISTS matches_recent_form_delete ON matches;
+CREATE TRIGGER matches_recent_form_delete
+    AFTER DELETE ON matches
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION matches_recent_form_sync();
+
+-- ---------------- per-player form ----------------
+-- name / team from the newest innings; fifties count 50+ scores, as Q23 always did
+CREATE OR REPLACE VIEW player_recent_form AS
+SELECT player_id,
+       (ARRAY_AGG(player_name ORDER BY start_date DESC))[1] AS player_name,
+       (ARRAY_AGG(team_name ORDER BY start_date DESC))[1] AS team_name,
+       COUNT(*) AS innings,
+       MAX(start_date) AS last_innings,
+       ROUND(AVG(runs)::NUMERIC, 2) AS avg_runs,
+       ROUND(AVG(strike_rate)::NUMERIC, 2) AS avg_sr,
+       COUNT(*) FILTER (WHERE runs >= 50) AS fifties
+FROM player_recent_innings
+GROUP BY player_id;
+
+-- ---------------- backfill ----------------
+SELECT recent_form_rebuild();
+
+ANALYZE player_recent_innings;
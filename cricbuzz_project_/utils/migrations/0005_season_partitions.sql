@@ -0,0 +1,216 @@
+-- ===========================================================
+--   0005 · Season partitions for matches and the scorecards
+-- ===========================================================
+-- matches and the per-match tables were single heaps growing with every
+-- archive backfill. They become RANGE partitioned by calendar year:
+--
+--   matches              on start_date
+--   match_innings,       on match_start_date, a copy of matches.start_date,
+--   batting/bowling/     so a match and its scorecards always sit in the
+--   fielding_scorecard   same season (<table>_2024, ...)
+--
+-- Every table also has a <table>_default partition: rows of a season that has
+-- no partition yet, and scorecards whose match isn't loaded ('-infinity').
+-- The ingestion jobs call ensure_season_partitions() before each batch, which
+-- creates the missing seasons and moves their rows out of the default.
+--
+-- Primary keys gain the partition column (Postgres requires it), so the
+-- ingestion upserts conflict on (match_id, start_date) and re-key a
+-- rescheduled match first; the trigger below moves its scorecards along.
+--
+-- An old season is detached with
+--   ALTER TABLE matches DETACH PARTITION matches_2019;   (same for the scorecards)
+-- and is then a plain table to archive, dump or drop.
+
+-- ---------------- denormalized match date ----------------
+ALTER TABLE match_innings      ADD COLUMN IF NOT EXISTS match_start_date TIMESTAMP;
+ALTER TABLE batting_scorecard  ADD COLUMN IF NOT EXISTS match_start_date TIMESTAMP;
+ALTER TABLE bowling_scorecard  ADD COLUMN IF NOT EXISTS match_start_date TIMESTAMP;
+ALTER TABLE fielding_scorecard ADD COLUMN IF NOT EXISTS match_start_date TIMESTAMP;
+
+-- the aggregate triggers (0003, 0004) don't read this column: keep them out of the backfill
+ALTER TABLE batting_scorecard DISABLE TRIGGER USER;
+
+UPDATE match_innings t SET match_start_date = m.start_date
+FROM matches m WHERE m.match_id = t.match_id AND t.match_start_date IS NULL;
+UPDATE batting_scorecard t SET match_start_date = m.start_date
+FROM matches m WHERE m.match_id = t.match_id AND t.match_start_date IS NULL;
+UPDATE bowling_scorecard t SET match_start_date = m.start_date
+FROM matches m WHERE m.match_id = t.match_id AND t.match_start_date IS NULL;
+UPDATE fielding_scorecard t SET match_start_date = m.start_date
+FROM matches m WHERE m.match_id = t.match_id AND t.match_start_date IS NULL;
+
+UPDATE match_innings      SET match_start_date = '-infinity' WHERE match_start_date IS NULL;
+UPDATE batting_scorecard  SET match_start_date = '-infinity' WHERE match_start_date IS NULL;
+UPDATE bowling_scorecard  SET match_start_date = '-infinity' WHERE match_start_date IS NULL;
+UPDATE fielding_scorecard SET match_start_date = '-infinity' WHERE match_start_date IS NULL;
+
+ALTER TABLE batting_scorecard ENABLE TRIGGER USER;
+
+ALTER TABLE match_innings      ALTER COLUMN match_start_date SET NOT NULL;
+ALTER TABLE batting_scorecard  ALTER COLUMN match_start_date SET NOT NULL;
+ALTER TABLE bowling_scorecard  ALTER COLUMN match_start_date SET NOT NULL;
+ALTER TABLE fielding_scorecard ALTER COLUMN match_start_date SET NOT NULL;
+
+-- ---------------- heap → partitioned ----------------
+-- rebuilds `tbl` partitioned by `date_col` with one partition per year present;
+-- primary / unique keys gain date_col, other constraints, indexes and triggers
+-- are recreated as they were. `after` places date_col right after that column
+-- (the layout of ingestion/schema.py). No-op when `tbl` is already partitioned.
+CREATE OR REPLACE FUNCTION season_partition_convert(tbl TEXT, date_col TEXT, after TEXT DEFAULT NULL)
+RETURNS VOID LANGUAGE plpgsql AS $$
+DECLARE
+    heap TEXT := tbl || '_heap';
+    cols TEXT[];
+    names TEXT;
+    defs TEXT[];
+    def  TEXT;
+    yr   INT;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass(tbl)) IS DISTINCT FROM 'r' THEN
+        RETURN;
+    END IF;
+
+    -- captured before the rename, so the definitions still name `tbl`
+    defs := ARRAY(
+        SELECT format('ALTER TABLE %I ADD CONSTRAINT %I %s', tbl, conname,
+                      CASE WHEN contype IN ('p', 'u')
+                           THEN regexp_replace(pg_get_constraintdef(oid), '\)$', format(', %I)', date_col))
+                           ELSE pg_get_constraintdef(oid) END)
+        FROM pg_constraint
+        WHERE conrelid = tbl::regclass AND contype IN ('p', 'u', 'c', 'f')
+        ORDER BY contype = 'f', conname);
+    defs := defs || ARRAY(
+        SELECT pg_get_indexdef(i.indexrelid)
+        FROM pg_index i
+        WHERE i.indrelid = tbl::regclass
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c
+                          WHERE c.conrelid = i.indrelid AND c.conindid = i.indexrelid)
+        ORDER BY i.indexrelid);
+    defs := defs || ARRAY(
+        SELECT pg_get_triggerdef(oid)
+        FROM pg_trigger
+        WHERE tgrelid = tbl::regclass AND NOT tgisinternal
+        ORDER BY tgname);
+
+    -- column definitions in the new order (an added column always sits last in the heap)
+    cols := ARRAY(
+        SELECT format('%I %s%s%s', a.attname, format_type(a.atttypid, a.atttypmod),
+                      CASE WHEN a.attnotnull THEN ' NOT NULL' ELSE '' END,
+                      COALESCE(' DEFAULT ' || pg_get_expr(d.adbin, d.adrelid), ''))
+        FROM pg_attribute a
+        LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+        WHERE a.attrelid = tbl::regclass AND a.attnum > 0 AND NOT a.attisdropped
+        ORDER BY CASE WHEN after IS NULL OR a.attname <> date_col THEN a.attnum
+                      ELSE (SELECT b.attnum FROM pg_attribute b
+                            WHERE b.attrelid = a.attrelid AND b.attname = after) END,
+                 a.attname = date_col);
+    names := (SELECT string_agg(quote_ident(split_part(c, ' ', 1)), ', ') FROM unnest(cols) AS c);
+
+    EXECUTE format('ALTER TABLE %I RENAME TO %I', tbl, heap);
+    EXECUTE format('CREATE TABLE %I (%s) PARTITION BY RANGE (%I)', tbl, array_to_string(cols, ', '), date_col);
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', tbl || '_default', tbl);
+    FOR yr IN EXECUTE format('SELECT DISTINCT EXTRACT(YEAR FROM %I)::INT FROM %I
+                              WHERE isfinite(%I) ORDER BY 1', date_col, heap, date_col)
+    LOOP
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                       tbl || '_' || yr, tbl, make_date(yr, 1, 1), make_date(yr + 1, 1, 1));
+    END LOOP;
+
+    -- the new table has no triggers yet, so the aggregates don't see the copy
+    EXECUTE format('INSERT INTO %I (%s) SELECT %s FROM %I', tbl, names, names, heap);
+    EXECUTE format('DROP TABLE %I', heap);
+
+    FOREACH def IN ARRAY defs LOOP
+        EXECUTE def;
+    END LOOP;
+    EXECUTE format('ANALYZE %I', tbl);
+END $$;
+
+-- ---------------- creating seasons ----------------
+-- one partition per season table for each year; rows of that year already in
+-- the default partition move into it. Cheap when every season exists.
+CREATE OR REPLACE FUNCTION ensure_season_partitions(seasons INT[])
+RETURNS VOID LANGUAGE plpgsql AS $$
+DECLARE
+    tbl  TEXT;
+    col  TEXT;
+    dflt TEXT;
+    part TEXT;
+    yr   INT;
+    lo   DATE;
+    hi   DATE;
+BEGIN
+    FOREACH yr IN ARRAY COALESCE(seasons, '{}') LOOP
+        FOREACH tbl IN ARRAY ARRAY['matches', 'match_innings', 'batting_scorecard',
+                                   'bowling_scorecard', 'fielding_scorecard'] LOOP
+            part := tbl || '_' || yr;
+            CONTINUE WHEN to_regclass(part) IS NOT NULL;       -- exists (or was detached on purpose)
+
+            SELECT a.attname INTO col
+            FROM pg_partitioned_table p
+            JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0]
+            WHERE p.partrelid = to_regclass(tbl);
+            CONTINUE WHEN col IS NULL;                         -- not partitioned
+
+            -- concurrent ingest runs: one creates, the others see it after the lock
+            PERFORM pg_advisory_xact_lock(hashtext('ensure_season_partitions'));
+            CONTINUE WHEN to_regclass(part) IS NOT NULL;
+
+            lo := make_date(yr, 1, 1);
+            hi := make_date(yr + 1, 1, 1);
+            EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)', part, tbl);
+
+            SELECT c.relname INTO dflt
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = tbl::regclass
+              AND pg_get_expr(c.relpartbound, c.oid) = 'DEFAULT';
+            IF dflt IS NOT NULL THEN
+                -- a move, not a change: the aggregate triggers stay out of it
+                EXECUTE format('ALTER TABLE %I DISABLE TRIGGER USER', dflt);
+                EXECUTE format('WITH moved AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *)
+                                INSERT INTO %I SELECT * FROM moved', dflt, col, lo, col, hi, part);
+                EXECUTE format('ALTER TABLE %I ENABLE TRIGGER USER', dflt);
+            END IF;
+
+            EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                           tbl, part, lo, hi);
+        END LOOP;
+    END LOOP;
+END $$;
+
+-- ---------------- convert ----------------
+SELECT season_partition_convert('matches', 'start_date');
+SELECT season_partition_convert('match_innings', 'match_start_date', 'match_id');
+SELECT season_partition_convert('batting_scorecard', 'match_start_date', 'match_id');
+SELECT season_partition_convert('bowling_scorecard', 'match_start_date', 'match_id');
+SELECT season_partition_convert('fielding_scorecard', 'match_start_date', 'match_id');
+
+-- same seasons on every table (and out of the default partition on installs that started partitioned)
+SELECT ensure_season_partitions(ARRAY(
+    SELECT DISTINCT EXTRACT(YEAR FROM start_date)::INT FROM matches WHERE isfinite(start_date)));
+
+-- ---------------- triggers: matches ----------------
+-- scorecards follow their match: dated when a late match arrives, moved when it is rescheduled
+CREATE OR REPLACE FUNCTION matches_season_sync()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE match_innings SET match_start_date = NEW.start_date
+    WHERE match_id = NEW.match_id AND match_start_date <> NEW.start_date;
+    UPDATE batting_scorecard SET match_start_date = NEW.start_date
+    WHERE match_id = NEW.match_id AND match_start_date <> NEW.start_date;
+    UPDATE bowling_scorecard SET match_start_date = NEW.start_date
+    WHERE match_id = NEW.match_id AND match_start_date <> NEW.start_date;
+    UPDATE fielding_scorecard SET match_start_date = NEW.start_date
+    WHERE match_id = NEW.match_id AND match_start_date <> NEW.start_date;
+    RETURN NULL;
+END $$;
+
+-- INSERT also covers a reschedule that moved the row across partitions
+DROP TRIGGER IF EXISTS matches_season_sync ON matches;
+CREATE TRIGGER matches_season_sync
+    AFTER INSERT OR UPDATE OF start_date ON matches
+    FOR EACH ROW EXECUTE FUNCTION matches_season_sync();
+
+ANALYZE matches;
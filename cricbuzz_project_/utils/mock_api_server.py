@@ -0,0 +1,426 @@
+"""
+Local stand-in for the Cricbuzz RapidAPI, for offline load testing.
+
+Serves recorded fixtures when present and deterministic synthetic JSON
+otherwise, with configurable latency, error rate and 429s. Point the app or
+the ingestion code at it with CRICBUZZ_API_BASE:
+
+    python -m utils.mock_api_server --port 8765 --latency-ms 80 --jitter-ms 40 --rate-429 0.02
+    CRICBUZZ_API_BASE=http://127.0.0.1:8765 streamlit run app.py
+
+Recorded fixtures are plain JSON files under --fixtures, named after the
+request path with "/" replaced by "_" (e.g. mcenter_v1_12345_scard.json).
+`python -m utils.mock_api_server record /matches/v1/live ...` captures them
+from the real API.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+TEAMS = [
+    (2, "India", "IND"), (4, "Australia", "AUS"), (9, "England", "ENG"),
+    (11, "South Africa", "RSA"), (13, "New Zealand", "NZ"), (3, "Pakistan", "PAK"),
+    (5, "Sri Lanka", "SL"), (10, "West Indies", "WI"), (6, "Bangladesh", "BAN"),
+    (96, "Afghanistan", "AFG"),
+]
+VENUES = [
+    (31, "Wankhede Stadium", "Mumbai", "India", 33108),
+    (40, "Melbourne Cricket Ground", "Melbourne", "Australia", 100024),
+    (12, "Lord's", "London", "England", 31100),
+    (55, "Newlands", "Cape Town", "South Africa", 25000),
+    (61, "Eden Park", "Auckland", "New Zealand", 42000),
+    (77, "Gaddafi Stadium", "Lahore", "Pakistan", 27000),
+    (80, "R.Premadasa Stadium", "Colombo", "Sri Lanka", 35000),
+    (90, "Kensington Oval", "Bridgetown", "West Indies", 28000),
+]
+FIRST = ["Arjun", "Rohan", "Steve", "Joe", "Kane", "Babar", "Kusal", "Shai", "Litton", "Rahmat",
+         "Virat", "Travis", "Ben", "Quinton", "Devon", "Fakhar", "Pathum", "Nicholas", "Mushfiq", "Ibrahim"]
+LAST = ["Sharma", "Smith", "Root", "Williamson", "Azam", "Mendis", "Hope", "Das", "Shah", "Kohli",
+        "Head", "Stokes", "de Kock", "Conway", "Zaman", "Nissanka", "Pooran", "Rahim", "Zadran", "Patel"]
+FORMATS = ["TEST", "ODI", "T20"]
+STAT_FORMATS = ["Test", "ODI", "T20", "IPL"]
+BASE_MATCH_ID = 100000
+BASE_SERIES_ID = 9000
+DAY_MS = 86_400_000
+
+
+# ---------------- Synthetic Data ----------------
+def _rng(*parts):
+    return random.Random(zlib.crc32("|".join(map(str, parts)).encode()))
+
+def _team(team_id):
+    for t in TEAMS:
+        if t[0] == team_id:
+            return t
+    return (team_id, f"Team {team_id}", f"T{team_id}")
+
+def player_id(team_id, slot):
+    return team_id * 1000 + slot
+
+def player_name(pid):
+    r = _rng("player", pid)
+    return f"{r.choice(FIRST)} {r.choice(LAST)}"
+
+def squad(team_id):
+    return [player_id(team_id, i) for i in range(1, 16)]
+
+def match_info(match_id, state=None, now_ms=None):
+    r = _rng("match", match_id)
+    now_ms = now_ms or int(time.time() * 1000)
+    t1, t2 = r.sample(TEAMS, 2)
+    v = r.choice(VENUES)
+    fmt = r.choice(FORMATS)
+    series_id = BASE_SERIES_ID + (match_id - BASE_MATCH_ID) // 5
+    if state == "In Progress":
+        start = now_ms - 3 * 3600 * 1000
+    elif state == "Preview":
+        start = now_ms + (1 + match_id % 10) * DAY_MS
+    else:
+        start = now_ms - (1 + (match_id - BASE_MATCH_ID) // 5 * 7 + match_id % 5) * DAY_MS
+    state = state or "Complete"
+    status = f"{t1[1]} won by {r.randint(1, 9)} wkts" if state == "Complete" else f"{t2[1]} need {r.randint(10, 150)} runs"
+    return {
+        "matchId": match_id, "seriesId": series_id, "seriesName": f"Synthetic Series {series_id}",
+        "matchDesc": f"{1 + match_id % 5}th Match", "matchFormat": fmt,
+        "startDate": str(start), "endDate": str(start + (5 if fmt == "TEST" else 1) * DAY_MS),
+        "state": state, "status": status, "stateTitle": state,
+        "team1": {"teamId": t1[0], "teamName": t1[1], "teamSName": t1[2]},
+        "team2": {"teamId": t2[0], "teamName": t2[1], "teamSName": t2[2]},
+        "venueInfo": {"id": v[0], "ground": v[1], "city": v[2], "country": v[3]},
+    }
+
+def _progress(match_id, state):
+    """0..1 fraction of the match played; live matches advance with wall time"""
+    if state == "Complete":
+        return 1.0
+    return min(1.0, 0.2 + ((time.time() / 60 + match_id) % 180) / 225)
+
+def scorecard(match_id, state="Complete"):
+    info = match_info(match_id, state)
+    r = _rng("scard", match_id)
+    t1, t2 = info["team1"], info["team2"]
+    progress = _progress(match_id, state)
+    max_overs = {"TEST": 90, "ODI": 50, "T20": 20}[info["matchFormat"]]
+    innings = []
+    for inn_no, (bat, bowl) in enumerate([(t1, t2), (t2, t1)], start=1):
+        share = max(0.0, min(1.0, progress * 2 - (inn_no - 1)))
+        if share <= 0:
+            break
+        overs = round(max_overs * share, 1)
+        batters, total, wkts = [], 0, 0
+        n_batters = 2 + int(9 * share)
+        for slot in range(1, n_batters + 1):
+            runs = int(r.paretovariate(1.4) * 8 * share)
+            balls = max(1, int(runs * r.uniform(0.7, 1.6)))
+            out = slot < n_batters
+            pid = player_id(bat["teamId"], slot)
+            catcher = player_name(player_id(bowl["teamId"], r.randint(1, 11)))
+            bowler = player_name(player_id(bowl["teamId"], r.randint(7, 11)))
+            batters.append({
+                "id": pid, "name": player_name(pid), "runs": runs, "balls": balls,
+                "fours": runs // 8, "sixes": runs // 25, "strkrate": f"{100 * runs / balls:.2f}",
+                "outdec": f"c {catcher} b {bowler}" if out else "not out",
+            })
+            total += runs
+            wkts += 1 if out else 0
+        bowlers = []
+        for slot in range(7, 12):
+            o = round(overs / 5, 1)
+            conceded = int(total / 5)
+            pid = player_id(bowl["teamId"], slot)
+            bowlers.append({
+                "id": pid, "name": player_name(pid), "overs": o, "maidens": r.randint(0, 2),
+                "runs": conceded, "wickets": min(wkts, r.randint(0, 3)),
+                "economy": f"{conceded / o:.2f}" if o else "0.00",
+            })
+        parts = []
+        for w in range(min(len(batters) - 1, 10)):
+            parts.append({
+                "bat1name": batters[w]["name"], "bat2name": batters[w + 1]["name"],
+                "runs": r.randint(0, 120), "balls": r.randint(5, 150), "wicketno": w + 1,
+            })
+        innings.append({
+            "inningsid": inn_no,
+            "batteamname": bat["teamName"], "batteamsname": bat["teamSName"],
+            "batteamdetails": {"batteamid": bat["teamId"], "batteamname": bat["teamName"]},
+            "bowlteamdetails": {"bowlteamid": bowl["teamId"], "bowlteamname": bowl["teamName"]},
+            "score": total, "wickets": wkts, "overs": overs,
+            "batsman": batters, "bowler": bowlers, "partnershipsdata": parts,
+        })
+    return {
+        "scorecard": innings, "ismatchcomplete": state == "Complete",
+        "status": info["status"], "matchHeader": {"matchId": match_id, "state": state, "status": info["status"]},
+    }
+
+def match_list(kind, count=12):
+    now_ms = int(time.time() * 1000)
+    if kind == "live":
+        ids = [BASE_MATCH_ID + 900 + i for i in range(count // 3)]
+        state = "In Progress"
+    elif kind == "upcoming":
+        ids = [BASE_MATCH_ID + 800 + i for i in range(count)]
+        state = "Preview"
+    else:
+        ids = [BASE_MATCH_ID + i for i in range(count * (3 if kind == "completed" else 1))]
+        state = "Complete"
+    by_series = {}
+    for mid in ids:
+        info = match_info(mid, state, now_ms)
+        entry = {"matchInfo": info}
+        if state != "Preview":
+            sc = scorecard(mid, state)["scorecard"]
+            entry["matchScore"] = {
+                f"team{i}Score": {"inngs1": {"runs": inn["score"], "wickets": inn["wickets"], "overs": inn["overs"]}}
+                for i, inn in enumerate(sc, start=1)
+            }
+        by_series.setdefault((info["seriesId"], info["seriesName"]), []).append(entry)
+    return {"typeMatches": [{
+        "matchType": "International",
+        "seriesMatches": [
+            {"seriesAdWrapper": {"seriesId": sid, "seriesName": name, "matches": ms}}
+            for (sid, name), ms in by_series.items()
+        ],
+    }]}
+
+def match_center(match_id):
+    info = match_info(match_id)
+    winner = info["team1"]
+    return {"matchHeader": {
+        "matchId": match_id, "state": info["state"], "status": info["status"], "complete": True,
+        "winningTeamId": winner["teamId"], "winningTeamName": winner["teamName"],
+        "tossResults": {"tossWinnerId": info["team2"]["teamId"], "decision": "Bowling"},
+    }}
+
+def series_detail(series_id):
+    first = BASE_MATCH_ID + (series_id - BASE_SERIES_ID) * 5
+    matches = [{"matchInfo": match_info(mid)} for mid in range(first, first + 5)]
+    return {
+        "id": series_id, "name": f"Synthetic Series {series_id}", "type": "International",
+        "startDt": min((m["matchInfo"]["startDate"] for m in matches), key=int),
+        "endDt": max((m["matchInfo"]["endDate"] for m in matches), key=int),
+        "host": {"countryName": matches[0]["matchInfo"]["venueInfo"]["country"]},
+        "matchDetails": [{"matchDetailsMap": {"key": "matches", "match": matches}}],
+    }
+
+def series_archive(category, cursor=None):
+    page = int(cursor or 0)
+    now_ms = int(time.time() * 1000)
+    series = [{
+        "id": BASE_SERIES_ID + page * 4 + i, "name": f"Synthetic {category.title()} Series {page * 4 + i}",
+        "startDt": str(now_ms - (page * 4 + i + 1) * 30 * DAY_MS), "endDt": str(now_ms - (page * 4 + i) * 30 * DAY_MS),
+    } for i in range(4)]
+    out = {"seriesMapProto": [{"date": "synthetic", "series": series}]}
+    if page < 2:
+        out["nextCursor"] = str(page + 1)
+    return out
+
+def venue(venue_id):
+    for v in VENUES:
+        if v[0] == venue_id:
+            return {"id": v[0], "ground": v[1], "city": v[2], "country": v[3], "capacity": v[4]}
+    return {"id": venue_id, "ground": f"Ground {venue_id}", "city": "City", "country": "Global"}
+
+def series_venues(series_id):
+    r = _rng("venues", series_id)
+    return {"seriesVenue": [venue(v[0]) for v in r.sample(VENUES, 3)]}
+
+def team_players(team_id):
+    roles = [("BATSMEN", range(1, 6)), ("ALL ROUNDER", range(6, 9)),
+             ("WICKET KEEPER", range(9, 10)), ("BOWLER", range(10, 16))]
+    out = []
+    for role, slots in roles:
+        out.append({"name": role})
+        for slot in slots:
+            pid = player_id(team_id, slot)
+            out.append({"id": pid, "name": player_name(pid), "battingStyle": "Right-hand Bat",
+                        "bowlingStyle": "Right-arm Medium", "teamId": team_id})
+    return {"player": out}
+
+def player_search(name):
+    needle = (name or "").lower()
+    hits = []
+    for tid, tname, _ in TEAMS:
+        for pid in squad(tid):
+            pname = player_name(pid)
+            if needle and needle in pname.lower():
+                hits.append({"id": str(pid), "name": pname, "teamName": tname, "dob": "1990-01-01"})
+    return {"player": hits[:20]}
+
+def player_profile(pid):
+    r = _rng("profile", pid)
+    tid = pid // 1000
+    return {
+        "id": str(pid), "name": player_name(pid), "role": r.choice(["Batsman", "Bowler", "Batting Allrounder"]),
+        "bat": "Right Handed Bat", "bowl": "Right-arm medium", "birthPlace": _team(tid)[1],
+        "teams": _team(tid)[1], "intlTeam": _team(tid)[1],
+        "rankings": {"bat": {"testRank": str(r.randint(1, 80)), "odiBestRank": str(r.randint(1, 40))},
+                     "bowl": {"odiRank": str(r.randint(1, 80))}, "all": {}},
+    }
+
+def player_stats(pid, kind):
+    r = _rng("stats", pid, kind)
+    rows = {
+        "batting": ["Matches", "Innings", "Runs", "Balls", "Highest", "Average", "SR", "Not Out", "Fours", "Sixes", "Ducks", "50s", "100s", "200s", "300s", "400s"],
+        "bowling": ["Matches", "Innings", "Balls", "Runs", "Maidens", "Wickets", "Avg", "Eco", "SR", "BBI", "BBM", "4w", "5w", "10w"],
+        "fielding": ["Matches", "Catches", "Stumpings", "Run Outs"],
+    }[kind]
+    values = []
+    for label in rows:
+        vals = [label]
+        for _ in STAT_FORMATS:
+            if label in ("BBI", "BBM"):
+                vals.append(f"{r.randint(1, 7)}/{r.randint(10, 60)}")
+            elif label in ("Average", "SR", "Avg", "Eco"):
+                vals.append(f"{r.uniform(3, 60):.2f}")
+            else:
+                vals.append(str(int(r.paretovariate(1.2) * 10)))
+        values.append({"values": vals})
+    return {"headers": ["ROWHEADER"] + STAT_FORMATS, "values": values}
+
+def rankings(category, fmt):
+    r = _rng("rank", category, fmt)
+    pool = [pid for tid, _, _ in TEAMS for pid in squad(tid)]
+    today = time.strftime("%Y-%m-%d")
+    return {"rank": [{
+        "id": str(pid), "rank": str(i), "name": player_name(pid), "country": _team(pid // 1000)[1],
+        "rating": str(900 - i * 12), "lastUpdatedOn": today,
+    } for i, pid in enumerate(r.sample(pool, 10), start=1)]}
+
+
+ROUTES = [
+    (re.compile(r"^/matches/v1/(live|recent|upcoming|completed)$"), lambda m, q: match_list(m[1])),
+    (re.compile(r"^/mcenter/v1/(\d+)/h?scard$"), lambda m, q: scorecard(int(m[1]), "In Progress" if int(m[1]) >= BASE_MATCH_ID + 900 else "Complete")),
+    (re.compile(r"^/mcenter/v1/(\d+)$"), lambda m, q: match_center(int(m[1]))),
+    (re.compile(r"^/series/v1/archives/(\w+)$"), lambda m, q: series_archive(m[1], q.get("cursor"))),
+    (re.compile(r"^/series/v1/(\d+)/venues$"), lambda m, q: series_venues(int(m[1]))),
+    (re.compile(r"^/series/v1/(\d+)$"), lambda m, q: series_detail(int(m[1]))),
+    (re.compile(r"^/venues/v1/(\d+)$"), lambda m, q: venue(int(m[1]))),
+    (re.compile(r"^/teams/v1/(\d+)/players$"), lambda m, q: team_players(int(m[1]))),
+    (re.compile(r"^/stats/v1/player/search$"), lambda m, q: player_search(q.get("plrN"))),
+    (re.compile(r"^/stats/v1/player/(\d+)/(batting|bowling|fielding)$"), lambda m, q: player_stats(int(m[1]), m[2])),
+    (re.compile(r"^/stats/v1/player/(\d+)$"), lambda m, q: player_profile(int(m[1]))),
+    (re.compile(r"^/stats/v1/rankings/(batsmen|bowlers|allrounders)$"), lambda m, q: rankings(m[1], q.get("formatType", "test"))),
+]
+
+
+# ---------------- Server ----------------
+def fixture_name(path):
+    return path.strip("/").replace("/", "_") + ".json"
+
+class MockConfig:
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, rate_429=0.0,
+                 fixtures_dir=FIXTURES_DIR, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.fixtures_dir = fixtures_dir
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {"requests": 0, "errors": 0, "throttled": 0, "not_found": 0}
+
+class MockHandler(BaseHTTPRequestHandler):
+    config = MockConfig()
+    protocol_version = "HTTP/1.1"   # keep-alive, like the real API
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        cfg = self.config
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with cfg.lock:
+            cfg.counts["requests"] += 1
+            roll = cfg.random.random()
+            delay = max(0.0, cfg.latency_ms + cfg.random.uniform(-cfg.jitter_ms, cfg.jitter_ms)) / 1000
+
+        if path == "/__stats":
+            return self._send(200, cfg.counts)
+        time.sleep(delay)
+        if roll < cfg.rate_429:
+            with cfg.lock:
+                cfg.counts["throttled"] += 1
+            return self._send(429, {"message": "Too many requests"}, {"Retry-After": "1"})
+        if roll < cfg.rate_429 + cfg.error_rate:
+            with cfg.lock:
+                cfg.counts["errors"] += 1
+            return self._send(500, {"message": "Synthetic upstream error"})
+
+        if cfg.fixtures_dir:
+            fixture = os.path.join(cfg.fixtures_dir, fixture_name(path))
+            if os.path.exists(fixture):
+                with open(fixture, encoding="utf-8") as f:
+                    return self._send(200, json.load(f))
+        for rx, handler in ROUTES:
+            m = rx.match(path)
+            if m:
+                return self._send(200, handler(m, query))
+        with cfg.lock:
+            cfg.counts["not_found"] += 1
+        self._send(404, {"message": f"No route for {path}"})
+
+def serve(host="127.0.0.1", port=8765, config=None):
+    """Start the mock server in a daemon thread; returns the server"""
+    handler = type("ConfiguredMockHandler", (MockHandler,), {"config": config or MockConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def record(paths, fixtures_dir=FIXTURES_DIR):
+    """Capture real API responses for `paths` into fixture files"""
+    from utils.api_utils import CricbuzzClient, CRICBUZZ_HOST
+    client = CricbuzzClient(base_url=f"https://{CRICBUZZ_HOST}", cache=False)
+    os.makedirs(fixtures_dir, exist_ok=True)
+    for path in paths:
+        payload = client.fetch(path)
+        with open(os.path.join(fixtures_dir, fixture_name(path.split("?")[0])), "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=1)
+        print(f"✅ Recorded {path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Cricbuzz API stand-in")
+    parser.add_argument("paths", nargs="*", help="with `record`: API paths to capture")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="directory of recorded JSON fixtures")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.paths and args.paths[0] == "record":
+        record(args.paths[1:], args.fixtures)
+    else:
+        cfg = MockConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_429, args.fixtures, args.seed)
+        server = serve(args.host, args.port, cfg)
+        print(f"🏏 Mock Cricbuzz API on http://{args.host}:{args.port}  (stats at /__stats)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
@@ -0,0 +1,288 @@
+"""
+Bulk player import / export.
+
+Import streams a CSV or Parquet roster in batches through the ingestion
+BulkWriter (COPY into a temp stage table, then one INSERT ... ON CONFLICT per
+batch), so memory stays at one batch however big the file is. Each batch is
+its own transaction. Incoming values merge into existing players: a blank
+cell keeps what is already stored. Rows that cannot be loaded (bad id,
+missing name, unknown team, or anything Postgres refuses) are skipped and
+reported with their line number and reason.
+
+Export streams `COPY ... TO STDOUT` straight into the output file (CSV) or
+fetches through a server-side cursor into a Parquet writer, never holding the
+whole table in pandas.
+
+    python -m utils.player_bulk import rosters/india.csv --rejects rejects.csv
+    python -m utils.player_bulk export players.parquet
+
+Parquet needs `pyarrow` (optional dependency).
+"""
+
+import argparse
+import csv
+import io
+import os
+
+import psycopg2
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.bulk import BulkWriter, Upsert
+from ingestion.schema import ensure_tables
+
+BULK_BATCH = int(os.getenv("BULK_BATCH", "5000"))
+
+COLUMNS = [
+    "player_id", "full_name", "nick_name", "role",
+    "batting_style", "bowling_style", "is_keeper", "is_captain", "team_id",
+]
+REQUIRED = {"player_id", "full_name"}
+
+# blank incoming cells keep the stored value
+PLAYERS_MERGE = Upsert("players", COLUMNS, key=["player_id"], update={
+    c: f"COALESCE(EXCLUDED.{c}, players.{c})" for c in COLUMNS if c != "player_id"
+})
+
+EXPORT_SQL = """
+    SELECT p.player_id, p.full_name, p.nick_name, p.role, p.batting_style, p.bowling_style,
+           p.is_keeper, p.is_captain, p.team_id, t.team_name, t.country, p.created_at
+    FROM players p
+    LEFT JOIN teams t ON t.team_id = p.team_id
+    ORDER BY p.player_id
+"""
+
+_TRUE = {"true", "t", "yes", "y", "1"}
+_FALSE = {"false", "f", "no", "n", "0"}
+
+
+class BulkError(Exception):
+    """The file can't be imported at all (unknown format, missing columns, ...)"""
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise BulkError("Parquet support needs pyarrow: pip install pyarrow")
+
+def file_format(name):
+    ext = os.path.splitext(str(name).lower())[1]
+    if ext in (".csv", ".txt"):
+        return "csv"
+    if ext in (".parquet", ".pq"):
+        return "parquet"
+    raise BulkError(f"Unsupported file type '{ext}' (use .csv or .parquet)")
+
+
+# ---------------- Reading ----------------
+def iter_csv(f):
+    """Yield (line_no, {column: value}) from a CSV file object (text or bytes)"""
+    if not isinstance(f, io.TextIOBase):
+        f = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+    reader = csv.DictReader(f)
+    missing = REQUIRED - {(h or "").strip().lower() for h in reader.fieldnames or []}
+    if missing:
+        raise BulkError(f"Missing required column(s): {', '.join(sorted(missing))}")
+    for record in reader:
+        yield reader.line_num, {(k or "").strip().lower(): v for k, v in record.items()}
+
+def iter_parquet(f, batch_size=BULK_BATCH):
+    """Yield (row_no, {column: value}) one record batch at a time"""
+    pa = _pyarrow()
+    pf = pa.parquet.ParquetFile(f)
+    names = {n.lower() for n in pf.schema_arrow.names}
+    missing = REQUIRED - names
+    if missing:
+        raise BulkError(f"Missing required column(s): {', '.join(sorted(missing))}")
+    row_no = 0
+    for batch in pf.iter_batches(batch_size=batch_size):
+        for record in batch.to_pylist():
+            row_no += 1
+            yield row_no, {k.lower(): v for k, v in record.items()}
+
+def _blank(v):
+    return v is None or (isinstance(v, str) and not v.strip())
+
+def _int(v):
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    return int(str(v).strip())
+
+def _bool(v):
+    if isinstance(v, bool):
+        return v
+    s = str(v).strip().lower()
+    if s in _TRUE:
+        return True
+    if s in _FALSE:
+        return False
+    raise ValueError(f"not a boolean: {v!r}")
+
+def clean_row(record, team_ids):
+    """Record → tuple in COLUMNS order; raises ValueError with the reject reason"""
+    row = {}
+    for c in COLUMNS:
+        v = record.get(c)
+        if _blank(v):
+            row[c] = None
+        elif c in ("player_id", "team_id"):
+            try:
+                row[c] = _int(v)
+            except ValueError:
+                raise ValueError(f"{c} is not an integer: {v!r}")
+        elif c in ("is_keeper", "is_captain"):
+            row[c] = _bool(v)
+        else:
+            row[c] = str(v).strip()
+    if row["player_id"] is None or row["player_id"] <= 0:
+        raise ValueError("player_id is required")
+    if not row["full_name"]:
+        raise ValueError("full_name is required")
+    if row["team_id"] is not None and row["team_id"] not in team_ids:
+        raise ValueError(f"unknown team_id {row['team_id']}")
+    return tuple(row[c] for c in COLUMNS)
+
+
+# ---------------- Import ----------------
+class ImportResult:
+    def __init__(self, max_samples=100):
+        self.read = 0
+        self.loaded = 0
+        self.rejected = 0
+        self.samples = []       # first rejects: (line, reason, record)
+        self.max_samples = max_samples
+
+    def reject(self, line, reason, record, writer=None):
+        self.rejected += 1
+        if len(self.samples) < self.max_samples:
+            self.samples.append((line, reason, record))
+        if writer:
+            writer.writerow({"line": line, "reason": reason, **{c: record.get(c) for c in COLUMNS}})
+
+    def __repr__(self):
+        return f"read={self.read} loaded={self.loaded} rejected={self.rejected}"
+
+def _load_batch(conn, batch, result, reject_writer):
+    """Write [(line, record, row)] in one transaction; returns rows loaded
+
+    When Postgres refuses the batch (FK, check constraint, ...) it is retried
+    row by row, each under a savepoint, and the rows at fault are rejected.
+    """
+    with conn.cursor() as cur:
+        try:
+            with BulkWriter(cur, [PLAYERS_MERGE], batch_size=len(batch) + 1) as writer:
+                for _, _, row in batch:
+                    writer.add("players", row)
+            bump_table_versions(cur, "players")
+            conn.commit()
+            return writer.counts["players"]
+        except psycopg2.Error:
+            conn.rollback()
+
+        loaded = 0
+        for line, record, row in batch:
+            cur.execute("SAVEPOINT player_row")
+            try:
+                cur.execute(PLAYERS_MERGE.row_sql(), row)
+            except psycopg2.Error as e:
+                cur.execute("ROLLBACK TO SAVEPOINT player_row")
+                result.reject(line, (e.pgerror or str(e)).strip(), record, reject_writer)
+            else:
+                cur.execute("RELEASE SAVEPOINT player_row")
+                loaded += 1
+        if loaded:
+            bump_table_versions(cur, "players")
+        conn.commit()
+        return loaded
+
+def import_players(f, fmt="csv", rejects=None, batch_size=BULK_BATCH):
+    """Merge a roster into players; `rejects` (text file) receives every skipped row as CSV"""
+    records = iter_csv(f) if fmt == "csv" else iter_parquet(f, batch_size)
+    result = ImportResult()
+    reject_writer = None
+    if rejects is not None:
+        reject_writer = csv.DictWriter(rejects, ["line", "reason", *COLUMNS], extrasaction="ignore")
+        reject_writer.writeheader()
+
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            ensure_tables(cur, "teams", "players")
+            cur.execute("SELECT team_id FROM teams")
+            team_ids = {r[0] for r in cur.fetchall()}
+        conn.commit()
+
+        batch = []
+        for line, record in records:
+            result.read += 1
+            try:
+                batch.append((line, record, clean_row(record, team_ids)))
+            except ValueError as e:
+                result.reject(line, str(e), record, reject_writer)
+            if len(batch) >= batch_size:
+                result.loaded += _load_batch(conn, batch, result, reject_writer)
+                batch = []
+        if batch:
+            result.loaded += _load_batch(conn, batch, result, reject_writer)
+    return result
+
+
+# ---------------- Export ----------------
+def export_csv(out):
+    """Stream the players table as CSV into a binary or text file object"""
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.copy_expert(f"COPY ({EXPORT_SQL}) TO STDOUT WITH (FORMAT csv, HEADER)", out)
+
+def export_schema(pa):
+    text, big = pa.string(), pa.int64()
+    return pa.schema([
+        ("player_id", big), ("full_name", text), ("nick_name", text), ("role", text),
+        ("batting_style", text), ("bowling_style", text), ("is_keeper", pa.bool_()),
+        ("is_captain", pa.bool_()), ("team_id", big), ("team_name", text), ("country", text),
+        ("created_at", pa.timestamp("us")),
+    ])
+
+def export_parquet(out, batch_size=BULK_BATCH):
+    """Stream the players table into a Parquet file through a server-side cursor"""
+    pa = _pyarrow()
+    schema = export_schema(pa)
+    with get_conn() as conn, conn.cursor(name="players_export") as cur:
+        cur.itersize = batch_size
+        cur.execute(EXPORT_SQL)
+        with pa.parquet.ParquetWriter(out, schema) as writer:
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                writer.write_table(pa.Table.from_pylist([dict(zip(schema.names, r)) for r in rows], schema=schema))
+
+def export_players(out, fmt="csv"):
+    return export_csv(out) if fmt == "csv" else export_parquet(out)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import / export of the players table")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("path", help="CSV or Parquet file")
+    parser.add_argument("--rejects", help="with import: write skipped rows here as CSV")
+    parser.add_argument("--batch-size", type=int, default=BULK_BATCH)
+    args = parser.parse_args()
+
+    fmt = file_format(args.path)
+    if args.action == "import":
+        rejects = open(args.rejects, "w", newline="", encoding="utf-8") if args.rejects else None
+        try:
+            with open(args.path, "rb") as f:
+                result = import_players(f, fmt, rejects, args.batch_size)
+        finally:
+            if rejects:
+                rejects.close()
+        print(f"✅ Players import: {result}")
+        for line, reason, _ in result.samples[:10]:
+            print(f"   ⚠️ line {line}: {reason}")
+    else:
+        with open(args.path, "wb") as out:
+            export_players(out, fmt)
+        print(f"✅ Players exported to {args.path}")
@@ -0,0 +1,228 @@
+"""
+Player profile bundle: details, batting and bowling stats for one player.
+
+Selecting a player on Top Stats starts all three fetches at once on a shared
+worker pool; the page only waits for the part it is showing. Parsed results
+are kept in `player_profile_cache` (JSONB) with a per-part refresh age, so a
+repeat lookup of a popular player is served from Postgres without touching
+the network. When a refresh fails the stored copy is used regardless of age.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from utils.api_utils import get_client
+from utils.db_connection import get_conn
+
+PROFILE_WORKERS = int(os.getenv("PROFILE_WORKERS", "6"))
+PROFILE_DETAILS_MAX_AGE = float(os.getenv("PROFILE_DETAILS_MAX_AGE", "168"))   # hours before details are refetched
+PROFILE_STATS_MAX_AGE = float(os.getenv("PROFILE_STATS_MAX_AGE", "24"))        # hours before stats tables are refetched
+PROFILE_BUNDLES = int(os.getenv("PROFILE_BUNDLES", "256"))                     # bundles kept in memory
+PROFILE_RETRY = float(os.getenv("PROFILE_RETRY", "60"))                         # seconds before a failed part is retried
+
+PROFILE_DDL = """
+    CREATE TABLE IF NOT EXISTS player_profile_cache (
+        player_id   BIGINT NOT NULL,
+        part        TEXT NOT NULL,
+        payload     JSONB NOT NULL,
+        fetched_at  TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (player_id, part)
+    );
+"""
+
+# part → (max age in hours, columns dropped from the stats table)
+PARTS = {
+    "details": (PROFILE_DETAILS_MAX_AGE, None),
+    "batting": (PROFILE_STATS_MAX_AGE, ["400"]),
+    "bowling": (PROFILE_STATS_MAX_AGE, ["10w"]),
+}
+
+
+# ---------------- Parsing ----------------
+def parse_stats_table(stats_json, drop_columns=None):
+    if not stats_json or "headers" not in stats_json or "values" not in stats_json:
+        return pd.DataFrame()
+    headers = stats_json["headers"]
+    rows = [row["values"] for row in stats_json["values"]]
+    df = pd.DataFrame(rows, columns=headers)
+    if drop_columns:
+        df = df.drop(columns=drop_columns, errors="ignore")
+    return df
+
+def frame_to_json(df):
+    return {"columns": [str(c) for c in df.columns], "rows": df.astype(object).where(df.notna(), None).values.tolist()}
+
+def frame_from_json(payload):
+    if not payload or not payload.get("columns"):
+        return pd.DataFrame()
+    return pd.DataFrame(payload.get("rows", []), columns=payload["columns"])
+
+
+# ---------------- Bundle ----------------
+class ProfileBundle:
+    """Futures for one player's parts; each resolves to a dict (details) or a DataFrame (stats)"""
+
+    def __init__(self, player_id, parts, stale=None):
+        self.player_id = player_id
+        self.created_at = time.monotonic()
+        self._parts = parts          # {part: Future}
+        self._stale = stale or {}    # {part: stored value} served when a refresh fails
+
+    def get(self, part, timeout=None):
+        try:
+            return self._parts[part].result(timeout)
+        except Exception as e:
+            print(f"⚠ Profile {part} for player {self.player_id} failed: {e}")
+            if part in self._stale:
+                return self._stale[part]
+            return {} if part == "details" else pd.DataFrame()
+
+    def details(self):
+        return self.get("details")
+
+    def batting(self):
+        return self.get("batting")
+
+    def bowling(self):
+        return self.get("bowling")
+
+    @property
+    def failed(self):
+        return any(f.done() and f.exception() for f in self._parts.values())
+
+def _resolved(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+class ProfileService:
+    def __init__(self, client=None, workers=PROFILE_WORKERS, max_bundles=PROFILE_BUNDLES):
+        self.client = client or get_client()
+        self.max_bundles = max_bundles
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="profile")
+        self._bundles = OrderedDict()   # player_id -> ProfileBundle, most recent last
+        self._lock = threading.Lock()
+        self._table_ready = False
+        self.stats = {"memory": 0, "stored": 0, "fetched": 0, "failed": 0}
+
+    # ---- storage ----
+    def _ensure_table(self, cur):
+        if not self._table_ready:
+            cur.execute(PROFILE_DDL)
+            self._table_ready = True
+
+    def load_stored(self, player_id):
+        """{part: (value, age_hours)} from player_profile_cache"""
+        try:
+            with get_conn() as conn:
+                cur = conn.cursor()
+                self._ensure_table(cur)
+                cur.execute("""
+                    SELECT part, payload, EXTRACT(EPOCH FROM CURRENT_TIMESTAMP - fetched_at) / 3600
+                    FROM player_profile_cache WHERE player_id = %s
+                """, (int(player_id),))
+                rows = cur.fetchall()
+        except Exception as e:
+            print(f"⚠ Profile cache unavailable: {e}")
+            return {}
+        stored = {}
+        for part, payload, age in rows:
+            if part not in PARTS:
+                continue
+            if isinstance(payload, str):
+                payload = json.loads(payload)
+            stored[part] = (payload if part == "details" else frame_from_json(payload), float(age))
+        return stored
+
+    def store(self, player_id, part, value):
+        payload = value if part == "details" else frame_to_json(value)
+        try:
+            with get_conn() as conn:
+                cur = conn.cursor()
+                self._ensure_table(cur)
+                cur.execute("""
+                    INSERT INTO player_profile_cache (player_id, part, payload, fetched_at)
+                    VALUES (%s, %s, %s::jsonb, CURRENT_TIMESTAMP)
+                    ON CONFLICT (player_id, part) DO UPDATE
+                      SET payload = EXCLUDED.payload, fetched_at = EXCLUDED.fetched_at
+                """, (int(player_id), part, json.dumps(payload, default=str)))
+        except Exception as e:
+            print(f"⚠ Could not store {part} for player {player_id}: {e}")
+
+    # ---- network ----
+    def fetch(self, player_id, part):
+        if part == "details":
+            value = self.client.get_player(player_id) or {}
+            ok = bool(value)
+        else:
+            raw = self.client.get_player_stats(player_id, part) or {}
+            value = parse_stats_table(raw, PARTS[part][1])
+            ok = "headers" in raw
+        if not ok:
+            raise ValueError("empty response")
+        self.store(player_id, part, value)
+        return value
+
+    def _fetch_counted(self, player_id, part):
+        try:
+            value = self.fetch(player_id, part)
+        except Exception:
+            with self._lock:
+                self.stats["failed"] += 1
+            raise
+        with self._lock:
+            self.stats["fetched"] += 1
+        return value
+
+    # ---- bundles ----
+    def bundle(self, player_id):
+        """Profile bundle for a player; missing or stale parts are fetched concurrently"""
+        pid = str(player_id)
+        with self._lock:
+            cached = self._bundles.get(pid)
+            keep = PROFILE_RETRY if cached and cached.failed else PROFILE_STATS_MAX_AGE * 3600
+            if cached and time.monotonic() - cached.created_at < keep:
+                self._bundles.move_to_end(pid)
+                self.stats["memory"] += 1
+                return cached
+
+        stored = self.load_stored(pid)
+        parts, stale = {}, {}
+        for part, (max_age, _) in PARTS.items():
+            value, age = stored.get(part, (None, None))
+            if value is not None and age < max_age:
+                parts[part] = _resolved(value)
+                with self._lock:
+                    self.stats["stored"] += 1
+            else:
+                if value is not None:
+                    stale[part] = value
+                parts[part] = self._pool.submit(self._fetch_counted, pid, part)
+        bundle = ProfileBundle(pid, parts, stale)
+
+        with self._lock:
+            self._bundles[pid] = bundle
+            self._bundles.move_to_end(pid)
+            while len(self._bundles) > self.max_bundles:
+                self._bundles.popitem(last=False)
+        return bundle
+
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_profile_service():
+    """Return the process-wide profile service"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ProfileService()
+    return _service
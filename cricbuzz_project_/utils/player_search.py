@@ -0,0 +1,176 @@
+"""
+In-process player search index.
+
+Built once per process from `players` (full name + nick_name alias) and
+`player_master_stats`, so typing a name on the Top Stats page no longer costs
+a RapidAPI call per rerun. Matching is accent-, case- and punctuation-
+insensitive: prefix matches on the full name or any word of it first, then
+trigram similarity for typos. Only an exact/prefix match or a near-identical
+spelling counts as found; anything weaker (a "Rohit" query landing on
+"Rohan") still goes to /stats/v1/player/search, and the API hits are added to
+the index for the next lookup.
+
+Results use the API's shape ({"player": [{"id", "name", "teamName", "dob"}]})
+so callers can swap one for the other.
+"""
+
+from bisect import bisect_left
+from collections import Counter
+import heapq
+import os
+import re
+import threading
+import unicodedata
+
+from utils.db_connection import get_conn
+
+SEARCH_LIMIT = int(os.getenv("PLAYER_SEARCH_LIMIT", "20"))
+TRIGRAM_THRESHOLD = float(os.getenv("PLAYER_SEARCH_TRIGRAM", "0.3"))   # min share of query trigrams for fuzzy hits
+TRIGRAM_CONFIDENT = float(os.getenv("PLAYER_SEARCH_CONFIDENT", "0.8"))  # fuzzy hits this close skip the API
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+# ---------------- Normalisation ----------------
+def normalize(text):
+    """'Zé  O'Brien-Smith' → 'ze obrien smith'"""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace("'", "").replace("’", "").replace(".", "")
+    return _NON_ALNUM.sub(" ", text).strip()
+
+def trigrams(norm):
+    """pg_trgm-style trigrams: each word padded with two leading and one trailing space"""
+    grams = set()
+    for word in norm.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+# ---------------- Index ----------------
+class PlayerIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._players = {}     # {player_id: {"id", "name", "teamName", "dob"}}
+        self._grams = {}       # {player_id: trigrams of every alias}
+        self._norm = {}        # {player_id: normalised display name}
+        self._keyset = set()   # {(normalised key, player_id)} — full names, aliases and their word suffixes
+        self._keys = []        # sorted copy of _keyset, rebuilt lazily after adds
+        self._postings = {}    # {trigram: {player_id}}
+
+    def __len__(self):
+        return len(self._players)
+
+    def add(self, player_id, name, team_name="", dob="", aliases=()):
+        """Add or extend one player; aliases (e.g. nick_name) are searchable too"""
+        if not player_id or not name:
+            return
+        pid = str(player_id)
+        with self._lock:
+            entry = self._players.setdefault(pid, {"id": pid, "name": name, "teamName": "", "dob": ""})
+            entry["teamName"] = entry["teamName"] or team_name or ""
+            entry["dob"] = entry["dob"] or dob or ""
+            self._norm[pid] = normalize(entry["name"])
+            grams = self._grams.setdefault(pid, set())
+            for alias in {name, *aliases}:
+                norm = normalize(alias)
+                if not norm:
+                    continue
+                words = norm.split()
+                self._keyset.update((" ".join(words[i:]), pid) for i in range(len(words)))
+                new = trigrams(norm) - grams
+                grams |= new
+                for g in new:
+                    self._postings.setdefault(g, set()).add(pid)
+
+    def _prefix(self, norm):
+        """{player_id: rank} for keys starting with norm (0 = exact, 1 = name prefix, 2 = word prefix)"""
+        if len(self._keys) != len(self._keyset):
+            self._keys = sorted(self._keyset)
+        hits = {}
+        pos = bisect_left(self._keys, (norm, ""))
+        while pos < len(self._keys) and self._keys[pos][0].startswith(norm):
+            key, pid = self._keys[pos]
+            rank = 0 if key == norm else 1 if self._norm[pid].startswith(key) else 2
+            hits[pid] = min(rank, hits.get(pid, rank))
+            pos += 1
+        return hits
+
+    def search(self, query, limit=SEARCH_LIMIT):
+        """Best matches first; [] when nothing is close enough"""
+        return self.lookup(query, limit)[0]
+
+    def lookup(self, query, limit=SEARCH_LIMIT):
+        """(matches, found): found is False when only loose trigram matches came back"""
+        norm = normalize(query)
+        if not norm:
+            return [], False
+        with self._lock:
+            ranked = self._prefix(norm)
+            if len(ranked) < limit:
+                grams = trigrams(norm)
+                shared = Counter()
+                for g in grams:
+                    shared.update(self._postings.get(g, ()))
+                for pid, n in shared.items():
+                    score = n / len(grams)      # share of the query's trigrams found in the name
+                    if pid not in ranked and score >= TRIGRAM_THRESHOLD:
+                        ranked[pid] = 3 + (1 - score)
+            best = heapq.nsmallest(limit, ranked, key=lambda pid: (ranked[pid], self._players[pid]["name"]))
+            found = bool(best) and ranked[best[0]] <= 3 + (1 - TRIGRAM_CONFIDENT)
+            return [dict(self._players[pid]) for pid in best], found
+
+    def load(self, conn):
+        """Index every player known to the database"""
+        cur = conn.cursor()
+        cur.execute("SELECT to_regclass('players'), to_regclass('player_master_stats'), to_regclass('teams')")
+        has_players, has_stats, has_teams = cur.fetchone()
+        if has_players:
+            team = "t.team_name" if has_teams else "NULL"
+            join = "LEFT JOIN teams t ON t.team_id = p.team_id" if has_teams else ""
+            cur.execute(f"SELECT p.player_id, p.full_name, p.nick_name, {team} FROM players p {join}")
+            for pid, full_name, nick_name, team_name in cur.fetchall():
+                self.add(pid, full_name or nick_name, team_name, aliases=[nick_name] if nick_name else ())
+        if has_stats:
+            cur.execute("SELECT DISTINCT player_id, player_name, team_name FROM player_master_stats")
+            for pid, name, team_name in cur.fetchall():
+                self.add(pid, name, team_name)
+        return self
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_index():
+    """Return the process-wide index, loaded from Postgres on first use"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                index = PlayerIndex()
+                try:
+                    with get_conn() as conn:
+                        index.load(conn)
+                    print(f"✅ Player search index: {len(index)} players")
+                except Exception as e:
+                    print(f"⚠ Player search index starts empty: {e}")
+                _index = index
+    return _index
+
+
+# ---------------- Search ----------------
+def search_players(query, client=None, limit=SEARCH_LIMIT):
+    """Local index first; the API when the index has no confident match (hits are indexed for next time)"""
+    index = get_index()
+    hits, found = index.lookup(query, limit)
+    if found or client is None:
+        return {"player": hits}
+    try:
+        data = client.search_players(query) or {}
+    except Exception as e:
+        print(f"⚠ Player search failed for '{query}': {e}")
+        return {"player": hits}
+    for p in data.get("player", []) or []:
+        index.add(p.get("id"), p.get("name"), p.get("teamName"), p.get("dob"))
+    return {"player": index.search(query, limit) or data.get("player", [])}
@@ -0,0 +1,211 @@
+"""
+TTL + LRU result cache for analytics queries, invalidated per table.
+
+Every cached result remembers the version of each table its SQL reads from.
+Writers bump those versions in the `table_versions` table (same transaction
+as the write), so a stale entry is dropped on the next lookup even when the
+write happened in another process such as an ingestion job.
+"""
+
+from collections import OrderedDict
+import hashlib
+import re
+import threading
+import time
+import os
+
+from utils.db_connection import get_conn
+
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", "600"))                  # seconds
+QUERY_CACHE_MAX_MB = float(os.getenv("QUERY_CACHE_MAX_MB", "128"))
+QUERY_CACHE_VERSION_SYNC = float(os.getenv("QUERY_CACHE_VERSION_SYNC", "5"))  # seconds between DB version reads
+
+TABLE_VERSIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        table_name  TEXT PRIMARY KEY,
+        version     BIGINT NOT NULL DEFAULT 0,
+        updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+_TABLE_RX = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_][A-Za-z0-9_]*)", re.I)
+
+# ---------------- Helpers ----------------
+def tables_in(query):
+    """Table names referenced after FROM / JOIN in a SQL string"""
+    return frozenset(t.lower() for t in _TABLE_RX.findall(query or ""))
+
+def _cache_key(query, params):
+    raw = f"{' '.join((query or '').split())}|{params!r}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def _sizeof(result):
+    try:
+        return int(result.memory_usage(index=True, deep=True).sum())
+    except Exception:
+        return len(repr(result))
+
+def bump_table_versions(cur, *tables):
+    """Bump versions inside the caller's transaction; returns {table: new_version}"""
+    cur.execute(TABLE_VERSIONS_DDL)
+    bumped = {}
+    for t in sorted({t.lower() for t in tables}):
+        cur.execute("""
+            INSERT INTO table_versions (table_name, version) VALUES (%s, 1)
+            ON CONFLICT (table_name) DO UPDATE
+              SET version = table_versions.version + 1, updated_at = CURRENT_TIMESTAMP
+            RETURNING version
+        """, (t,))
+        bumped[t] = cur.fetchone()[0]
+    return bumped
+
+# ---------------- Cache ----------------
+class QueryCache:
+    """Results keyed by (query, params) with TTL, byte-bounded LRU and table versions"""
+
+    def __init__(self, ttl=QUERY_CACHE_TTL, max_bytes=int(QUERY_CACHE_MAX_MB * 1024 * 1024),
+                 version_sync=QUERY_CACHE_VERSION_SYNC):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.version_sync = version_sync
+        self._entries = OrderedDict()   # key -> (result, expires_at, {table: version}, size)
+        self._bytes = 0
+        self._versions = {}
+        self._synced_at = 0.0
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "invalidated": 0, "evicted": 0}
+
+    # ---- versions ----
+    def _sync_versions(self, force=False):
+        if not force and time.monotonic() - self._synced_at < self.version_sync:
+            return
+        self._synced_at = time.monotonic()
+        try:
+            with get_conn() as conn, conn.cursor() as cur:
+                cur.execute("SELECT to_regclass('table_versions') IS NOT NULL")
+                if not cur.fetchone()[0]:
+                    return
+                cur.execute("SELECT table_name, version FROM table_versions")
+                rows = cur.fetchall()
+        except Exception as e:
+            print(f"⚠️ Could not sync table versions: {e}")
+            return
+        with self._lock:
+            for name, version in rows:
+                if version > self._versions.get(name, 0):
+                    self._versions[name] = version
+
+    def _current(self, tables):
+        return {t: self._versions.get(t, 0) for t in tables}
+
+    def invalidate(self, *tables):
+        """Bump table versions in Postgres and locally, dropping dependent entries"""
+        try:
+            with get_conn() as conn, conn.cursor() as cur:
+                bumped = bump_table_versions(cur, *tables)
+        except Exception as e:
+            print(f"⚠️ Could not bump table versions: {e}")
+            bumped = {t.lower(): self._versions.get(t.lower(), 0) + 1 for t in tables}
+        with self._lock:
+            for t, v in bumped.items():
+                self._versions[t] = max(v, self._versions.get(t, 0) + 1)
+            stale = [k for k, (_, _, deps, _) in self._entries.items() if set(deps) & set(bumped)]
+            for k in stale:
+                self._drop(k)
+                self._stats["invalidated"] += 1
+
+    # ---- entries ----
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry[3]
+
+    def _store(self, key, result, tables):
+        size = _sizeof(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (result, time.monotonic() + self.ttl, self._current(tables), size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+                self._stats["evicted"] += 1
+
+    def get(self, query, params=None):
+        """Cached result or None"""
+        key = _cache_key(query, params)
+        self._sync_versions()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            result, expires_at, deps, _ = entry
+            if time.monotonic() >= expires_at:
+                self._drop(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            if deps != self._current(deps):
+                self._drop(key)
+                self._stats["invalidated"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return result
+
+    def get_or_run(self, query, params, runner):
+        """Return cached result or call runner(query, params) and cache it"""
+        cached = self.get(query, params)
+        if cached is not None:
+            return cached
+        tables = tables_in(query)
+        with self._lock:
+            versions_before = self._current(tables)
+        result = runner(query, params)
+        # skip caching if a write landed while the query was running
+        if result is not None and versions_before == self._current(tables):
+            self._store(_cache_key(query, params), result, tables)
+        return result
+
+    def versions(self, query):
+        """{table: version} of the tables `query` reads; take it before running the query"""
+        tables = tables_in(query)
+        self._sync_versions()
+        with self._lock:
+            return self._current(tables)
+
+    def put(self, query, params, result, versions_before):
+        """Cache a result produced elsewhere (e.g. a streamed query that finished)
+
+        `versions_before` comes from versions() at the start of the run; as in
+        get_or_run, nothing is cached when a write landed since.
+        """
+        tables = tables_in(query)
+        self._sync_versions()
+        with self._lock:
+            if versions_before != self._current(tables):
+                return False
+        self._store(_cache_key(query, params), result, tables)
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            snap = dict(self._stats)
+            snap.update({"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes})
+            return snap
+
+
+# Process-wide cache shared by every Streamlit session
+query_cache = QueryCache()
+
+def invalidate_tables(*tables):
+    """Drop cached results that read from any of `tables`"""
+    query_cache.invalidate(*tables)
@@ -0,0 +1,151 @@
+"""
+Background, streaming execution for analytics queries.
+
+A QueryJob runs one SELECT on its own thread through a named (server-side)
+cursor and fetches it in chunks, so the first rows are on screen while the
+rest are still coming and memory is bounded by the row limit rather than
+the result size. Each job runs under a `statement_timeout`, can be cancelled
+from another thread (conn.cancel()), and reports rows/sec as it goes.
+
+    job = QueryJob(sql).start()
+    job.frame()      # rows fetched so far
+    job.cancel()
+"""
+
+import itertools
+import os
+import threading
+import time
+
+import pandas as pd
+from psycopg2 import errors
+
+from utils.db_connection import get_conn
+
+QUERY_TIMEOUT_MS = int(os.getenv("QUERY_TIMEOUT_MS", "30000"))     # per-query statement_timeout
+QUERY_ROW_LIMIT = int(os.getenv("QUERY_ROW_LIMIT", "100000"))      # rows kept per result
+QUERY_CHUNK_ROWS = int(os.getenv("QUERY_CHUNK_ROWS", "2000"))      # rows per fetch round trip
+
+# job states
+RUNNING, DONE, TRUNCATED, CANCELLED, TIMEOUT, FAILED = (
+    "running", "done", "truncated", "cancelled", "timeout", "failed",
+)
+FINISHED = {DONE, TRUNCATED, CANCELLED, TIMEOUT, FAILED}
+
+_job_ids = itertools.count(1)
+
+
+class QueryJob:
+    def __init__(self, sql, params=None, limit=QUERY_ROW_LIMIT, timeout_ms=QUERY_TIMEOUT_MS,
+                 chunk_rows=QUERY_CHUNK_ROWS):
+        self.id = next(_job_ids)
+        self.sql = sql.strip().rstrip(";")
+        self.params = params
+        self.limit = limit
+        self.timeout_ms = timeout_ms
+        self.chunk_rows = chunk_rows
+        self.status = RUNNING
+        self.error = None
+        self.columns = []
+        self.started_at = None
+        self.first_row_at = None
+        self.finished_at = None
+        self._rows = []
+        self._lock = threading.Lock()
+        self._conn = None
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    # ---- control ----
+    def start(self):
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=f"query-{self.id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop the query server-side; the job ends as CANCELLED"""
+        self._cancelled.set()
+        with self._lock:
+            conn = self._conn
+        if conn is not None and self.status == RUNNING:
+            try:
+                conn.cancel()
+            except Exception as e:
+                print(f"⚠️ Could not cancel query {self.id}: {e}")
+
+    def wait(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+        return self.status
+
+    # ---- progress ----
+    @property
+    def done(self):
+        return self.status in FINISHED
+
+    @property
+    def row_count(self):
+        with self._lock:
+            return len(self._rows)
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def rows_per_sec(self):
+        return self.row_count / self.elapsed if self.elapsed > 0 else 0.0
+
+    def frame(self, max_rows=None):
+        """DataFrame of the rows fetched so far (first `max_rows` only, if given)"""
+        with self._lock:
+            rows = self._rows[:max_rows] if max_rows else list(self._rows)
+            columns = list(self.columns)
+        return pd.DataFrame(rows, columns=columns or None)
+
+    # ---- worker ----
+    def _run(self):
+        try:
+            with get_conn() as conn:
+                with self._lock:
+                    self._conn = conn
+                if self._cancelled.is_set():
+                    raise errors.QueryCanceled("cancelled before start")
+                with conn.cursor() as cur:
+                    cur.execute("SET LOCAL statement_timeout = %s", (int(self.timeout_ms),))
+                with conn.cursor(name=f"query_job_{self.id}") as cur:
+                    cur.itersize = self.chunk_rows
+                    cur.execute(self.sql, self.params)
+                    status = DONE
+                    while True:
+                        want = min(self.chunk_rows, self.limit - self.row_count + 1)
+                        chunk = cur.fetchmany(want)
+                        if not chunk:
+                            break
+                        with self._lock:
+                            if not self.columns:
+                                self.columns = [d[0] for d in cur.description]
+                                self.first_row_at = time.monotonic()
+                            room = self.limit - len(self._rows)
+                            self._rows.extend(chunk[:room])
+                        if len(chunk) > room:
+                            status = TRUNCATED
+                            break
+                        if self._cancelled.is_set():
+                            raise errors.QueryCanceled("cancelled")
+                    if not self.columns and cur.description:
+                        self.columns = [d[0] for d in cur.description]
+            self.status = status
+        except errors.QueryCanceled as e:
+            self.status = CANCELLED if self._cancelled.is_set() else TIMEOUT
+            self.error = str(e).strip()
+        except Exception as e:
+            self.status = FAILED
+            self.error = str(e).strip()
+        finally:
+            self.finished_at = time.monotonic()
+            with self._lock:
+                self._conn = None
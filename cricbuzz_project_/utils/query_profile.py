@@ -0,0 +1,164 @@
+"""
+Profiling history for the SQL Analytics questions.
+
+`profile()` runs `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)` for one QUERIES
+entry and records wall time, planner/executor time, rows and buffer counts in
+`query_profile_history`. Each run is compared with the rolling median of the
+question's previous runs of the same SQL (query_hash), so a question that
+slowed down after an ingestion run or a schema change stands out, and editing
+its SQL starts a fresh window.
+
+    python -m utils.query_profile              # profile every question once
+    python -m utils.query_profile Q14 Q19
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import statistics
+import time
+
+from utils.db_connection import get_conn
+from utils.explain_check import question_id, seq_scanned
+from utils.queries import QUERIES
+
+PROFILE_TIMEOUT_MS = int(os.getenv("PROFILE_TIMEOUT_MS", "120000"))
+PROFILE_WINDOW = int(os.getenv("PROFILE_WINDOW", "10"))                 # previous runs in the rolling median
+PROFILE_REGRESSION = float(os.getenv("PROFILE_REGRESSION", "1.5"))      # flag runs slower than median × this
+
+PROFILE_DDL = """
+    CREATE TABLE IF NOT EXISTS query_profile_history (
+        id              BIGSERIAL PRIMARY KEY,
+        question        TEXT NOT NULL,
+        query_hash      TEXT NOT NULL,
+        run_at          TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        wall_ms         DOUBLE PRECISION NOT NULL,
+        planning_ms     DOUBLE PRECISION,
+        execution_ms    DOUBLE PRECISION,
+        rows            BIGINT,
+        shared_hit      BIGINT,
+        shared_read     BIGINT,
+        temp_written    BIGINT,
+        seq_scans       TEXT[],
+        plan            JSONB
+    );
+    CREATE INDEX IF NOT EXISTS idx_query_profile_question
+        ON query_profile_history (question, run_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_query_profile_hash
+        ON query_profile_history (question, query_hash, run_at DESC);
+"""
+
+# ---------------- Helpers ----------------
+def query_hash(sql):
+    """Changes when the SQL text does, so history can be split by query version"""
+    return hashlib.sha1(" ".join(sql.split()).encode("utf-8")).hexdigest()[:12]
+
+def explain_analyze(cur, sql):
+    cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql.strip().rstrip(";"))
+    raw = cur.fetchone()[0]
+    doc = raw if isinstance(raw, list) else json.loads(raw)
+    return doc[0]
+
+def rolling_median(previous, window=PROFILE_WINDOW):
+    times = [r["wall_ms"] for r in previous[:window]]
+    return statistics.median(times) if times else None
+
+def is_regression(wall_ms, median, factor=PROFILE_REGRESSION):
+    return median is not None and wall_ms > median * factor
+
+# ---------------- Profile ----------------
+def profile(title, sql=None, timeout_ms=PROFILE_TIMEOUT_MS, window=PROFILE_WINDOW):
+    """EXPLAIN ANALYZE one question and record it; returns the run plus its regression verdict"""
+    sql = sql or QUERIES[title]
+    question = question_id(title)
+    with get_conn() as conn, conn.cursor() as cur:
+        cur.execute(PROFILE_DDL)
+        conn.commit()
+        previous = history(question, window, cur=cur, query_hash=query_hash(sql))
+
+        cur.execute("SET LOCAL statement_timeout = %s", (int(timeout_ms),))
+        start = time.perf_counter()
+        doc = explain_analyze(cur, sql)
+        wall_ms = (time.perf_counter() - start) * 1000
+        plan = doc["Plan"]
+        run = {
+            "question": question,
+            "query_hash": query_hash(sql),
+            "wall_ms": round(wall_ms, 2),
+            "planning_ms": doc.get("Planning Time"),
+            "execution_ms": doc.get("Execution Time"),
+            "rows": plan.get("Actual Rows"),
+            "shared_hit": plan.get("Shared Hit Blocks"),
+            "shared_read": plan.get("Shared Read Blocks"),
+            "temp_written": plan.get("Temp Written Blocks"),
+            "seq_scans": sorted({r for r in seq_scanned(plan) if r}),
+        }
+        cur.execute("""
+            INSERT INTO query_profile_history
+                (question, query_hash, wall_ms, planning_ms, execution_ms, rows,
+                 shared_hit, shared_read, temp_written, seq_scans, plan)
+            VALUES (%(question)s, %(query_hash)s, %(wall_ms)s, %(planning_ms)s, %(execution_ms)s, %(rows)s,
+                    %(shared_hit)s, %(shared_read)s, %(temp_written)s, %(seq_scans)s, %(plan)s::jsonb)
+            RETURNING run_at
+        """, {**run, "plan": json.dumps(doc)})
+        run["run_at"] = cur.fetchone()[0]
+
+    run["plan"] = doc
+    run["median_ms"] = rolling_median(previous, window)
+    run["regression"] = is_regression(run["wall_ms"], run["median_ms"])
+    return run
+
+def history(question, limit=50, cur=None, query_hash=None):
+    """Most recent runs of a question (only those of one SQL version with `query_hash`), newest first"""
+    sql = """
+        SELECT run_at, query_hash, wall_ms, planning_ms, execution_ms, rows,
+               shared_hit, shared_read, temp_written, seq_scans
+        FROM query_profile_history
+        WHERE question = %s AND (%s::TEXT IS NULL OR query_hash = %s)
+        ORDER BY run_at DESC
+        LIMIT %s
+    """
+    if cur is None:
+        with get_conn() as conn, conn.cursor() as c:
+            c.execute("SELECT to_regclass('query_profile_history')")
+            if c.fetchone()[0] is None:
+                return []
+            return history(question, limit, c, query_hash)
+    cur.execute(sql, (question_id(question), query_hash, query_hash, limit))
+    names = [d[0] for d in cur.description]
+    return [dict(zip(names, r)) for r in cur.fetchall()]
+
+def with_trend(runs, window=PROFILE_WINDOW):
+    """Oldest-first runs, each with the rolling median of the earlier runs of the same SQL and a regression flag"""
+    runs = list(reversed(runs))
+    for i, r in enumerate(runs):
+        same = [p for p in runs[:i] if p["query_hash"] == r["query_hash"]]
+        median = rolling_median(list(reversed(same[-window:])), window)
+        r["median_ms"] = median
+        r["regression"] = is_regression(r["wall_ms"], median)
+    return runs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN ANALYZE the analytics questions and record timings")
+    parser.add_argument("questions", nargs="*", help="question ids (e.g. Q14); default: all")
+    args = parser.parse_args()
+
+    wanted = {q.upper() for q in args.questions}
+    regressions = 0
+    for title in QUERIES:
+        if wanted and question_id(title) not in wanted:
+            continue
+        try:
+            run = profile(title)
+        except Exception as e:
+            print(f"❌ {question_id(title)}: {e}")
+            continue
+        median = f"{run['median_ms']:.1f}" if run["median_ms"] is not None else "—"
+        mark = "⚠️ regression" if run["regression"] else "✅"
+        regressions += run["regression"]
+        print(f"{mark} {run['question']:<4} {run['wall_ms']:>9.1f} ms  (median {median})  "
+              f"rows={run['rows']} hit={run['shared_hit']} read={run['shared_read']}")
+    if regressions:
+        print(f"⚠️ {regressions} question(s) slower than {PROFILE_REGRESSION}× their rolling median")
@@ -0,0 +1,106 @@
+"""
+Process-wide token bucket for the Cricbuzz (RapidAPI) plan.
+
+Every request takes a token before it is sent. Tokens refill at API_RPS per
+second up to API_BURST, so concurrent workers together run at the plan's rate
+instead of each sleeping a fixed amount. A 429 pauses the whole bucket for
+the server's Retry-After (or an exponential backoff with jitter when the
+header is missing) and drains the burst, so every worker backs off together.
+"""
+
+import os
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+API_RPS = float(os.getenv("API_RPS", "5"))              # sustained requests/second allowed by the plan (0 = unlimited)
+API_BURST = int(os.getenv("API_BURST", "10"))           # requests that may go out back-to-back
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "4"))     # 429 retries per request
+API_BACKOFF_BASE = float(os.getenv("API_BACKOFF_BASE", "1"))  # first backoff without Retry-After (seconds)
+API_BACKOFF_MAX = float(os.getenv("API_BACKOFF_MAX", "60"))
+
+
+class TokenBucket:
+    def __init__(self, rate=API_RPS, burst=API_BURST):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until one request may be sent"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        self.acquired += 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+                self.waited += wait
+            time.sleep(wait)
+
+    def penalize(self, delay):
+        """Hold every caller for `delay` seconds and drain the burst (after a 429)"""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + delay)
+            self._tokens = 0.0
+            self._updated = max(now, self._paused_until)
+            self.throttled += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "burst": self.capacity,
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "waited_s": round(self.waited, 2),
+            }
+
+
+def retry_after(response, attempt):
+    """Seconds to back off after a 429: Retry-After (seconds or HTTP date), else exponential with jitter"""
+    header = response.headers.get("Retry-After")
+    if header:
+        try:
+            return min(max(float(header), 0.0), API_BACKOFF_MAX)
+        except ValueError:
+            try:
+                delta = (parsedate_to_datetime(header) - datetime.now(timezone.utc)).total_seconds()
+                return min(max(delta, 0.0), API_BACKOFF_MAX)
+            except (TypeError, ValueError):
+                pass
+    backoff = min(API_BACKOFF_BASE * 2 ** attempt, API_BACKOFF_MAX)
+    return backoff * random.uniform(0.5, 1.0)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_limiter():
+    """Return the process-wide token bucket"""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = TokenBucket()
+    return _limiter
@@ -0,0 +1,702 @@
+"""
+Seeded synthetic data for load testing.
+
+Generates teams, players, venues, series, matches and full scorecards
+(innings, batting, bowling, fielding, partnerships), then player_master_stats
+and player_rankings_history derived from them, so every analytics question
+has realistic data at any scale:
+
+  - per-format shapes: T20I/ODI innings within 20/50 overs, Tests with up to
+    four innings and draws; run rates, strike rates and boundary counts
+    follow the format
+  - skewed popularity: within each squad player selection follows a Zipf-like
+    weight, so a few stars play most matches (and bat higher, bowl more)
+  - consistent keys: every scorecard row points at a generated match and
+    player, master stats are the sums of the generated scorecards
+
+Matches are generated a chunk at a time and each chunk is streamed into
+Postgres with COPY, so memory stays flat however many matches are asked for.
+The same --seed and --end always produce the same data.
+
+    python -m utils.synthetic_data --matches 50000 --players 2000 --seed 7 --end 2025-06-30
+    python -m utils.synthetic_data --matches 500000 --reset
+
+Without --reset ids start after the current maximum of each table and
+existing teams are reused by name. --reset empties the generated tables first.
+"""
+
+import argparse
+import io
+import math
+import os
+import random
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from utils.db_connection import get_conn
+from utils.query_cache import bump_table_versions
+from ingestion.partitions import ensure_seasons
+from ingestion.player_stats import STAT_COLUMNS
+from ingestion.schema import ensure_tables
+
+SYNTH_CHUNK = int(os.getenv("SYNTH_CHUNK", "1000"))        # matches per COPY round
+SYNTH_ZIPF = float(os.getenv("SYNTH_ZIPF", "1.1"))         # popularity skew inside a squad
+
+TABLES = (
+    "series", "venues", "matches", "teams", "players",
+    "match_innings", "batting_scorecard", "bowling_scorecard", "fielding_scorecard",
+    "partnerships", "player_master_stats", "player_rankings_history",
+)
+
+COLUMNS = {
+    "teams": ["team_id", "team_name", "team_sname", "country"],
+    "players": ["player_id", "full_name", "nick_name", "role", "batting_style", "bowling_style",
+                "is_keeper", "is_captain", "team_id"],
+    "venues": ["venue_id", "ground", "city", "country", "capacity", "established"],
+    "series": ["series_id", "series_name", "series_type", "start_date", "end_date",
+               "host_country", "match_format", "total_matches"],
+    "matches": ["match_id", "series_id", "match_desc", "match_format", "match_type",
+                "start_date", "end_date", "state", "status",
+                "team1_id", "team1_name", "team2_id", "team2_name",
+                "venue_id", "venue_name", "venue_city", "venue_country",
+                "toss_winner_id", "toss_decision", "winner_team_id", "winner_team_name",
+                "win_by_runs", "win_by_wickets", "win_by_innings"],
+    "match_innings": ["match_id", "match_start_date", "innings_id", "innings_number", "batting_team", "bowling_team",
+                      "batting_team_id", "bowling_team_id", "runs", "wickets", "overs"],
+    "batting_scorecard": ["match_id", "match_start_date", "innings_id", "player_id", "player_name", "team_name",
+                          "runs", "balls_faced", "fours", "sixes", "strike_rate",
+                          "batting_position", "dismissal", "is_not_out"],
+    "bowling_scorecard": ["match_id", "match_start_date", "innings_id", "player_id", "player_name", "team_name",
+                          "overs", "maidens", "runs_conceded", "wickets", "economy_rate"],
+    "fielding_scorecard": ["match_id", "match_start_date", "innings_id", "player_id", "player_name", "team_name",
+                           "catches", "stumpings", "runouts"],
+    "partnerships": ["match_id", "match_format", "team1_name", "team2_name", "innings_number",
+                     "batsman1", "batsman2", "runs", "balls", "wicket_number"],
+    "player_master_stats": ["player_id", "format", "player_name", "team_name", "role",
+                            "batting_style", "bowling_style", *STAT_COLUMNS,
+                            "icc_bat_best_rank", "icc_bowl_best_rank", "icc_allround_best_rank", "created_at"],
+    "player_rankings_history": ["player_id", "player_name", "country", "format", "category",
+                                "ranking_position", "rating_points", "ranking_date"],
+}
+
+TEAMS = [
+    ("India", "IND"), ("Australia", "AUS"), ("England", "ENG"), ("South Africa", "RSA"),
+    ("New Zealand", "NZ"), ("Pakistan", "PAK"), ("Sri Lanka", "SL"), ("West Indies", "WI"),
+    ("Bangladesh", "BAN"), ("Afghanistan", "AFG"), ("Zimbabwe", "ZIM"), ("Ireland", "IRE"),
+    ("Netherlands", "NED"), ("Scotland", "SCO"), ("Nepal", "NEP"), ("United Arab Emirates", "UAE"),
+]
+
+FIRST_NAMES = [
+    "Aarav", "Rohan", "Virat", "Arjun", "Shubman", "Rahul", "Ishan", "Kuldeep", "Jasprit", "Hardik",
+    "Steve", "David", "Pat", "Mitchell", "Travis", "Glenn", "Marnus", "Josh", "Cameron", "Adam",
+    "Joe", "Ben", "Jos", "Harry", "Jonny", "Mark", "Chris", "Zak", "Ollie", "Liam",
+    "Quinton", "Kagiso", "Temba", "Aiden", "Heinrich", "Anrich", "Keshav", "Tabraiz", "Dean", "Rassie",
+    "Kane", "Trent", "Devon", "Tom", "Daryl", "Matt", "Tim", "Rachin", "Ish", "Lockie",
+    "Babar", "Shaheen", "Mohammad", "Fakhar", "Shadab", "Naseem", "Imam", "Saud", "Abrar", "Haris",
+    "Kusal", "Wanindu", "Dasun", "Charith", "Pathum", "Dhananjaya", "Maheesh", "Dushmantha", "Angelo", "Dinesh",
+    "Shai", "Nicholas", "Jason", "Alzarri", "Shimron", "Kyle", "Rovman", "Akeal", "Brandon", "Roston",
+    "Shakib", "Mushfiqur", "Litton", "Taskin", "Mehidy", "Najmul", "Towhid", "Mustafizur", "Rashid", "Ibrahim",
+]
+
+LAST_NAMES = [
+    "Sharma", "Kohli", "Gill", "Iyer", "Pant", "Jadeja", "Yadav", "Bumrah", "Pandya", "Kishan",
+    "Smith", "Warner", "Cummins", "Starc", "Head", "Maxwell", "Labuschagne", "Hazlewood", "Green", "Zampa",
+    "Root", "Stokes", "Buttler", "Brook", "Bairstow", "Wood", "Woakes", "Crawley", "Pope", "Livingstone",
+    "de Kock", "Rabada", "Bavuma", "Markram", "Klaasen", "Nortje", "Maharaj", "Shamsi", "Elgar", "van der Dussen",
+    "Williamson", "Boult", "Conway", "Latham", "Mitchell", "Henry", "Southee", "Ravindra", "Sodhi", "Ferguson",
+    "Azam", "Afridi", "Rizwan", "Zaman", "Khan", "Shah", "ul-Haq", "Shakeel", "Ahmed", "Rauf",
+    "Mendis", "Hasaranga", "Shanaka", "Asalanka", "Nissanka", "de Silva", "Theekshana", "Chameera", "Mathews", "Chandimal",
+    "Hope", "Pooran", "Holder", "Joseph", "Hetmyer", "Mayers", "Powell", "Hosein", "King", "Chase",
+    "Al Hasan", "Rahim", "Das", "Ahmed", "Miraz", "Hossain", "Hridoy", "Rahman", "Zadran", "Nabi",
+]
+
+CITIES = ["Capital", "Harbour", "Riverside", "Hillside", "Lakeside", "Northgate", "Southport", "Eastfield",
+          "Westbrook", "Old Town"]
+GROUNDS = ["Oval", "Stadium", "Cricket Ground", "Park", "International Stadium", "Sports Complex"]
+
+BAT_STYLES = ["Right-hand bat", "Left-hand bat"]
+BOWL_STYLES = ["Right-arm fast", "Right-arm fast-medium", "Left-arm fast-medium", "Right-arm offbreak",
+               "Right-arm legbreak", "Left-arm orthodox", "Left-arm wrist-spin"]
+
+# match shape per format:
+#   overs      max overs per innings (None → Test)
+#   rpo        mean run rate, sr mean batting strike rate, six_share sixes per boundary
+#   allout     chance an innings is bowled out, cap max overs per bowler
+#   days       match length, weight share of generated series
+FORMATS = {
+    "T20I": dict(overs=20, rpo=8.0, sr=130, six_share=0.30, allout=0.25, cap=4, days=1, weight=0.45,
+                 series_len=(3, 5), match_type="Twenty20", stats="T20I"),
+    "ODI": dict(overs=50, rpo=5.4, sr=85, six_share=0.15, allout=0.45, cap=10, days=1, weight=0.35,
+                series_len=(3, 5), match_type="One Day", stats="ODI"),
+    "TEST": dict(overs=None, rpo=3.3, sr=55, six_share=0.05, allout=0.80, cap=None, days=5, weight=0.20,
+                 series_len=(2, 5), match_type="International Test", stats="Test"),
+}
+RANKING_FORMATS = {"TEST": "Test", "ODI": "ODI", "T20I": "T20I"}
+RANKING_CATEGORIES = ("Batting", "Bowling", "All-rounder")
+
+# dismissal kind → weight (bowler-credited unless run out)
+DISMISSALS = [("caught", 0.58), ("bowled", 0.18), ("lbw", 0.13), ("run out", 0.07), ("stumped", 0.04)]
+
+
+# ---------------- COPY ----------------
+def _text_field(v):
+    if v is None:
+        return r"\N"
+    if isinstance(v, bool):
+        return "t" if v else "f"
+    if isinstance(v, (datetime, date)):
+        return v.isoformat()
+    s = str(v)
+    if "\\" in s or "\t" in s or "\n" in s or "\r" in s:
+        s = s.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return s
+
+def copy_rows(cur, table, rows):
+    """COPY a batch of tuples (COLUMNS order) into `table`; returns the row count"""
+    if not rows:
+        return 0
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(_text_field(v) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    cur.copy_expert(f"COPY {table} ({', '.join(COLUMNS[table])}) FROM STDIN", buf)
+    return len(rows)
+
+
+# ---------------- Helpers ----------------
+def zipf_weights(n, s=SYNTH_ZIPF):
+    return [1 / (rank + 1) ** s for rank in range(n)]
+
+def weighted_sample(rng, items, weights, k):
+    """k distinct items, heavier weights first more often (Efraimidis–Spirakis keys)"""
+    keyed = sorted(((rng.random() ** (1 / w), i) for i, w in enumerate(weights)), reverse=True)
+    return [items[i] for _, i in keyed[:k]]
+
+def overs_text(balls):
+    return float(f"{balls // 6}.{balls % 6}")
+
+def split_total(rng, total, weights, spread=True):
+    """Split an integer total into len(weights) non-negative parts, proportional to weights
+    (times an exponential draw each when `spread`, for lopsided splits like batting scores)"""
+    shares = [w * rng.expovariate(1.0) for w in weights] if spread else list(weights)
+    norm = sum(shares) or 1.0
+    parts = [int(total * s / norm) for s in shares]
+    for i in range(total - sum(parts)):
+        parts[i % len(parts)] += 1
+    return parts
+
+def ordinal(n):
+    return f"{n}{'th' if 10 <= n % 100 <= 20 else {1: 'st', 2: 'nd', 3: 'rd'}.get(n % 10, 'th')}"
+
+def next_id(cur, table, column):
+    cur.execute(f"SELECT COALESCE(MAX({column}), 0) + 1 FROM {table}")
+    return cur.fetchone()[0]
+
+
+# ---------------- Dimensions ----------------
+class Player:
+    __slots__ = ("id", "name", "role", "bat_style", "bowl_style", "keeper", "team", "bat", "bowl")
+
+    def __init__(self, pid, name, role, bat_style, bowl_style, keeper, team, bat, bowl):
+        self.id, self.name, self.role = pid, name, role
+        self.bat_style, self.bowl_style, self.keeper = bat_style, bowl_style, keeper
+        self.team, self.bat, self.bowl = team, bat, bowl
+
+
+class Team:
+    def __init__(self, team_id, name, sname):
+        self.id, self.name, self.sname, self.country = team_id, name, sname, name
+        self.squad = []         # most popular first
+        self.weights = []
+
+
+def make_squad(rng, team, size, next_pid):
+    """Squad in popularity order; skill falls with popularity rank"""
+    for rank in range(size):
+        star = 1 / (1 + rank / 6)
+        role = rng.choices(["Batsman", "Bowler", "Batting Allrounder", "Bowling Allrounder", "WK-Batsman"],
+                           [0.34, 0.34, 0.11, 0.11, 0.10])[0]
+        bat = {"Batsman": 1.0, "WK-Batsman": 0.9, "Batting Allrounder": 0.8,
+               "Bowling Allrounder": 0.55, "Bowler": 0.25}[role]
+        bowl = {"Bowler": 1.0, "Bowling Allrounder": 0.85, "Batting Allrounder": 0.6,
+                "Batsman": 0.1, "WK-Batsman": 0.0}[role]
+        noise = rng.uniform(0.75, 1.25)
+        team.squad.append(Player(
+            next_pid + rank,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            role,
+            rng.choice(BAT_STYLES),
+            rng.choice(BOWL_STYLES) if bowl > 0 else None,
+            role == "WK-Batsman",
+            team,
+            bat * (0.5 + star) * noise,
+            bowl * (0.5 + star) * noise,
+        ))
+    team.weights = zipf_weights(size)
+    return next_pid + size
+
+def player_row(p, captain):
+    nick = p.name.split()[-1]
+    return (p.id, p.name, nick, p.role, p.bat_style, p.bowl_style, p.keeper, captain, p.team.id)
+
+def make_venues(rng, teams, per_team, next_vid):
+    venues = defaultdict(list)      # country → [(id, ground, city, country)]
+    rows = []
+    for t in teams:
+        for i in range(per_team):
+            city = f"{t.name} {rng.choice(CITIES)}"
+            ground = f"{city} {rng.choice(GROUNDS)}"
+            venue = (next_vid, ground, city, t.country)
+            venues[t.country].append(venue)
+            rows.append((*venue, int(rng.lognormvariate(10, 0.5)), rng.randint(1870, 2015)))
+            next_vid += 1
+    return venues, rows
+
+
+# ---------------- Match simulation ----------------
+def playing_xi(rng, team):
+    """11 by popularity, keeper guaranteed, ordered top-order bats first"""
+    xi = weighted_sample(rng, team.squad, team.weights, 11)
+    if not any(p.keeper for p in xi):
+        keepers = [p for p in team.squad if p.keeper and p not in xi]
+        if keepers:
+            xi[-1] = keepers[0]
+    xi.sort(key=lambda p: p.bat - p.bowl * 0.3, reverse=True)
+    return xi
+
+def bowling_attack(xi, n):
+    return sorted((p for p in xi if p.bowl > 0), key=lambda p: p.bowl, reverse=True)[:n]
+
+def dismissal_text(rng, kind, bowler, fielders):
+    if kind == "bowled":
+        return f"b {bowler.name}", None
+    if kind == "lbw":
+        return f"lbw b {bowler.name}", None
+    if kind == "stumped":
+        keeper = next((p for p in fielders if p.keeper), None)
+        if keeper is not None:
+            return f"st {keeper.name} b {bowler.name}", (keeper, "stumping")
+        return f"b {bowler.name}", None
+    if kind == "run out":
+        fielder = rng.choice(fielders)
+        return f"run out ({fielder.name})", (fielder, "runout")
+    fielder = rng.choice(fielders)
+    if fielder is bowler:
+        return f"c & b {bowler.name}", (bowler, "catch")
+    return f"c {fielder.name} b {bowler.name}", (fielder, "catch")
+
+def simulate_innings(rng, fmt, bat_xi, bowl_xi, max_balls, target=None):
+    """One innings → (runs, wickets, balls, batting, bowling, fielding, partnerships)"""
+    spec = FORMATS[fmt]
+    all_out = rng.random() < spec["allout"]
+    wickets = 10 if all_out else max(0, min(9, int(rng.gauss(5 if spec["overs"] else 6, 2))))
+    if all_out:
+        balls = int(max_balls * rng.uniform(0.45 if spec["overs"] else 0.3, 1.0))
+    elif spec["overs"]:
+        balls = max_balls
+    else:
+        balls = int(max_balls * rng.uniform(0.6, 1.0))      # declared
+    balls = max(6, balls)
+    runs = max(wickets * 2, int(balls / 6 * rng.gauss(spec["rpo"], spec["rpo"] * 0.15)))
+    if target is not None and runs >= target:
+        # chase completed: stop a few runs past the target, earlier and with wickets in hand
+        runs = target + rng.randint(0, 5)
+        wickets = min(wickets, 9)
+        balls = max(6, min(balls, int(runs / spec["rpo"] * 6 * rng.uniform(0.8, 1.05))))
+        all_out = False
+
+    extras = int(runs * rng.uniform(0.03, 0.08))
+    bat_runs = runs - extras
+
+    # ---- batting ----
+    used = 11 if all_out else min(11, wickets + 2)
+    batters = bat_xi[:used]
+    run_parts = split_total(rng, bat_runs, [p.bat * (1.3 - i * 0.05) for i, p in enumerate(batters)])
+    attack = bowling_attack(bowl_xi, 5 if spec["overs"] else 6) or bowl_xi[-5:]
+    bowler_weights = [p.bowl or 0.1 for p in attack]
+    batting, fielding = [], {}
+    credited = defaultdict(int)
+    for pos, (p, r) in enumerate(zip(batters, run_parts), start=1):
+        out = pos <= wickets
+        sr = max(15.0, rng.gauss(spec["sr"], spec["sr"] * 0.25) * (0.7 + p.bat * 0.3))
+        faced = max(1, int(r * 100 / sr)) if r else rng.randint(1, 12)
+        boundaries = int(r * rng.uniform(0.08, 0.16))
+        sixes = int(boundaries * spec["six_share"])
+        fours = boundaries - sixes
+        if fours * 4 + sixes * 6 > r:
+            fours, sixes = r // 6, 0
+        if out:
+            kind = rng.choices([d for d, _ in DISMISSALS], [w for _, w in DISMISSALS])[0]
+            bowler = rng.choices(attack, bowler_weights)[0]
+            text, field = dismissal_text(rng, kind, bowler, bowl_xi)
+            if kind != "run out":
+                credited[bowler.id] += 1
+            if field:
+                fielder, action = field
+                counts = fielding.setdefault(fielder.id, [fielder, 0, 0, 0])
+                counts[{"catch": 1, "stumping": 2, "runout": 3}[action]] += 1
+        else:
+            text = "not out"
+        batting.append((p, r, faced, fours, sixes, round(r * 100 / faced, 2), pos, text, not out))
+
+    # ---- partnerships: batter k joins at wicket k-1 ----
+    stands = wickets + (0 if all_out else 1)
+    stand_runs = split_total(rng, runs, [1.5 if i < 4 else 1.0 for i in range(stands)])
+    partnerships = []
+    striker, other = 0, 1
+    for w, r in enumerate(stand_runs, start=1):
+        if other >= len(batters):
+            break
+        stand_balls = max(1, int(r / spec["rpo"] * 6))
+        partnerships.append((batters[striker].name, batters[other].name, r, stand_balls, w))
+        striker, other = other, other + 1
+
+    # ---- bowling: hand out overs one at a time, respecting the per-bowler cap ----
+    cap = spec["cap"] * 6 if spec["cap"] else None
+    spell = [0] * len(attack)
+    remaining = balls
+    while remaining > 0:
+        open_idx = [i for i in range(len(attack)) if cap is None or spell[i] < cap]
+        if not open_idx:
+            break
+        i = rng.choices(open_idx, [bowler_weights[j] for j in open_idx])[0]
+        over = min(6, remaining)
+        spell[i] += over
+        remaining -= over
+    # runs follow balls bowled, with some spells tighter than others
+    conceded = split_total(rng, runs - extras // 2, [b * rng.uniform(0.6, 1.4) for b in spell], spread=False)
+    bowling = []
+    for p, b, r in zip(attack, spell, conceded):
+        if not b:
+            continue
+        overs = overs_text(b)
+        maidens = sum(rng.random() < (0.25 if not spec["overs"] else 0.05) for _ in range(b // 6))
+        bowling.append((p, overs, maidens, r, credited[p.id], round(r * 6 / b, 2), b))
+
+    return runs, wickets, balls, batting, bowling, list(fielding.values()), partnerships
+
+
+class Stats:
+    """Running per (player, format) totals for player_master_stats"""
+    __slots__ = ("matches", "last_match", "innings", "runs", "balls", "hundreds", "fifties", "highest",
+                 "not_outs", "ducks", "wickets", "balls_bowled", "conceded", "four_w", "five_w", "ten_w",
+                 "best_innings", "best_match", "match_figures", "catches", "stumpings")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.last_match = None
+        self.best_innings = self.best_match = self.match_figures = (0, 0)
+
+    def appear(self, match_id):
+        if self.last_match != match_id:
+            self._close_match()
+            self.last_match = match_id
+            self.matches += 1
+
+    @staticmethod
+    def better(figures, best):
+        """More wickets, then fewer runs"""
+        return best == (0, 0) or (figures[0], -figures[1]) > (best[0], -best[1])
+
+    def _close_match(self):
+        w, r = self.match_figures
+        self.ten_w += w >= 10
+        if (w or r) and self.better((w, r), self.best_match):
+            self.best_match = (w, r)
+        self.match_figures = (0, 0)
+
+    def row(self, p, fmt, created_at):
+        self._close_match()
+        outs = self.innings - self.not_outs
+        figures = lambda f: f"{f[0]}/{f[1]}" if f != (0, 0) else None
+        return (
+            p.id, fmt, p.name, p.team.name, p.role, p.bat_style, p.bowl_style,
+            self.matches, self.innings, self.runs, self.balls, self.hundreds, self.fifties, self.highest,
+            round(self.runs / outs, 2) if outs else None,
+            round(self.runs * 100 / self.balls, 2) if self.balls else None,
+            self.not_outs, self.ducks,
+            self.wickets, self.balls_bowled, self.conceded,
+            round(self.conceded / self.wickets, 2) if self.wickets else None,
+            round(self.conceded * 6 / self.balls_bowled, 2) if self.balls_bowled else None,
+            self.four_w, self.five_w, self.ten_w,
+            figures(self.best_innings), figures(self.best_match),
+            self.catches, self.stumpings,
+            None, None, None,
+            created_at,
+        )
+
+
+# ---------------- Generator ----------------
+class Generator:
+    def __init__(self, seed, teams, players_per_team, venues_per_team, start, end, ids):
+        self.rng = random.Random(seed)
+        self.start, self.end = start, end
+        self.ids = ids
+        self.teams = []
+        self.team_rows = []
+        pid = ids["player"]
+        for name, sname in teams:
+            team = Team(ids["existing_teams"].get(name) or ids["team"], name, sname)
+            if name not in ids["existing_teams"]:
+                self.team_rows.append((team.id, team.name, team.sname, team.country))
+                ids["team"] += 1
+            pid = make_squad(self.rng, team, players_per_team, pid)
+            self.teams.append(team)
+        self.venues, self.venue_rows = make_venues(self.rng, self.teams, venues_per_team, ids["venue"])
+        self.stats = defaultdict(Stats)       # (player, stats format) → Stats
+        self.series_id = ids["series"]
+        self.match_id = ids["match"]
+
+    def player_rows(self):
+        for team in self.teams:
+            for rank, p in enumerate(team.squad):
+                yield player_row(p, rank == 0)
+
+    def series(self):
+        """Endless (series_row, [fixtures]) for bilateral series starting anywhere in the date range"""
+        rng = self.rng
+        span = (self.end - self.start).days
+        while True:
+            fmt = rng.choices(list(FORMATS), [f["weight"] for f in FORMATS.values()])[0]
+            spec = FORMATS[fmt]
+            home, away = rng.sample(self.teams, 2)
+            n = rng.randint(*spec["series_len"])
+            # leave room so the last fixture of a series isn't in the future
+            first = self.start + timedelta(days=rng.randrange(max(1, span - 40)))
+            gap = spec["days"] + rng.randint(1, 4)
+            sid = self.series_id
+            self.series_id += 1
+            name = f"{away.name} tour of {home.name}, {first.year}"
+            series_row = (sid, name, "International", first, first + timedelta(days=gap * (n - 1) + spec["days"]),
+                          home.country, fmt, n)
+            fixtures = [(sid, name, fmt, home, away, i, first + timedelta(days=gap * i)) for i in range(n)]
+            yield series_row, fixtures
+
+    def match(self, sid, series_name, fmt, home, away, number, day, out):
+        """Simulate one match, appending rows for every table to `out`"""
+        rng, spec = self.rng, FORMATS[fmt]
+        mid = self.match_id
+        self.match_id += 1
+        venue = rng.choice(self.venues[home.country])
+        start_ts = datetime.combine(day, datetime.min.time()) + timedelta(hours=rng.choice([10, 13, 14, 19]))
+        toss = rng.choice([home, away])
+        decision = rng.choice(["Batting", "Bowling"])
+        first = toss if decision == "Batting" else (away if toss is home else home)
+        second = away if first is home else home
+        xi = {home.id: playing_xi(rng, home), away.id: playing_xi(rng, away)}
+
+        if spec["overs"]:
+            order = [first, second]
+            max_balls = [spec["overs"] * 6] * 2
+        else:
+            order = [first, second, first, second]
+            max_balls = [int(rng.uniform(100, 170) * 6) for _ in order]
+        totals = defaultdict(int)
+        innings_played = []
+        for n, (bat, mb) in enumerate(zip(order, max_balls), start=1):
+            bowl = second if bat is first else first
+            target = None
+            if n == len(order):
+                target = totals[bowl.id] - totals[bat.id] + 1
+                if target <= 0:
+                    break       # innings victory, last innings not needed
+            runs, wkts, balls, batting, bowling, fielding, stands = simulate_innings(
+                rng, fmt, xi[bat.id], xi[bowl.id], mb, target)
+            totals[bat.id] += runs
+            innings_played.append((bat, wkts, runs))
+            self._innings_rows(out, mid, start_ts, n, fmt, bat, bowl, home, away, runs, wkts, balls,
+                               batting, bowling, fielding, stands)
+
+        # ---- result ----
+        last_bat, last_wkts, _ = innings_played[-1]
+        chasing_done = totals[last_bat.id] > totals[(second if last_bat is first else first).id]
+        win_runs = win_wkts = None
+        innings_win = False
+        if rng.random() < 0.02:
+            winner, status = None, "No result"
+        elif len(innings_played) < len(order):
+            winner = first if totals[first.id] > totals[second.id] else second
+            innings_win = True
+            win_runs = abs(totals[first.id] - totals[second.id])
+            status = f"{winner.name} won by an innings and {win_runs} runs"
+        elif chasing_done:
+            winner, win_wkts = last_bat, 10 - last_wkts
+            status = f"{winner.name} won by {win_wkts} wkts"
+        elif totals[first.id] == totals[second.id]:
+            winner, status = None, "Match tied"
+        elif not spec["overs"] and last_wkts < 10:
+            winner, status = None, "Match drawn"
+        else:
+            winner = second if last_bat is first else first
+            win_runs = totals[winner.id] - totals[last_bat.id]
+            status = f"{winner.name} won by {win_runs} runs"
+
+        out["matches"].append((
+            mid, sid, f"{ordinal(number + 1)} {'Test' if fmt == 'TEST' else fmt}",
+            fmt, spec["match_type"], start_ts, start_ts + timedelta(days=spec["days"] - 1, hours=8),
+            "Complete", status,
+            home.id, home.name, away.id, away.name,
+            venue[0], venue[1], venue[2], venue[3],
+            toss.id, decision,
+            winner.id if winner else None, winner.name if winner else "No Result",
+            win_runs, win_wkts, innings_win,
+        ))
+
+    def _innings_rows(self, out, mid, played, n, fmt, bat, bowl, home, away, runs, wkts, balls,
+                      batting, bowling, fielding, stands):
+        stats_fmt = FORMATS[fmt]["stats"]
+        out["match_innings"].append((mid, played, n, n, bat.name, bowl.name, bat.id, bowl.id, runs, wkts, overs_text(balls)))
+        for p, r, faced, fours, sixes, sr, pos, text, not_out in batting:
+            out["batting_scorecard"].append((mid, played, n, p.id, p.name, bat.name, r, faced, fours, sixes, sr,
+                                             pos, text, not_out))
+            s = self.stats[(p, stats_fmt)]
+            s.appear(mid)
+            s.innings += 1
+            s.runs += r
+            s.balls += faced
+            s.highest = max(s.highest, r)
+            s.hundreds += r >= 100
+            s.fifties += 50 <= r < 100
+            s.not_outs += not_out
+            s.ducks += r == 0 and not not_out
+        for p, overs, maidens, r, w, econ, b in bowling:
+            out["bowling_scorecard"].append((mid, played, n, p.id, p.name, bowl.name, overs, maidens, r, w, econ))
+            s = self.stats[(p, stats_fmt)]
+            s.appear(mid)
+            s.wickets += w
+            s.balls_bowled += b
+            s.conceded += r
+            s.four_w += w == 4
+            s.five_w += w >= 5
+            if s.better((w, r), s.best_innings):
+                s.best_innings = (w, r)
+            mw, mr = s.match_figures
+            s.match_figures = (mw + w, mr + r)
+        for p, catches, stumpings, runouts in fielding:
+            out["fielding_scorecard"].append((mid, played, n, p.id, p.name, bowl.name, catches, stumpings, runouts))
+            s = self.stats[(p, stats_fmt)]
+            s.appear(mid)
+            s.catches += catches
+            s.stumpings += stumpings
+        for b1, b2, r, b, w in stands:
+            out["partnerships"].append((mid, fmt, home.name, away.name, n, b1, b2, r, b, w))
+
+    def master_stats_rows(self):
+        created_at = datetime(self.end.year, self.end.month, self.end.day)      # fixed, like every other value
+        for (p, fmt), s in self.stats.items():
+            yield s.row(p, fmt, created_at)
+
+    def ranking_rows(self):
+        """Monthly top-10 per format/category, rating driven by skill with a little drift"""
+        rng = self.rng
+        players = [p for t in self.teams for p in t.squad]
+        day = date(self.start.year, self.start.month, 1)
+        while day <= self.end:
+            for fmt in RANKING_FORMATS:
+                for cat in RANKING_CATEGORIES:
+                    score = {
+                        "Batting": lambda p: p.bat,
+                        "Bowling": lambda p: p.bowl,
+                        "All-rounder": lambda p: math.sqrt(p.bat * p.bowl),
+                    }[cat]
+                    rated = sorted(((score(p) * rng.uniform(0.85, 1.15), p) for p in players),
+                                   key=lambda x: x[0], reverse=True)[:10]
+                    for pos, (rating, p) in enumerate(rated, start=1):
+                        yield (p.id, p.name, p.team.country, fmt, cat, pos,
+                               int(min(950, 400 + rating * 300)), day)
+            day = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+# ---------------- Load ----------------
+def reset(cur):
+    cur.execute(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE")
+
+def start_ids(cur):
+    cur.execute("SELECT team_name, team_id FROM teams")
+    return {
+        "existing_teams": dict(cur.fetchall()),
+        "team": next_id(cur, "teams", "team_id"),
+        "player": next_id(cur, "players", "player_id"),
+        "venue": next_id(cur, "venues", "venue_id"),
+        "series": next_id(cur, "series", "series_id"),
+        "match": next_id(cur, "matches", "match_id"),
+    }
+
+def generate(matches, players=1600, teams=12, venues_per_team=4, seed=42, years=10, chunk=SYNTH_CHUNK,
+             do_reset=False, end=None):
+    """Generate and load `matches` matches (plus dimensions and derived stats) up to `end` (default:
+    today); returns {table: rows}"""
+    teams = TEAMS[:max(2, min(teams, len(TEAMS)))]
+    end = end or date.today()
+    start = end - timedelta(days=365 * years)
+    counts = defaultdict(int)
+    began = time.perf_counter()
+    with get_conn() as conn:
+        cur = conn.cursor()
+        ensure_tables(cur, *TABLES)
+        if do_reset:
+            reset(cur)
+        ensure_seasons(cur, range(start.year, end.year + 1))
+        gen = Generator(seed, teams, max(15, players // len(teams)), venues_per_team, start, end, start_ids(cur))
+        counts["teams"] += copy_rows(cur, "teams", gen.team_rows)
+        counts["players"] += copy_rows(cur, "players", list(gen.player_rows()))
+        counts["venues"] += copy_rows(cur, "venues", gen.venue_rows)
+
+        made = 0
+        out = defaultdict(list)
+        series_rows = []
+        series_iter = gen.series()
+        while made < matches:
+            series_row, fixtures = next(series_iter)
+            fixtures = fixtures[:matches - made]
+            series_rows.append((*series_row[:7], len(fixtures)))
+            for fixture in fixtures:
+                gen.match(*fixture, out)
+            made += len(fixtures)
+            if len(out["matches"]) >= chunk or made >= matches:
+                counts["series"] += copy_rows(cur, "series", series_rows)
+                series_rows = []
+                for table in ("matches", "match_innings", "batting_scorecard", "bowling_scorecard",
+                              "fielding_scorecard", "partnerships"):
+                    counts[table] += copy_rows(cur, table, out[table])
+                out.clear()
+                print(f"   … {made:,}/{matches:,} matches ({time.perf_counter() - began:.0f}s)")
+
+        batch = []
+        for row in gen.master_stats_rows():
+            batch.append(row)
+            if len(batch) >= chunk * 10:
+                counts["player_master_stats"] += copy_rows(cur, "player_master_stats", batch)
+                batch = []
+        counts["player_master_stats"] += copy_rows(cur, "player_master_stats", batch)
+        counts["player_rankings_history"] += copy_rows(cur, "player_rankings_history", list(gen.ranking_rows()))
+
+        for table in TABLES:
+            cur.execute(f"ANALYZE {table}")
+        bump_table_versions(cur, *TABLES)
+    return dict(counts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load seeded synthetic cricket data for load testing")
+    parser.add_argument("--matches", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=1600, help="total players, split evenly across teams")
+    parser.add_argument("--teams", type=int, default=12, help=f"international teams (max {len(TEAMS)})")
+    parser.add_argument("--venues-per-team", type=int, default=4)
+    parser.add_argument("--years", type=int, default=10, help="matches are spread over the N years before --end")
+    parser.add_argument("--end", type=date.fromisoformat, default=None,
+                        help="last match date, YYYY-MM-DD (default: today); fix it to reproduce a load")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk", type=int, default=SYNTH_CHUNK, help="matches per COPY round")
+    parser.add_argument("--reset", action="store_true", help="empty the generated tables first")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate(args.matches, args.players, args.teams, args.venues_per_team, args.seed,
+                      args.years, args.chunk, args.reset, args.end)
+    print(f"✅ Synthetic data loaded in {time.perf_counter() - start:.1f}s")
+    for table, n in counts.items():
+        print(f"   {table:<24} {n:>12,}")